@@ -1,27 +1,45 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
 import logging
-import math
+import os
+import uuid
 
-from src.data_processing import load_data, filter_data, compute_brand_share, compute_trends
+# До шапки — лише легкі модулі; pandas/numpy (через бекенд) імпортуються після неї,
+# plotly / scikit-learn — у вкладках, яким вони потрібні
+from src.profiling import begin_trace, configure_timing_log, finish_trace, span, waterfall_html
 from src.ui.background import render_background
 
 logger = logging.getLogger(__name__)
-st.set_page_config(page_title="Інтерактивний вебдодаток для аналізу трендів ноутбуків 2025 року", layout="wide")
+# Streamlit виконує скрипт як __main__; spawn-процеси пулу src.sources імпортують головний модуль
+# як __mp_main__ — їм тіло застосунку виконувати не можна
+if __name__ == "__main__":
+    st.set_page_config(page_title="Інтерактивний вебдодаток для аналізу трендів ноутбуків 2025 року", layout="wide")
+    # LAPTOP_FAST_START=1 — виконується лише відкрита вкладка (решта не рахується і не імпортує plotly)
+    FAST_START = os.environ.get("LAPTOP_FAST_START", "0") == "1"
 
-# Sidebar controls for background component (enable/disable and kind)
-with st.sidebar:
-    st.header("🔧 Налаштування інтерфейсу")
-    show_bg = st.checkbox("Анімаційний фон", value=True, help="Вмикнути/вимкнути фоновые ефекти")
-    bg_kind = st.selectbox("Тип фону", options=["gradient", "waves", "particles"], index=0, help="gradient = м'який градієнт; waves = SVG-хвилі; particles = частинки")
+    # Sidebar controls for background component (enable/disable and kind)
+    with st.sidebar:
+        st.header("🔧 Налаштування інтерфейсу")
+        show_bg = st.checkbox("Анімаційний фон", value=True, help="Вмикнути/вимкнути фоновые ефекти")
+        bg_kind = st.selectbox("Тип фону", options=["gradient", "waves", "particles"], index=0, help="gradient = м'який градієнт; waves = SVG-хвилі; particles = частинки")
+        bg_low_power = st.checkbox("Економний фон", value=False, help="Пауза анімації, поки вкладка прихована; частинки — 30 fps")
+        profiling_on = st.checkbox("⏱ Профілювання стадій", value=False, help="Водоспад часу стадій цього rerun-у + JSON-логи laptop_trends.timing")
+        profile_memory = profiling_on and st.checkbox("Пам'ять (tracemalloc)", value=False, help="Рахує байти на стадію; помітно сповільнює")
 
-# Render background (componentized)
-render_background(kind=bg_kind, enabled=show_bg)
+    # Per-rerun stage timing (span/timed no-op when disabled)
+    if 'session_id' not in st.session_state:
+        st.session_state.session_id = uuid.uuid4().hex[:8]
+    if profiling_on:
+        configure_timing_log()
+        begin_trace(st.session_state.session_id, track_memory=profile_memory)
 
-# Inject UI CSS (cards, neon glow, sidebar-note, etc.)
-st.markdown(
-    """
+    try:
+        # Render background (componentized)
+        with span("background"):
+            bg_frames = render_background(kind=bg_kind, enabled=show_bg, low_power=bg_low_power)
+
+        # Inject UI CSS (cards, neon glow, sidebar-note, etc.)
+        st.markdown(
+            """
 <style>
 @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;600;800&display=swap');
 :root {
@@ -112,8 +130,35 @@ html, body, [data-testid="stAppViewContainer"] > .main {
   color: #ff3b30;
   font-weight:800;
   font-size:16px;
+}
+.price-row {
+  display:flex;
+  justify-content:space-between;
+  align-items:center;
   margin-top:auto;
+  padding-top:10px;
+}
+
+/* Card grid (one element per page) */
+.card-grid {
+  display:grid;
+  grid-template-columns: repeat(4, minmax(0, 1fr));
+  gap: 24px;
 }
+@media (max-width: 1100px) { .card-grid { grid-template-columns: repeat(2, minmax(0, 1fr)); } }
+@media (max-width: 640px) { .card-grid { grid-template-columns: 1fr; } }
+
+/* Details (native <details>, no widget per card) */
+.card-details { margin-top:8px; font-size:13px; }
+.card-details summary { cursor:pointer; color:var(--muted); }
+.details-box {
+  border:1.5px solid #00e6ff;
+  border-radius:10px;
+  padding:12px;
+  margin-top:8px;
+  background: #ffffffcc;
+}
+.similar-list { margin:4px 0 0 0; padding-left:18px; }
 
 /* Sidebar footer / note */
 .sidebar-note {
@@ -129,184 +174,308 @@ html, body, [data-testid="stAppViewContainer"] > .main {
 /* small layout tweaks */
 .stColumns > div { padding-left:8px; padding-right:8px; }
 .empty-state { text-align:center; padding:40px 0; color:var(--muted); }
+
+/* Profiling waterfall */
+.waterfall { font-size:11px; }
+.wf-row { display:flex; align-items:center; gap:6px; margin:2px 0; }
+.wf-label { width:38%; white-space:nowrap; overflow:hidden; text-overflow:ellipsis; }
+.wf-track { flex:1; background:rgba(0,0,0,0.04); border-radius:3px; height:10px; }
+.wf-bar { height:10px; border-radius:3px; background:linear-gradient(90deg, var(--neon-1), var(--neon-2)); }
+.wf-ms { width:30%; text-align:right; color:var(--muted); white-space:nowrap; }
 </style>
 """,
-    unsafe_allow_html=True,
-)
-
-# Header (render after background so visual stacking is correct)
-st.markdown("## 💻 Інтерактивний вебдодаток для аналізу трендів ноутбуків 2025 року")
-st.markdown("Інтерактивний аналіз моделей: ціни, автономність, OLED, AI‑процесори")
-
-# Load data
-DATA_PATH = "data/sample_laptops.csv"
-df = load_data(DATA_PATH)
-if df.empty:
-    st.error("❌ Дані не завантажені або CSV-файл порожній.")
-    st.stop()
-
-# Sidebar filters (moved below background controls so background controls remain visible)
-with st.sidebar:
-    st.header("🔍 Фільтри")
-    brands = st.multiselect("Бренд", sorted(df['brand'].unique()), default=sorted(df['brand'].unique())[:5])
-    price_min, price_max = st.slider(
-        "Ціна (USD)",
-        int(df['price_usd'].min()),
-        int(df['price_usd'].max()),
-        (int(df['price_usd'].min()), int(df['price_usd'].max())),
-    )
-    screen_min, screen_max = st.slider(
-        "Діагональ екрану (in)",
-        float(df['screen_size_in'].min()),
-        float(df['screen_size_in'].max()),
-        (float(df['screen_size_in'].min()), float(df['screen_size_in'].max())),
-    )
-    ai_cpu = st.selectbox("AI CPU", ["Усі", "Із AI", "Без AI"])
-    max_show = st.number_input("Кількість моделей на сторінці", min_value=3, max_value=60, value=12)
-
-    # signature / note
-    st.markdown("---")
-    st.markdown('<div class="sidebar-note">Шаблінський 2 курс ІПЗ\nверсія програми 0.01\Керівник проєкту: Жовнірчик Л.І </div>', unsafe_allow_html=True)
-
-# Filter
-filtered = filter_data(df, brands, (price_min, price_max), (screen_min, screen_max), ai_cpu)
-
-# Metrics
-st.markdown("### 📊 Загальні метрики")
-c1, c2, c3 = st.columns(3)
-c1.metric("Моделей (відфільтровано)", len(filtered))
-c2.metric("Середня ціна (USD)", f"{filtered['price_usd'].mean():.0f}" if len(filtered) else "—")
-c3.metric("Середня автономність (Wh)", f"{filtered['battery_wh'].mean():.0f}" if len(filtered) else "—")
-
-# Tabs
-tab1, tab2, tab3 = st.tabs(["🖼️ Каталог", "🥧 Актуальні бренди", "📈 Тренди"])
-
-with tab1:
-    display_df = filtered.sort_values(by='price_usd').reset_index(drop=True)
-    total = len(display_df)
-    page_size = int(max_show)
-    total_pages = max(1, math.ceil(total / page_size))
-    if 'page' not in st.session_state:
-        st.session_state.page = 1
-
-    # Pager
-    pc1, pc2, pc3, pc4 = st.columns([1,3,1,3])
-    with pc1:
-        if st.button("⬅️ Ліво") and st.session_state.page > 1:
-            st.session_state.page -= 1
-    with pc2:
-        st.markdown(f"**Сторінка {st.session_state.page} / {total_pages}**")
-    with pc3:
-        if st.button("Право ➡️") and st.session_state.page < total_pages:
-            st.session_state.page += 1
-    with pc4:
-        jump = st.number_input("Перейти на стор.", min_value=1, max_value=total_pages, value=st.session_state.page, step=1, key="jump_page")
-        if jump != st.session_state.page:
-            st.session_state.page = int(jump)
-
-    # Cards
-    start_idx = (st.session_state.page - 1) * page_size
-    end_idx = start_idx + page_size
-    page_df = display_df.iloc[start_idx:end_idx]
-
-    # render rows (4 columns)
-    for i in range(0, len(page_df), 4):
-        cols = st.columns(4, gap="large")
-        for j, (_, row) in enumerate(page_df.iloc[i:i+4].iterrows()):
-            col = cols[j]
-            # thumbnail safe source
-            thumb = str(row.get('thumbnail', '') or "").strip()
-            if thumb:
-                thumb_src = thumb.replace('[:]//', '://')
-            else:
-                thumb_src = "https://via.placeholder.com/600x600?text=No+image"
-
-            brand = row.get('brand', '')
-            model = row.get('model', '')
-            price = row.get('price_usd', '—')
-            screen = row.get('screen_size_in', '—')
-            display_type = row.get('display_type', '—')
-            cpu = row.get('cpu', '—')
-            code = row.get('code', '') or row.get('sku', '') or ''
-
-            img_html = f'''
-            <img src="{thumb_src}" class="thumb" alt="{brand} {model}" loading="lazy"
-                 onerror="this.onerror=null;this.src='https://via.placeholder.com/600x600?text=No+image';" />
-            '''
-            # card without inactive action
-            card_html = f'''
-            <div class="card" role="article">
-              {img_html}
-              <div class="title">{brand} {model}</div>
-              <div class="meta">{screen}" • {display_type} • {cpu}</div>
-              <div class="small-note">Код: {code}</div>
-              <div style="display:flex;justify-content:space-between;align-items:center;margin-top:10px;">
-                <div class="price">${price}</div>
-              </div>
-            </div>
-            '''
-            col.markdown(card_html, unsafe_allow_html=True)
-
-            # server-side details toggle
-            key = f"toggle_{start_idx + i + j}"
-            show = col.checkbox("🔍 Детальніше", key=key)
-            if show:
-                product_url = row.get('url', '') or ""
-                if isinstance(product_url, str) and product_url.strip():
-                    url_html = f'<b>🔗 <a href="{product_url}" target="_blank" rel="noopener noreferrer">Сторінка товару</a></b>'
-                else:
-                    url_html = '<b>🔗 Немає посилання</b>'
-
-                col.markdown(f"""
-                <div style="border:1.5px solid #00e6ff; border-radius:10px; padding:12px; margin-top:8px; background: #ffffffcc;">
-                    <b>💰 Ціна:</b> ${price:.0f}<br>
-                    <b>📺 Екран:</b> {screen}" {display_type}<br>
-                    <b>🧠 Процесор:</b> {cpu}<br>
-                    <b>🔋 Батарея:</b> {row.get('battery_wh','—')} Wh<br>
-                    <b>🧮 RAM:</b> {row.get('ram_gb','—')} GB, SSD: {row.get('storage_gb','—')} GB<br>
-                    <b>📅 Рік:</b> {row.get('release_year','—')}<br>
-                    {url_html}
-                </div>
-                """, unsafe_allow_html=True)
-
-with tab2:
-    brand_share = compute_brand_share(filtered)
-    fig1 = px.pie(brand_share, names='brand', values='count', title='Розподіл за брендами', template='plotly_white')
-    st.plotly_chart(fig1, use_container_width=True)
-
-with tab3:
-    try:
-        trend_df = compute_trends(df)
-        if trend_df.empty:
-            st.warning("Немає даних для побудови трендів.")
-        else:
-            fig2 = px.line(
-                trend_df,
-                x='year',
-                y='value',
-                color='metric',
-                markers=True,
-                line_shape='spline',
-                template='plotly_white',
-                title='Тренди: ціна, автономність, OLED'
+            unsafe_allow_html=True,
+        )
+
+        # Header (render after background so visual stacking is correct)
+        st.markdown("## 💻 Інтерактивний вебдодаток для аналізу трендів ноутбуків 2025 року")
+        st.markdown("Інтерактивний аналіз моделей: ціни, автономність, OLED, AI‑процесори")
+
+        # Важкі модулі — після шапки: на новому воркері вона з'являється до імпорту pandas і завантаження даних
+        with span("import_backend"):
+            from src.data_processing import TREND_METRICS, DEFAULT_TRENDS
+            from src.backend import open_catalog
+            from src.catalog_index import SORT_KEYS, filter_key
+            from src.result_cache import RESULT_CACHE
+            from src.search import RELEVANCE
+            from src.distribution import DEFAULT_BINS, DISTRIBUTION_AXES, SCATTER_MAX_POINTS
+            from src.export import EXPORT_FORMATS, MAX_EXPORT_BYTES, export_filename, export_url
+            from src.thumbnails import local_thumbnails, thumbnails_version
+            from src.ui.cards import render_card_grid, similar_html
+            from src.ui.pager import pager
+
+        # Load data
+        # LAPTOP_DATA_PATH — файл, тека або glob (напр. "data/feeds/*.csv"); кілька файлів зливаються з дедуплікацією
+        DATA_PATH = os.environ.get("LAPTOP_DATA_PATH", "data/sample_laptops.csv")
+        # LAPTOP_DEDUP_KEEP — яку з копій моделі лишати при злитті фідів: cheapest | newest
+        DEDUP_KEEP = os.environ.get("LAPTOP_DEDUP_KEEP", "cheapest")
+        # LAPTOP_TYPED_INGEST=1 — компактна схема (category/float32, без list-колонок) для великих CSV
+        TYPED_INGEST = os.environ.get("LAPTOP_TYPED_INGEST", "0") == "1"
+        # LAPTOP_BACKEND — pandas (каталог у пам'яті) | sqlite (база в data/.cache, запити на диску)
+        BACKEND = os.environ.get("LAPTOP_BACKEND", "pandas")
+        catalog = open_catalog(DATA_PATH, backend=BACKEND, typed=TYPED_INGEST, keep=DEDUP_KEEP)
+        if catalog is None:
+            st.error("❌ Дані не завантажені або CSV-файл порожній.")
+            st.stop()
+        options = catalog.options()
+
+        # Sidebar filters (moved below background controls so background controls remain visible)
+        with st.sidebar:
+            st.header("🔍 Фільтри")
+            # n-грамний індекс (src.search): префікси і до 2 помилок у слові, усі слова мають знайтися
+            query = st.text_input("Пошук", placeholder="модель, бренд, CPU, екран…").strip()
+            brands = st.multiselect("Бренд", options['brands'], default=options['brands'][:5])
+            price_min, price_max = st.slider(
+                "Ціна (USD)",
+                int(options['price'][0]),
+                int(options['price'][1]),
+                (int(options['price'][0]), int(options['price'][1])),
+            )
+            screen_min, screen_max = st.slider(
+                "Діагональ екрану (in)",
+                float(options['screen'][0]),
+                float(options['screen'][1]),
+                (float(options['screen'][0]), float(options['screen'][1])),
             )
-            fig2.update_layout(
-                legend_title_text='Характеристика',
-                xaxis_title='Рік',
-                yaxis_title='Значення',
-                margin=dict(l=20, r=20, t=40, b=20),
-                font=dict(size=14)
+            ai_cpu = st.selectbox("AI CPU", ["Усі", "Із AI", "Без AI"])
+            # фасети з розбору cpu/display_type (src.specs); порожній вибір — усі
+            facets = {
+                'cpu_tier': st.multiselect("Серія процесора", options['facets'].get('cpu_tier', []), placeholder="Усі"),
+                'panel_type': st.multiselect("Тип матриці", options['facets'].get('panel_type', []), placeholder="Усі"),
+            }
+            max_show = st.number_input("Кількість моделей на сторінці", min_value=3, max_value=60, value=12)
+
+            # signature / note
+            st.markdown("---")
+            st.markdown('<div class="sidebar-note">Шаблінський 2 курс ІПЗ\nверсія програми 0.01\Керівник проєкту: Жовнірчик Л.І </div>', unsafe_allow_html=True)
+
+        # Filter: результати спільні для всіх сесій (RESULT_CACHE), ключ — версія датасету + стан фільтрів
+        version = catalog.version
+        filters = dict(
+            brands=brands, price_range=(price_min, price_max), screen_range=(screen_min, screen_max),
+            ai_cpu=ai_cpu, facets=facets, query=query,
+        )
+
+        # Metrics
+        n_filtered, mean_price, mean_battery = catalog.summary(filters)
+        st.markdown("### 📊 Загальні метрики")
+        c1, c2, c3 = st.columns(3)
+        c1.metric("Моделей (відфільтровано)", n_filtered)
+        c2.metric("Середня ціна (USD)", f"{mean_price:.0f}" if n_filtered else "—")
+        c3.metric("Середня автономність (Wh)", f"{mean_battery:.0f}" if n_filtered else "—")
+
+        # Tabs
+        TAB_LABELS = ["🖼️ Каталог", "🥧 Актуальні бренди", "📈 Тренди", "🔬 Розподіли"]
+        if FAST_START:
+            # перемикання вкладки — rerun; tab.open показує, яка вкладка відкрита
+            tab1, tab2, tab3, tab4 = st.tabs(TAB_LABELS, key="main_tab", on_change="rerun")
+        else:
+            tab1, tab2, tab3, tab4 = st.tabs(TAB_LABELS)
+
+
+        def tab_open(tab) -> bool:
+            return not FAST_START or bool(tab.open)
+
+
+        with tab1:
+            if tab_open(tab1):
+                sc1, sc2 = st.columns([3, 1])
+                with sc1:
+                    # з запитом пошуку — спершу за релевантністю
+                    sort_labels = {RELEVANCE: "Релевантність", **SORT_KEYS} if query else SORT_KEYS
+                    sort_col = st.selectbox("Сортувати за", options=list(sort_labels), format_func=sort_labels.get, key=f"sort_col_{bool(query)}")
+                with sc2:
+                    sort_desc = st.checkbox("За спаданням", value=False, key="sort_desc")
+                sort = (sort_col, sort_desc)
+                page_size = int(max_show)
+                # порядок рахується раз на (фільтри, сортування); гортання — лише зріз
+                page, start_idx = pager(n_filtered, page_size, key="catalog", reset_on=(filter_key(**filters), sort, page_size))
+                expand_details = st.checkbox("🔍 Детальніше для всіх карток", key="expand_details")
+
+                # Cards: уся сторінка одним HTML-блоком; id рядка — індекс page_df
+                page_df = catalog.page(filters, start_idx, page_size, sort)
+                # локальні WebP-мініатюри з static/thumbs (якщо зібрані), інакше — оригінальні URL
+                page_df = page_df.assign(thumbnail=local_thumbnails(page_df['thumbnail']))
+                # схожі моделі — пошук у KD-дереві (src.similar) лише для рядків сторінки;
+                # у FAST_START — лише з розгорнутими деталями (scikit-learn не імпортується на першому показі)
+                similar = None
+                if expand_details or not FAST_START:
+                    try:
+                        similar = similar_html(catalog.similar(page_df.index))
+                    except Exception:
+                        logger.exception("Error in similar models")
+                cards_version = f"{version}:{thumbnails_version()}"
+                st.markdown(render_card_grid(page_df, cards_version, expanded=expand_details, similar=similar), unsafe_allow_html=True)
+
+        with tab2:
+            if tab_open(tab2):
+                import plotly.express as px
+
+                brand_share = catalog.brand_share(filters)
+                with span("brand_chart", rows=len(brand_share)):
+                    fig1 = px.pie(brand_share, names='brand', values='count', title='Розподіл за брендами', template='plotly_white')
+                    st.plotly_chart(fig1, use_container_width=True)
+
+        with tab3:
+            if tab_open(tab3):
+                import plotly.express as px
+
+                tc1, tc2 = st.columns([3, 1])
+                with tc1:
+                    trend_metrics = st.multiselect(
+                        "Метрики",
+                        options=list(TREND_METRICS),
+                        default=DEFAULT_TRENDS,
+                        format_func=lambda name: TREND_METRICS[name][0],
+                    )
+                with tc2:
+                    follow_filters = st.checkbox("Враховувати фільтри", value=False, help="Тренди лише по відфільтрованих моделях")
+                try:
+                    if not trend_metrics:
+                        trend_df = None
+                    elif follow_filters:
+                        trend_df = catalog.trends(filters, metrics=trend_metrics)
+                    else:
+                        trend_df = catalog.trends(metrics=trend_metrics)
+                    if trend_df is None or trend_df.empty:
+                        st.warning("Немає даних для побудови трендів.")
+                    else:
+                        with span("trends_chart", rows=len(trend_df)):
+                            fig2 = px.line(
+                                trend_df,
+                                x='year',
+                                y='value',
+                                color='metric',
+                                markers=True,
+                                line_shape='spline',
+                                template='plotly_white',
+                                title='Тренди за роками'
+                            )
+                            fig2.update_layout(
+                                legend_title_text='Характеристика',
+                                xaxis_title='Рік',
+                                yaxis_title='Значення',
+                                margin=dict(l=20, r=20, t=40, b=20),
+                                font=dict(size=14)
+                            )
+                            st.plotly_chart(fig2, use_container_width=True)
+                except Exception:
+                    logger.exception("Error in trends")
+                    st.error("Не вдалося побудувати тренди. Подробиці в логах.")
+
+                # Історія цін: графік читає лише зведення src.price_history, не самі знімки
+                from src.price_history import HISTORY_METRICS, PriceHistory
+
+                history = PriceHistory()
+                if history.dates():
+                    st.markdown("### 🕒 Історія цін")
+                    hc1, hc2, hc3 = st.columns(3)
+                    with hc1:
+                        history_level = st.radio("Рівень", ['brand', 'model'], format_func={'brand': 'Бренди', 'model': 'Моделі'}.get, horizontal=True)
+                    with hc2:
+                        history_freq = st.radio("Період", ['weekly', 'daily'], format_func={'weekly': 'Тиждень', 'daily': 'День'}.get, horizontal=True)
+                    with hc3:
+                        history_metric = st.selectbox("Показник", list(HISTORY_METRICS), format_func=HISTORY_METRICS.get)
+                    try:
+                        history_keys = brands or None
+                        if history_level == 'model':
+                            rollup = history.rollup('model', history_freq)
+                            if brands:
+                                rollup = rollup[rollup['brand'].isin(brands)]
+                            model_options = sorted(set(rollup['brand'] + " " + rollup['model']))
+                            # порожній вибір — нічого не малюємо (а не тисячі ліній усіх моделей)
+                            history_keys = st.multiselect("Моделі", model_options, default=model_options[:5])
+                        history_df = history.series(history_level, history_freq, history_metric, keys=history_keys)
+                        if history_df.empty:
+                            st.info("Немає історії для вибраних брендів / моделей.")
+                        else:
+                            with span("history_chart", rows=len(history_df)):
+                                fig_history = px.line(
+                                    history_df, x='period', y='value', color='series', markers=True, template='plotly_white',
+                                    title=f"{HISTORY_METRICS[history_metric]} · знімків: {len(history.dates())}",
+                                )
+                                fig_history.update_layout(
+                                    legend_title_text='', xaxis_title='Період', yaxis_title=HISTORY_METRICS[history_metric],
+                                    margin=dict(l=20, r=20, t=40, b=20), font=dict(size=14),
+                                )
+                                st.plotly_chart(fig_history, use_container_width=True)
+                    except Exception:
+                        logger.exception("Error in price history")
+                        st.error("Не вдалося побудувати історію цін. Подробиці в логах.")
+
+        with tab4:
+            if tab_open(tab4):
+                from src.ui.charts import distribution_figure
+
+                # точки (WebGL) лише для малих вибірок, інакше — 2D-гістограма, порахована на сервері
+                dc1, dc2, dc3 = st.columns([2, 2, 1])
+                axes = list(DISTRIBUTION_AXES)
+                with dc1:
+                    dist_x = st.selectbox("Вісь X", options=axes, index=axes.index('price_usd'), format_func=DISTRIBUTION_AXES.get)
+                with dc2:
+                    dist_y = st.selectbox("Вісь Y", options=axes, index=axes.index('battery_wh'), format_func=DISTRIBUTION_AXES.get)
+                with dc3:
+                    dist_bins = st.select_slider("Бінів", options=[20, 40, 60, 80, 120], value=DEFAULT_BINS)
+                try:
+                    payload = catalog.distribution(filters, dist_x, dist_y, dist_bins)
+                    if not payload['n']:
+                        st.warning("Немає моделей за обраними фільтрами.")
+                    else:
+                        with span("distribution_chart", rows=payload['n']):
+                            st.plotly_chart(distribution_figure(payload, dist_x, dist_y), use_container_width=True)
+                        if payload['mode'] == 'bins':
+                            st.caption(f"{payload['n']} моделей — понад {SCATTER_MAX_POINTS}, тому показано щільність ({dist_bins}×{dist_bins} бінів)")
+                except Exception:
+                    logger.exception("Error in distribution")
+                    st.error("Не вдалося побудувати розподіл. Подробиці в логах.")
+
+        # Export: серіалізація лише після натискання кнопки; файл віддає static serving потоком з диска
+        st.markdown("### 📤 Експорт результатів")
+        ec1, ec2, ec3 = st.columns([1, 1, 2])
+        with ec1:
+            export_fmt = st.selectbox("Формат", options=list(EXPORT_FORMATS), format_func=lambda f: f.upper())
+        with ec2:
+            export_gzip = st.checkbox("gzip", value=False)
+        with ec3:
+            export_spec = (filter_key(**filters), export_fmt, export_gzip)
+            if st.button(f"Підготувати {export_fmt.upper()}"):
+                try:
+                    st.session_state.export_ready = (export_spec, catalog.export_file(filters, export_fmt, export_gzip))
+                except Exception:
+                    logger.exception("Error in export")
+                    st.error("Не вдалося підготувати експорт. Подробиці в логах.")
+            ready = st.session_state.get('export_ready')
+            if ready is not None and ready[0] == export_spec and os.path.exists(ready[1]):
+                export_link = export_url(ready[1])
+                size_mb = os.path.getsize(ready[1]) / 2 ** 20
+                if export_link is None:
+                    st.error(f"Файл {size_mb:.0f} МБ більший за ліміт {MAX_EXPORT_BYTES // 2 ** 20} МБ — "
+                             "звузьте фільтри або оберіть Parquet / gzip.")
+                else:
+                    st.markdown(
+                        f'<a href="{export_link}" download="{export_filename(export_fmt, export_gzip)}">'
+                        f'⬇️ Завантажити {export_fmt.upper()}</a> ({size_mb:.1f} МБ)',
+                        unsafe_allow_html=True,
+                    )
+    finally:
+        # st.stop(), перерваний rerun чи виняток — траса закривається і tracemalloc не лишається ввімкненим
+        run_trace = finish_trace() if profiling_on else None
+
+    # Debug panel: водоспад стадій цього rerun-у (лише якщо скрипт дійшов до кінця)
+    if run_trace is not None:
+        with st.sidebar.expander("⏱ Стадії rerun-у", expanded=True):
+            total_ms = sum(s['ms'] for s in run_trace.spans if s['depth'] == 0)
+            st.caption(f"run {run_trace.run_id} · {total_ms:.0f} ms у замірених стадіях")
+            st.markdown(waterfall_html(run_trace), unsafe_allow_html=True)
+            cache_stats = RESULT_CACHE.stats()
+            st.caption(
+                f"result cache: {cache_stats['hits']} hit / {cache_stats['misses']} miss, "
+                f"{cache_stats['entries']} entries, {cache_stats['bytes'] / 2**20:.1f} / {cache_stats['max_bytes'] / 2**20:.0f} MB"
             )
-            st.plotly_chart(fig2, use_container_width=True)
-    except Exception:
-        logger.exception("Error in trends")
-        st.error("Не вдалося побудувати тренди. Подробиці в логах.")
-
-# Export
-st.markdown("### 📤 Експорт результатів")
-st.download_button(
-    label="⬇️ Завантажити CSV",
-    data=filtered.to_csv(index=False).encode('utf-8'),
-    file_name="filtered_laptops.csv",
-    mime="text/csv"
-)
+            for frames in st.session_state.get('bg_frame_stats', {}).values():
+                st.caption(
+                    f"фон {frames['kind']}{' (економний)' if frames.get('low_power') else ''}: "
+                    f"{frames['mean_ms']:.1f} ms/кадр, p95 {frames['p95_ms']:.1f} ms, "
+                    f"довгих кадрів {frames['long_frames']} з {frames['frames']}"
+                    f"{' · reduced motion' if frames.get('reduced_motion') else ''}"
+                )
@@ -0,0 +1,176 @@
+"""
+Навантажувальний тест HTTP API (src.api).
+Піднімає сервер окремим процесом (або б'є в --url) і запускає --clients паралельних клієнтів з
+keep-alive з'єднаннями. Суміш — --distinct різних запитів (ендпоінти + фільтри), популярність за Zipf;
+кожен клієнт бере з неї --requests запитів, половина клієнтів пам'ятає ETag і шле If-None-Match (304).
+Латентність (медіана, p95) по ендпоінтах і пропускна здатність — у JSON формату run_benchmarks
+(benchmarks/results/api-<commit>.json), тож релізи порівнює той самий --compare.
+Запуск:   python -m benchmarks.api_load --clients 32 --requests 200 --data data/sample_laptops.csv
+Порівняння: python -m benchmarks.run_benchmarks --compare results/api-a.json results/api-b.json
+"""
+import argparse
+import http.client
+import json
+import os
+import platform
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+from benchmarks.run_benchmarks import RESULTS_DIR, _git_commit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BRANDS = ['Acer', 'Apple', 'Asus', 'Dell', 'Hp', 'Lenovo', 'Msi', 'Samsung']
+QUERIES = ['', '', '', 'zenbook', 'oled', 'ultra 7', 'thinkpad x1']
+ENDPOINT_WEIGHTS = {'/api/catalog': 5, '/api/summary': 2, '/api/brand_share': 2, '/api/trends': 1}
+
+
+def random_path(rng: random.Random) -> str:
+    """Запит, схожий на стан сайдбару; ціна — з кроком 100, тож запити повторюються."""
+    endpoint = rng.choices(list(ENDPOINT_WEIGHTS), weights=list(ENDPOINT_WEIGHTS.values()))[0]
+    params = [('brand', b) for b in rng.sample(BRANDS, rng.randint(0, 4))]
+    if rng.random() < 0.5:
+        params.append(('price_max', rng.randrange(800, 3000, 100)))
+    if rng.random() < 0.3:
+        params.append(('ai_cpu', rng.choice(['ai', 'no_ai'])))
+    query = rng.choice(QUERIES)
+    if query:
+        params.append(('q', query))
+    if endpoint == '/api/catalog':
+        params += [('sort', rng.choice(['price_usd', 'battery_wh'])), ('offset', 60 * rng.randint(0, 3))]
+    return endpoint + ('?' + urlencode(params) if params else '')
+
+
+def run_client(base: str, paths: List[str], seed: int, requests: int, revalidate: bool) -> List[Tuple[str, int, float]]:
+    """(ендпоінт, статус, секунди) для кожного запиту клієнта."""
+    url = urlsplit(base)
+    conn = http.client.HTTPConnection(url.hostname, url.port, timeout=30)
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(len(paths))]
+    etags: Dict[str, str] = {}
+    samples = []
+    for path in rng.choices(paths, weights=weights, k=requests):
+        headers = {'If-None-Match': etags[path]} if revalidate and path in etags else {}
+        t0 = time.perf_counter()
+        try:
+            conn.request('GET', url.path.rstrip('/') + path, headers=headers)
+            response = conn.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            conn = http.client.HTTPConnection(url.hostname, url.port, timeout=30)
+            samples.append((path.split('?')[0], 0, time.perf_counter() - t0))
+            continue
+        samples.append((path.split('?')[0], response.status, time.perf_counter() - t0))
+        if response.getheader('ETag'):
+            etags[path] = response.getheader('ETag')
+    conn.close()
+    return samples
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server(data: str, workers: int, backend: str) -> Tuple[subprocess.Popen, str]:
+    port = _free_port()
+    env = {**os.environ, 'LAPTOP_DATA_PATH': data, 'LAPTOP_BACKEND': backend}
+    proc = subprocess.Popen([sys.executable, '-m', 'src.api', '--port', str(port), '--workers', str(workers)],
+                            cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 300
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+            conn.request('GET', '/api/health')
+            if conn.getresponse().status == 200:
+                return proc, f"http://127.0.0.1:{port}"
+        except OSError:
+            time.sleep(0.2)
+        if proc.poll() is not None:
+            break
+    proc.kill()
+    raise RuntimeError("API server did not start")
+
+
+def _p95(values: List[float]) -> float:
+    return sorted(values)[int(0.95 * (len(values) - 1))]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--url', help="вже запущений сервер (інакше стартує python -m src.api)")
+    parser.add_argument('--data', default="data/sample_laptops.csv", help="LAPTOP_DATA_PATH для сервера")
+    parser.add_argument('--backend', default="pandas", choices=['pandas', 'sqlite'])
+    parser.add_argument('--workers', type=int, default=16, help="потоків пулу сервера")
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=200, help="запитів на клієнта")
+    parser.add_argument('--distinct', type=int, default=200, help="різних запитів у суміші")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', help="шлях до JSON (за замовчуванням results/api-<commit>.json)")
+    args = parser.parse_args(argv)
+
+    proc: Optional[subprocess.Popen] = None
+    base = args.url
+    if not base:
+        proc, base = start_server(args.data, args.workers, args.backend)
+    try:
+        rng = random.Random(args.seed)
+        paths = list(dict.fromkeys(random_path(rng) for _ in range(args.distinct)))
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.clients) as pool:
+            jobs = [pool.submit(run_client, base, paths, args.seed + i, args.requests, i % 2 == 0)
+                    for i in range(args.clients)]
+            samples = [s for job in jobs for s in job.result()]
+        wall = time.perf_counter() - t0
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+    statuses = Counter(status for _, status, _ in samples)
+    by_endpoint: Dict[str, List[float]] = defaultdict(list)
+    for endpoint, status, seconds in samples:
+        by_endpoint[endpoint].append(seconds)
+    results = []
+    for endpoint, times in sorted(by_endpoint.items()):
+        stats = {'seconds': statistics.median(times), 'min_seconds': min(times), 'p95_seconds': _p95(times),
+                 'max_seconds': max(times)}
+        results.append({'rows': 0, 'stage': f"api:{endpoint}", 'requests': len(times), **stats})
+        print(f"{endpoint:<20} {len(times):>7} req  p50 {stats['seconds'] * 1000:8.2f} ms  p95 {stats['p95_seconds'] * 1000:8.2f} ms")
+    all_times = [seconds for _, _, seconds in samples]
+    results.append({'rows': 0, 'stage': "api:all", 'requests': len(samples), 'seconds': statistics.median(all_times),
+                    'min_seconds': min(all_times), 'p95_seconds': _p95(all_times)})
+    print(f"{len(samples)} запитів за {wall:.1f} s = {len(samples) / wall:.0f} req/s; статуси {dict(statuses)}")
+
+    commit = _git_commit()
+    payload = {
+        'commit': commit,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'data': args.data,
+        'backend': args.backend,
+        'clients': args.clients,
+        'requests_per_second': len(samples) / wall,
+        'statuses': {str(k): v for k, v in statuses.items()},
+        'results': results,
+    }
+    out = args.out or os.path.join(RESULTS_DIR, f"api-{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, indent=2)
+    print(out)
+    return 0 if not statuses.get(0) and not any(s >= 500 for s in statuses) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
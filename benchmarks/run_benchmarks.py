@@ -0,0 +1,161 @@
+"""
+Бенчмарки обробки каталогу на синтетичних даних.
+Для кожного розміру каталогу міряє час (медіана повторів) і пікову пам'ять (tracemalloc)
+стадій застосунку та пише JSON у benchmarks/results/<commit>.json.
+Запуск:   python -m benchmarks.run_benchmarks --rows 10000 100000 1000000
+Порівняння: python -m benchmarks.run_benchmarks --compare results/old.json results/new.json
+"""
+import argparse
+import datetime as dt
+import itertools
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic_catalog import write_catalog
+from src.catalog_index import CatalogIndex
+from src.data_processing import compute_brand_share, compute_trends, filter_data, load_data, load_data_typed
+from src.price_history import PriceHistory
+from src.search import SearchIndex
+from src.sql_backend import SQLiteCatalog, build_database
+from src.ui.cards import build_card_fragments
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(HERE, ".data")
+RESULTS_DIR = os.path.join(HERE, "results")
+DEFAULT_ROWS = [10_000, 100_000, 1_000_000]
+PAGE_SIZE = 60
+# типовий стан сайдбару: 5 брендів, звужена ціна і діагональ
+QUERY = dict(brands=['Acer', 'Asus', 'Dell', 'Hp', 'Lenovo'], price_range=(500, 1500), screen_range=(14.0, 16.0), ai_cpu="Усі")
+# типовий запит пошуку: префікс, слово з помилкою і число
+SEARCH_QUERY = "zenbo oled ultar 7"
+# знімки історії цін: кожен виклик history_append — наступний день
+HISTORY_START = dt.date(2025, 1, 1)
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=HERE, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def measure(fn: Callable, repeat: int) -> Dict[str, float]:
+    """Медіана часу за repeat запусків + пікова пам'ять окремим запуском під tracemalloc."""
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'seconds': statistics.median(times), 'min_seconds': min(times), 'peak_bytes': peak}
+
+
+def bench_catalog(rows: int, repeat: int) -> List[dict]:
+    path = os.path.join(DATA_DIR, f"synthetic_{rows}.csv")
+    if not os.path.exists(path):
+        write_catalog(path, rows)
+
+    df = load_data(path)
+    index = CatalogIndex(df)
+    search_index = SearchIndex.from_frame(df)
+    filtered = filter_data(df, **QUERY)
+    display_df = filtered.sort_values(by='price_usd')
+    load_repeat = max(1, repeat // 3) if rows >= 1_000_000 else repeat
+    # порожня версія — SQLiteCatalog не кешує результати в RESULT_CACHE, міряється сам запит
+    sql = SQLiteCatalog(build_database(path)[0], version='')
+    history = PriceHistory(os.path.join(DATA_DIR, f"history_{rows}"))
+    shutil.rmtree(history.root, ignore_errors=True)
+    history_days = itertools.count()
+
+    stages = {
+        'load_data': (lambda: load_data(path), load_repeat),
+        'load_data_typed': (lambda: load_data_typed(path), load_repeat),
+        'filter_data': (lambda: filter_data(df, **QUERY), repeat),
+        'filter_positions': (lambda: index.filter_positions(**QUERY), repeat),
+        'catalog_index_build': (lambda: CatalogIndex(df), repeat),
+        'search_index_build': (lambda: SearchIndex.from_frame(df), load_repeat),
+        'search': (lambda: search_index.match(SEARCH_QUERY), repeat),
+        'compute_brand_share': (lambda: compute_brand_share(filtered), repeat),
+        'compute_trends': (lambda: compute_trends(df), repeat),
+        'page_slice': (lambda: filtered.sort_values(by='price_usd').iloc[PAGE_SIZE:2 * PAGE_SIZE], repeat),
+        'card_html': (lambda: ''.join(build_card_fragments(display_df.iloc[:PAGE_SIZE])), repeat),
+        'sqlite_summary': (lambda: sql.summary(QUERY), repeat),
+        'sqlite_page': (lambda: sql.page(QUERY, PAGE_SIZE, PAGE_SIZE), repeat),
+        'sqlite_brand_share': (lambda: sql.brand_share(QUERY), repeat),
+        'sqlite_trends': (lambda: sql.trends(None), repeat),
+        'history_append': (lambda: history.append(df, HISTORY_START + dt.timedelta(days=next(history_days))), repeat),
+        'history_series': (lambda: history.series('model', 'daily', 'price_mean'), repeat),
+    }
+    results = []
+    for name, (fn, n) in stages.items():
+        stats = measure(fn, n)
+        results.append({'rows': rows, 'stage': name, 'filtered_rows': len(filtered), **stats})
+        print(f"{rows:>10} {name:<22} {stats['seconds'] * 1000:10.2f} ms  {stats['peak_bytes'] / 2**20:9.1f} MB", flush=True)
+    return results
+
+
+def compare(old_path: str, new_path: str, threshold: float = 0.10) -> int:
+    """Друкує зміну часу по стадіях; код виходу 1, якщо є регресія > threshold."""
+    with open(old_path, encoding='utf-8') as f:
+        old = {(r['rows'], r['stage']): r for r in json.load(f)['results']}
+    with open(new_path, encoding='utf-8') as f:
+        new = {(r['rows'], r['stage']): r for r in json.load(f)['results']}
+    regressions = 0
+    for key in sorted(old.keys() & new.keys()):
+        before, after = old[key]['seconds'], new[key]['seconds']
+        change = (after - before) / before if before else 0.0
+        flag = "REGRESSION" if change > threshold else ""
+        regressions += bool(flag)
+        print(f"{key[0]:>10} {key[1]:<22} {before * 1000:10.2f} -> {after * 1000:10.2f} ms  {change:+7.1%} {flag}")
+    return 1 if regressions else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=DEFAULT_ROWS)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--out', help="шлях до JSON (за замовчуванням results/<commit>.json)")
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'))
+    args = parser.parse_args(argv)
+    if args.compare:
+        return compare(*args.compare)
+
+    results = []
+    for rows in args.rows:
+        results.extend(bench_catalog(rows, args.repeat))
+    commit = _git_commit()
+    payload = {
+        'commit': commit,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'results': results,
+    }
+    out = args.out or os.path.join(RESULTS_DIR, f"{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, indent=2)
+    print(out)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+"""
+Бенчмарк холодного старту застосунку.
+Кожен замір — у свіжому інтерпретаторі (як новий воркер): час імпорту важких модулів
+і прогін app.py через streamlit.testing.AppTest у звичайному та LAPTOP_FAST_START=1 режимах —
+до першого елемента (CSS/фон), до шапки і до кінця скрипта.
+Пише JSON у форматі run_benchmarks (benchmarks/results/startup-<commit>.json), тож
+порівняння релізів — той самий --compare.
+Запуск:   python -m benchmarks.startup --repeat 5
+Порівняння: python -m benchmarks.run_benchmarks --compare results/startup-a.json results/startup-b.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+from benchmarks.run_benchmarks import RESULTS_DIR, _git_commit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORT_MODULES = [
+    'streamlit', 'pandas', 'numpy', 'plotly.express', 'plotly.graph_objects', 'sklearn.neighbors', 'bs4',
+    'src.backend', 'src.ui.charts',
+]
+HEADER_PREFIX = "## 💻"
+
+_IMPORT_PROBE = """
+import json, sys, time
+t = time.perf_counter()
+import {module}
+print(json.dumps({{'seconds': time.perf_counter() - t}}))
+"""
+
+# перший елемент і шапка ловляться на DeltaGenerator._enqueue — момент, коли елемент іде у браузер
+_APP_PROBE = """
+import json, time
+from streamlit.delta_generator import DeltaGenerator
+from streamlit.testing.v1 import AppTest
+
+marks = {{}}
+enqueue = DeltaGenerator._enqueue
+
+def probe(self, delta_type, element_proto, *args, **kwargs):
+    now = time.perf_counter()
+    marks.setdefault('first_element', now)
+    if delta_type == 'markdown' and element_proto.body.startswith({header!r}):
+        marks.setdefault('header', now)
+    return enqueue(self, delta_type, element_proto, *args, **kwargs)
+
+DeltaGenerator._enqueue = probe
+at = AppTest.from_file({app!r}, default_timeout=600)
+start = time.perf_counter()
+at.run()
+end = time.perf_counter()
+result = {{name: t - start for name, t in marks.items()}}
+result['script'] = end - start
+result['errors'] = len(at.exception)
+print(json.dumps(result))
+"""
+
+
+def _run_probe(code: str, env: Dict[str, str]) -> dict:
+    out = subprocess.run([sys.executable, '-c', code], cwd=ROOT, env={**os.environ, **env},
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def _stats(samples: List[float]) -> Dict[str, float]:
+    return {'seconds': statistics.median(samples), 'min_seconds': min(samples)}
+
+
+def bench_imports(repeat: int) -> List[dict]:
+    results = []
+    for module in IMPORT_MODULES:
+        try:
+            samples = [_run_probe(_IMPORT_PROBE.format(module=module), {})['seconds'] for _ in range(repeat)]
+        except subprocess.CalledProcessError:
+            print(f"{'import ' + module:<36} не встановлено", flush=True)
+            continue
+        stats = _stats(samples)
+        results.append({'rows': 0, 'stage': f"import:{module}", **stats})
+        print(f"{'import ' + module:<36} {stats['seconds'] * 1000:10.1f} ms", flush=True)
+    return results
+
+
+def bench_app(repeat: int, data_path: str) -> List[dict]:
+    results = []
+    code = _APP_PROBE.format(app=os.path.join(ROOT, 'app.py'), header=HEADER_PREFIX)
+    for mode, fast in (('default', '0'), ('fast', '1')):
+        env = {'LAPTOP_FAST_START': fast, 'LAPTOP_DATA_PATH': data_path}
+        runs = [_run_probe(code, env) for _ in range(repeat)]
+        if any(run['errors'] for run in runs):
+            print(f"app [{mode}]: скрипт завершився з винятком", flush=True)
+        for mark in ('first_element', 'header', 'script'):
+            samples = [run[mark] for run in runs if mark in run]
+            if not samples:
+                continue
+            stats = _stats(samples)
+            results.append({'rows': 0, 'stage': f"app_{mode}:{mark}", **stats})
+            print(f"{f'app [{mode}] {mark}':<36} {stats['seconds'] * 1000:10.1f} ms", flush=True)
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--data', default="data/sample_laptops.csv", help="LAPTOP_DATA_PATH для прогону app.py")
+    parser.add_argument('--out', help="шлях до JSON (за замовчуванням results/startup-<commit>.json)")
+    args = parser.parse_args(argv)
+
+    results = bench_imports(args.repeat) + bench_app(args.repeat, args.data)
+    commit = _git_commit()
+    payload = {
+        'commit': commit,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'data': args.data,
+        'results': results,
+    }
+    out = args.out or os.path.join(RESULTS_DIR, f"startup-{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, indent=2)
+    print(out)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""
+Генератор синтетичного каталогу ноутбуків у схемі data/sample_laptops.csv.
+Розподіли брендів/CPU/екранів наближені до реального ринку; ціна залежить від CPU,
+OLED і RAM. Великі каталоги пишуться шматками, щоб не тримати все в пам'яті.
+Запуск: python -m benchmarks.synthetic_catalog 1000000 data/synthetic_1m.csv
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+COLUMNS = [
+    'brand', 'model', 'price_usd', 'screen_size_in', 'cpu', 'display_type', 'refresh_rate',
+    'ram_gb', 'storage_gb', 'battery_wh', 'release_year', 'url', 'image_url',
+]
+
+# бренд -> (частка ринку, лінійки моделей)
+BRANDS = {
+    'Lenovo': (0.23, ['IdeaPad 3', 'IdeaPad Slim 5', 'ThinkPad X1', 'ThinkPad E14', 'Yoga 7', 'Legion 5']),
+    'HP': (0.20, ['Pavilion 14', 'Envy 15', 'Spectre x360', 'EliteBook 840', 'Victus 16']),
+    'Dell': (0.15, ['XPS 13', 'XPS 16', 'Inspiron 15', 'Latitude 5440', 'Alienware m16']),
+    'ASUS': (0.14, ['VivoBook 15', 'Zenbook 14', 'ROG Zephyrus G14', 'TUF Gaming A15', 'ExpertBook B9']),
+    'Acer': (0.12, ['Aspire 5', 'Swift 16', 'Swift Go 14', 'Nitro 5', 'Predator Helios']),
+    'Apple': (0.09, ['MacBook Air 13', 'MacBook Air 15', 'MacBook Pro 14', 'MacBook Pro 16']),
+    'MSI': (0.04, ['Modern 14', 'Prestige 16', 'Katana 15', 'Stealth 16']),
+    'Samsung': (0.03, ['Galaxy Book4', 'Galaxy Book4 Pro', 'Galaxy Book4 Edge']),
+}
+
+# CPU -> (частка серед не-Apple, базова ціна USD)
+CPUS = {
+    'Intel Core i3-1215U': (0.10, 380),
+    'Intel Core i5-1235U': (0.14, 520),
+    'Intel Core i7-1355U': (0.10, 780),
+    'Intel Core Ultra 5 125H': (0.12, 900),
+    'Intel Core Ultra 7 155H': (0.12, 1200),
+    'Intel Core Ultra 7 258V': (0.06, 1350),
+    'AMD Ryzen 3 7320U': (0.06, 350),
+    'AMD Ryzen 5 7530U': (0.10, 500),
+    'AMD Ryzen 7 7840HS': (0.08, 950),
+    'Ryzen AI 7 350': (0.05, 1100),
+    'Ryzen AI 9 HX 370': (0.04, 1500),
+    'Snapdragon X Elite': (0.03, 1250),
+}
+APPLE_CPUS = {'Apple M3': (0.55, 1100), 'Apple M3 Pro': (0.30, 1900), 'Apple M3 Max': (0.15, 3000)}
+
+SCREENS = ([13.3, 14.0, 14.5, 15.6, 16.0, 17.3], [0.10, 0.30, 0.06, 0.30, 0.20, 0.04])
+DISPLAYS = (['IPS', 'OLED', 'Mini-LED', 'TN'], [0.66, 0.24, 0.04, 0.06])
+RAM = ([8, 16, 32, 64], [0.30, 0.45, 0.20, 0.05])
+STORAGE = ([256, 512, 1024, 2048], [0.20, 0.45, 0.28, 0.07])
+YEARS = ([2021, 2022, 2023, 2024, 2025], [0.05, 0.10, 0.20, 0.30, 0.35])
+IMAGES = [
+    'AcerAspire5.png', 'AsusVivoBook15.png', 'HpPavilion14.png', 'Lenovo.png', 'LenovoIdeaPad3.png',
+    'Zenbook.png', 'envy15.png', 'swift16.png', 'xps116.png',
+]
+IMAGE_BASE = "https://raw.githubusercontent.com/lxllLOKIlxl/laptop-trends-2025/main/images/"
+
+
+def _choice(rng: np.random.Generator, options, weights, n: int) -> np.ndarray:
+    w = np.asarray(weights, dtype='float64')
+    return np.asarray(options)[rng.choice(len(options), size=n, p=w / w.sum())]
+
+
+def generate_catalog(n: int, seed: int = 0) -> pd.DataFrame:
+    """Синтетичний каталог з n рядків (детермінований для seed)."""
+    rng = np.random.default_rng(seed)
+    names = list(BRANDS)
+    brand_idx = rng.choice(len(names), size=n, p=np.array([BRANDS[b][0] for b in names]) / sum(b[0] for b in BRANDS.values()))
+    brand = np.asarray(names)[brand_idx]
+
+    model = np.empty(n, dtype=object)
+    for i, name in enumerate(names):
+        mask = brand_idx == i
+        model[mask] = _choice(rng, BRANDS[name][1], np.ones(len(BRANDS[name][1])), int(mask.sum()))
+
+    cpu = np.empty(n, dtype=object)
+    base_price = np.empty(n, dtype='float64')
+    is_apple = brand == 'Apple'
+    for mask, table in ((~is_apple, CPUS), (is_apple, APPLE_CPUS)):
+        k = int(mask.sum())
+        picked = rng.choice(len(table), size=k, p=np.array([v[0] for v in table.values()]) / sum(v[0] for v in table.values()))
+        cpu[mask] = np.asarray(list(table))[picked]
+        base_price[mask] = np.array([v[1] for v in table.values()])[picked]
+
+    display = _choice(rng, *DISPLAYS, n)
+    ram = _choice(rng, *RAM, n)
+    storage = _choice(rng, *STORAGE, n)
+    price = base_price * rng.lognormal(0.0, 0.15, n) + (display == 'OLED') * 150 + (ram - 8) * 6 + (storage - 256) * 0.15
+    refresh = np.where(rng.random(n) < 0.35, _choice(rng, [90, 120, 144, 165, 240], [2, 4, 3, 2, 1], n), 60)
+
+    ids = np.arange(n)
+    return pd.DataFrame({
+        'brand': brand,
+        'model': model,
+        'price_usd': np.round(price, 0).astype('int64'),
+        'screen_size_in': _choice(rng, *SCREENS, n),
+        'cpu': cpu,
+        'display_type': display,
+        'refresh_rate': refresh,
+        'ram_gb': ram,
+        'storage_gb': storage,
+        'battery_wh': np.clip(rng.normal(58, 12, n), 38, 99.9).round(0),
+        'release_year': _choice(rng, *YEARS, n),
+        'url': pd.Series(ids).map("https://example.com/laptop/{}".format).to_numpy(),
+        'image_url': IMAGE_BASE + _choice(rng, IMAGES, np.ones(len(IMAGES)), n).astype(object),
+    }, columns=COLUMNS)
+
+
+def write_catalog(path: str, n: int, seed: int = 0, chunk_rows: int = 1_000_000) -> str:
+    """Пише синтетичний CSV шматками по chunk_rows (кожен шматок — свій seed)."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, 'w', encoding='utf-8', newline='') as f:
+        for i, start in enumerate(range(0, n, chunk_rows)):
+            chunk = generate_catalog(min(chunk_rows, n - start), seed=seed * 1_000_003 + i)
+            chunk.to_csv(f, index=False, header=(i == 0))
+    os.replace(tmp, path)
+    return path
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    out = sys.argv[2] if len(sys.argv) > 2 else os.path.join("data", f"synthetic_{rows}.csv")
+    print(write_catalog(out, rows))
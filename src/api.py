@@ -0,0 +1,343 @@
+"""
+HTTP JSON API над тим самим каталогом, що й app.py (для внутрішніх інструментів, без сесій Streamlit).
+Ендпоінти (GET): /api/catalog (сторінка відфільтрованого каталогу), /api/summary, /api/brand_share,
+/api/trends, /api/options, /api/history, /api/health. Параметри фільтра — ті самі, що у filter_data:
+brand (повторюваний або через кому), price_min/price_max, screen_min/screen_max, ai_cpu, cpu_tier,
+panel_type, q; сторінка — offset, limit, sort, desc; тренди — metric.
+ETag = хеш (версія датасету, ендпоінт, filter_key + параметри): If-None-Match з тим самим ETag -> 304
+без обчислень; тіло відповіді — у RESULT_CACHE під тим самим ключем. Запити обробляє пул потоків.
+Змінні середовища — як у app.py (LAPTOP_DATA_PATH, LAPTOP_BACKEND, LAPTOP_TYPED_INGEST, LAPTOP_DEDUP_KEEP).
+Запуск: python -m src.api --port 8502 --workers 16
+Виклик: curl 'http://localhost:8502/api/catalog?brand=Dell&brand=Asus&price_max=1500&sort=price_usd&limit=20'
+"""
+import argparse
+import datetime as dt
+import hashlib
+import json
+import logging
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from src.backend import open_catalog
+from src.catalog_index import DEFAULT_SORT, FACET_COLUMNS, SORT_KEYS, filter_key
+from src.data_processing import TREND_METRICS
+from src.result_cache import RESULT_CACHE
+from src.search import RELEVANCE
+
+logger = logging.getLogger(__name__)
+
+DATA_PATH = os.environ.get("LAPTOP_DATA_PATH", "data/sample_laptops.csv")
+BACKEND = os.environ.get("LAPTOP_BACKEND", "pandas")
+TYPED_INGEST = os.environ.get("LAPTOP_TYPED_INGEST", "0") == "1"
+DEDUP_KEEP = os.environ.get("LAPTOP_DEDUP_KEEP", "cheapest")
+
+DEFAULT_LIMIT = 60
+MAX_LIMIT = 500
+DEFAULT_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+KEEPALIVE_TIMEOUT = 5
+# ai_cpu: значення з сайдбару або латинські синоніми
+AI_CPU_VALUES = {'all': "Усі", 'ai': "Із AI", 'no_ai': "Без AI"}
+# колонки лише pandas-бекенду — у відповіді однакова схема для обох бекендів
+_PANDAS_ONLY = ['image_list']
+
+
+def _list(params: Dict[str, List[str]], name: str) -> List[str]:
+    """Значення повторюваного параметра (?brand=A&brand=B або ?brand=A,B)."""
+    return [v.strip() for raw in params.get(name, []) for v in raw.split(',') if v.strip()]
+
+
+def _one(params: Dict[str, List[str]], name: str) -> Optional[str]:
+    values = params.get(name)
+    return values[-1] if values else None
+
+
+def _number(params: Dict[str, List[str]], name: str, cast=float):
+    value = _one(params, name)
+    if value is None or value == '':
+        return None
+    try:
+        return cast(value)
+    except ValueError:
+        raise ValueError(f"{name}: очікується число, отримано {value!r}") from None
+
+
+def _range(params, low: str, high: str) -> Optional[Tuple[float, float]]:
+    lo, hi = _number(params, low), _number(params, high)
+    if lo is None and hi is None:
+        return None
+    return (lo if lo is not None else -np.inf, hi if hi is not None else np.inf)
+
+
+def parse_filters(params: Dict[str, List[str]]) -> dict:
+    """filters для бекенду каталогу з query-параметрів."""
+    ai_cpu = _one(params, 'ai_cpu') or "Усі"
+    ai_cpu = AI_CPU_VALUES.get(ai_cpu, ai_cpu)
+    if ai_cpu not in AI_CPU_VALUES.values():
+        raise ValueError(f"ai_cpu: одне з {sorted(AI_CPU_VALUES)}")
+    return dict(
+        brands=_list(params, 'brand'),
+        price_range=_range(params, 'price_min', 'price_max'),
+        screen_range=_range(params, 'screen_min', 'screen_max'),
+        ai_cpu=ai_cpu,
+        facets={col: _list(params, col) for col in FACET_COLUMNS if _list(params, col)},
+        query=_one(params, 'q'),
+    )
+
+
+def has_filters(filters: dict) -> bool:
+    return filter_key(**filters) != filter_key()
+
+
+def parse_sort(params: Dict[str, List[str]]) -> Tuple[str, bool]:
+    column = _one(params, 'sort') or DEFAULT_SORT[0]
+    if column not in SORT_KEYS and column != RELEVANCE:
+        raise ValueError(f"sort: одне з {sorted(SORT_KEYS) + [RELEVANCE]}")
+    return column, _one(params, 'desc') in ('1', 'true')
+
+
+def _records(df: pd.DataFrame) -> list:
+    """Рядки DataFrame як JSON-сумісні dict (NaN -> null, numpy -> python)."""
+    return json.loads(df.to_json(orient='records', date_format='iso', force_ascii=False))
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (pd.Timestamp, dt.date)):
+        return value.isoformat()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"not JSON serializable: {type(value).__name__}")
+
+
+def json_bytes(payload) -> bytes:
+    return json.dumps(payload, ensure_ascii=False, separators=(',', ':'), default=_json_default).encode('utf-8')
+
+
+# ендпоінт: (catalog, params) -> (ключ відповіді, обчислення JSON-пейлоада)
+Endpoint = Callable[[object, Dict[str, List[str]]], Tuple[Hashable, Callable[[], object]]]
+
+
+def _catalog_page(catalog, params):
+    filters = parse_filters(params)
+    sort = parse_sort(params)
+    offset = max(0, _number(params, 'offset', int) or 0)
+    limit = _number(params, 'limit', int)
+    limit = DEFAULT_LIMIT if limit is None else max(0, min(limit, MAX_LIMIT))
+
+    def compute():
+        page = catalog.page(filters, offset, limit, sort).drop(columns=_PANDAS_ONLY, errors='ignore')
+        items = _records(page)
+        for row_id, item in zip(page.index.tolist(), items):
+            item['id'] = row_id
+        return {'total': catalog.summary(filters)[0], 'offset': offset, 'limit': limit,
+                'sort': sort[0], 'desc': sort[1], 'items': items}
+    return (filter_key(**filters), sort, offset, limit), compute
+
+
+def _summary(catalog, params):
+    filters = parse_filters(params)
+
+    def compute():
+        count, mean_price, mean_battery = catalog.summary(filters)
+        return {'count': count, 'mean_price': mean_price, 'mean_battery': mean_battery}
+    return filter_key(**filters), compute
+
+
+def _brand_share(catalog, params):
+    filters = parse_filters(params)
+    return filter_key(**filters), lambda: _records(catalog.brand_share(filters))
+
+
+def _trends(catalog, params):
+    filters = parse_filters(params)
+    metrics = _list(params, 'metric') or None
+    unknown = [m for m in metrics or [] if m not in TREND_METRICS]
+    if unknown:
+        raise ValueError(f"metric: невідомі {unknown}, доступні {sorted(TREND_METRICS)}")
+    # без фільтрів — тренди всього каталогу (той самий кеш, що й у вкладці трендів)
+    scoped = filters if has_filters(filters) else None
+    return (filter_key(**filters), tuple(metrics or ())), lambda: _records(catalog.trends(scoped, metrics=metrics))
+
+
+def _options(catalog, params):
+    def compute():
+        options = catalog.options()
+        return {
+            'brands': options['brands'], 'price': options['price'], 'screen': options['screen'],
+            'facets': options['facets'], 'ai_cpu': AI_CPU_VALUES, 'sort': [*SORT_KEYS, RELEVANCE],
+            'metrics': {name: spec[0] for name, spec in TREND_METRICS.items()},
+        }
+    return None, compute
+
+
+def _history(catalog, params):
+    from src.price_history import FREQS, HISTORY_METRICS, LEVELS, PriceHistory
+
+    level, freq = _one(params, 'level') or 'brand', _one(params, 'freq') or 'weekly'
+    metric = _one(params, 'metric') or 'price_mean'
+    if level not in LEVELS or freq not in FREQS or metric not in HISTORY_METRICS:
+        raise ValueError(f"level: {list(LEVELS)}, freq: {list(FREQS)}, metric: {list(HISTORY_METRICS)}")
+    keys = _list(params, 'key') or None
+    history = PriceHistory()
+    # історія не залежить від версії каталогу — ключ включає ревізію сховища
+    revision = history.manifest().get('revision', 0)
+    return (revision, level, freq, metric, tuple(keys or ())), \
+        lambda: _records(history.series(level, freq, metric, keys=keys))
+
+
+def _health(catalog, params):
+    return None, lambda: {'version': catalog.version, 'backend': BACKEND, 'rows': catalog.summary({})[0]}
+
+
+ENDPOINTS: Dict[str, Endpoint] = {
+    '/api/catalog': _catalog_page,
+    '/api/summary': _summary,
+    '/api/brand_share': _brand_share,
+    '/api/trends': _trends,
+    '/api/options': _options,
+    '/api/history': _history,
+    '/api/health': _health,
+}
+
+
+def get_catalog():
+    """Каталог як у app.py; відбиток файлу перевіряється щоразу, тож новий CSV підхоплюється сам."""
+    return open_catalog(DATA_PATH, backend=BACKEND, typed=TYPED_INGEST, keep=DEDUP_KEEP)
+
+
+def make_etag(version: str, path: str, key) -> str:
+    return '"' + hashlib.sha1(repr((version, path, key)).encode('utf-8')).hexdigest()[:24] + '"'
+
+
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+    if not header:
+        return False
+    tags = [t.strip().removeprefix('W/') for t in header.split(',')]
+    return '*' in tags or etag in tags
+
+
+def respond(path: str, params: Dict[str, List[str]], if_none_match: Optional[str] = None,
+            catalog=None) -> Tuple[int, Dict[str, str], bytes]:
+    """(статус, заголовки, тіло) для GET path?params — без HTTP, щоб викликати й напряму."""
+    endpoint = ENDPOINTS.get(path)
+    if endpoint is None:
+        return 404, {}, json_bytes({'error': f"unknown endpoint {path}", 'endpoints': sorted(ENDPOINTS)})
+    catalog = catalog or get_catalog()
+    if catalog is None:
+        return 503, {}, json_bytes({'error': "дані не завантажені"})
+    try:
+        key, compute = endpoint(catalog, params)
+    except ValueError as e:
+        return 400, {}, json_bytes({'error': str(e)})
+
+    version = catalog.version
+    if not version:
+        # датасет без версії — кешувати відповідь нема за чим
+        return 200, {'Cache-Control': 'no-store'}, json_bytes(compute())
+    etag = make_etag(version, path, key)
+    headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+    if _etag_matches(if_none_match, etag):
+        return 304, headers, b''
+    body = RESULT_CACHE.get_or_compute(version, path, key, lambda: json_bytes(compute()))
+    return 200, headers, body
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "laptop-trends-api"
+    # скільки тримати keep-alive з'єднання без запитів (займає потік пулу)
+    timeout = KEEPALIVE_TIMEOUT
+    # заголовки і тіло — окремі send(); без цього Nagle + delayed ACK дають ~40 ms на keep-alive
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        try:
+            status, headers, body = respond(url.path.rstrip('/') or '/', parse_qs(url.query),
+                                            self.headers.get('If-None-Match'))
+        except Exception:
+            logger.exception("API error for %s", self.path)
+            status, headers, body = 500, {}, json_bytes({'error': "internal error"})
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if self.server.waiting:
+            # є з'єднання в черзі — звільняємо потік, а не тримаємо keep-alive
+            self.send_header('Connection', 'close')
+        if status != 304:
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if status != 304:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+class PooledHTTPServer(HTTPServer):
+    """HTTPServer, де з'єднання обробляє обмежений пул потоків (а не потік на з'єднання)."""
+
+    request_queue_size = 128
+
+    def __init__(self, address, handler, workers: int = DEFAULT_WORKERS):
+        super().__init__(address, handler)
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="api")
+        # з'єднання, які чекають на вільний потік
+        self.waiting = 0
+        self._lock = threading.Lock()
+
+    def process_request(self, request, client_address):
+        with self._lock:
+            self.waiting += 1
+        self.pool.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address):
+        with self._lock:
+            self.waiting -= 1
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+def serve(host: str = "127.0.0.1", port: int = 8502, workers: int = DEFAULT_WORKERS) -> None:
+    # каталог і індекси — до першого запиту
+    catalog = get_catalog()
+    logger.info("catalog %s (%s), %d workers", catalog.version if catalog else None, BACKEND, workers)
+    with PooledHTTPServer((host, port), ApiHandler, workers) as server:
+        logger.info("listening on http://%s:%d/api/", *server.server_address[:2])
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="HTTP JSON API каталогу ноутбуків")
+    parser.add_argument('--host', default="127.0.0.1")
+    parser.add_argument('--port', type=int, default=8502)
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS)
+    args = parser.parse_args(argv)
+    serve(args.host, args.port, args.workers)
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
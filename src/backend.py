@@ -0,0 +1,152 @@
+"""
+Вибір бекенду каталогу: 'pandas' (увесь каталог у DataFrame + CatalogIndex) або 'sqlite'
+(src.sql_backend, запити на диску). Обидва мають однаковий інтерфейс:
+options() / summary(filters) / page(filters, offset, limit, sort) / brand_share(filters) /
+trends(filters, metrics) / distribution(filters, x, y, bins) / export_file(filters, fmt, compress) /
+similar(row_ids, k);
+filters — dict аргументів filter_positions (brands, price_range, screen_range, ai_cpu, facets, query);
+sort — (колонка з SORT_KEYS або RELEVANCE для запиту пошуку, за спаданням).
+Виклик: catalog = open_catalog(path, backend=os.environ.get("LAPTOP_BACKEND", "pandas"))
+"""
+import logging
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.catalog_index import DEFAULT_SORT, FACET_COLUMNS, filter_key, filter_positions, get_catalog_index
+from src.data_cache import dataset_version, load_data_cached
+from src.data_processing import compute_brand_share
+from src.distribution import DEFAULT_BINS, DISTRIBUTION_AXES, SCATTER_MAX_POINTS, distribution_payload
+from src.export import export_file
+from src.profiling import span
+from src.result_cache import RESULT_CACHE
+from src.search import RELEVANCE, query_terms, rank_positions, search_positions
+from src.similar import DEFAULT_K, get_similar_index, neighbor_frame
+from src.specs import facet_values
+from src.trends import trends_for
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ('pandas', 'sqlite')
+
+
+class PandasCatalog:
+    """Каталог у пам'яті; проміжні результати — у RESULT_CACHE за (версія, ключ фільтрів)."""
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self.version = dataset_version(df)
+
+    def positions(self, filters: dict) -> np.ndarray:
+        return RESULT_CACHE.get_or_compute(
+            self.version, 'positions', filter_key(**filters), lambda: filter_positions(self.df, **filters),
+        )
+
+    def options(self) -> dict:
+        df = self.df
+
+        def compute():
+            return {
+                'brands': sorted(df['brand'].unique()),
+                'price': (df['price_usd'].min(), df['price_usd'].max()),
+                'screen': (df['screen_size_in'].min(), df['screen_size_in'].max()),
+                'facets': {col: facet_values(df, col) for col in FACET_COLUMNS if col in df.columns},
+            }
+        return RESULT_CACHE.get_or_compute(self.version, 'options', None, compute)
+
+    def summary(self, filters: dict) -> Tuple[int, Optional[float], Optional[float]]:
+        positions = self.positions(filters)
+
+        def compute():
+            if not len(positions):
+                return (0, None, None)
+            return (
+                len(positions),
+                float(self.df['price_usd'].to_numpy(dtype='float64')[positions].mean()),
+                float(self.df['battery_wh'].to_numpy(dtype='float64')[positions].mean()),
+            )
+        return RESULT_CACHE.get_or_compute(self.version, 'summary', filter_key(**filters), compute)
+
+    def order(self, filters: dict, sort: Tuple[str, bool] = DEFAULT_SORT) -> np.ndarray:
+        """Позиції відфільтрованих рядків у порядку sort (один раз на стан фільтрів і сортування)."""
+        positions = self.positions(filters)
+        if sort[0] == RELEVANCE and not query_terms(filters.get('query')):
+            sort = DEFAULT_SORT
+
+        def compute():
+            if sort[0] == RELEVANCE:
+                return rank_positions(positions, *search_positions(self.df, filters['query']))
+            return get_catalog_index(self.df).sorted_positions(positions, *sort)
+        with span("sort_catalog", rows=len(positions)):
+            return RESULT_CACHE.get_or_compute(self.version, 'order', (filter_key(**filters), tuple(sort)), compute)
+
+    def page(self, filters: dict, offset: int, limit: int, sort: Tuple[str, bool] = DEFAULT_SORT) -> pd.DataFrame:
+        """Рядки сторінки в порядку sort; гортання — лише зріз готового порядку.
+           Індекс df лишається стабільним id для кешу карток.
+        """
+        return self.df.take(self.order(filters, sort)[offset:offset + limit])
+
+    def brand_share(self, filters: dict) -> pd.DataFrame:
+        positions = self.positions(filters)
+        return RESULT_CACHE.get_or_compute(
+            self.version, 'brand_share', filter_key(**filters),
+            lambda: compute_brand_share(self.df[['brand']].take(positions)),
+        )
+
+    def trends(self, filters: Optional[dict] = None, metrics: Optional[List[str]] = None) -> pd.DataFrame:
+        if filters is None:
+            return trends_for(self.df, metrics=metrics)
+        return trends_for(self.df, self.positions(filters), key=filter_key(**filters), metrics=metrics)
+
+    def distribution(self, filters: dict, x: str, y: str, bins: int = DEFAULT_BINS) -> dict:
+        """Точки або 2D-гістограма x/y по відфільтрованих рядках (src.distribution)."""
+        for col in (x, y):
+            if col not in DISTRIBUTION_AXES or col not in self.df.columns:
+                raise ValueError(f"Unknown axis: {col}")
+        positions = self.positions(filters)
+
+        def compute():
+            xs = self.df[x].to_numpy(dtype='float64', na_value=np.nan)[positions]
+            ys = self.df[y].to_numpy(dtype='float64', na_value=np.nan)[positions]
+            # пропуски відкидаємо до вибору режиму (точки/біни) — n і режим як у SQLite-бекенді
+            valid = ~(np.isnan(xs) | np.isnan(ys))
+            rows = positions[valid]
+            labels = None
+            if len(rows) <= SCATTER_MAX_POINTS:
+                # підписи лише для видимих точок: спершу take, потім конкатенація
+                labels = (self.df['brand'].take(rows).astype(str) + ' '
+                          + self.df['model'].take(rows).astype(str)).to_numpy()
+            return distribution_payload(xs[valid], ys[valid], labels, bins)
+        with span("distribution", rows=len(positions)):
+            return RESULT_CACHE.get_or_compute(self.version, 'distribution', (filter_key(**filters), x, y, int(bins)), compute)
+
+    def export_file(self, filters: dict, fmt: str = 'csv', compress: bool = False) -> str:
+        """Шлях до файлу експорту в static/exports (src.export.export_url дає посилання)."""
+        return export_file(self.df, self.positions(filters), filter_key(**filters), fmt, compress)
+
+
+    def similar(self, row_ids, k: int = DEFAULT_K) -> pd.DataFrame:
+        """Схожі моделі для рядків row_ids (індекс df): source, rank, distance + brand/model/price_usd сусіда."""
+        row_ids = tuple(row_ids)
+
+        def compute():
+            positions = self.df.index.get_indexer(row_ids)
+            positions = positions[positions >= 0]
+            neighbors, distances = get_similar_index(self.df).query(positions, k)
+            pairs = neighbor_frame(self.df.index[positions], neighbors, distances)
+            found = self.df[['brand', 'model', 'price_usd']].take(pairs['neighbor'])
+            return pd.concat([pairs.drop(columns='neighbor').set_index(found.index), found], axis=1)
+        with span("similar", rows=len(row_ids)):
+            return RESULT_CACHE.get_or_compute(self.version, 'similar', (row_ids, int(k)), compute)
+
+
+def open_catalog(path: str, backend: str = 'pandas', typed: bool = False, keep: str = "cheapest"):
+    """Каталог обраного бекенду або None, якщо дані не завантажились."""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend: {backend}")
+    if backend == 'sqlite':
+        from src.sql_backend import open_sqlite_catalog
+        return open_sqlite_catalog(path, keep=keep)
+    df = load_data_cached(path, typed=typed, keep=keep)
+    return PandasCatalog(df) if not df.empty else None
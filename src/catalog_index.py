@@ -0,0 +1,208 @@
+"""
+Індекс каталогу для швидкої фільтрації.
+Будується один раз на версію датасету: відсортовані ціна й діагональ
+(діапазони -> searchsorted-зрізи), списки позицій по брендах, бітова маска AI CPU
+і коди фасетів CPU/екрана (src.specs). Текстовий запит (query) — через src.search. Порядки сортування (SORT_KEYS) — перестановки,
+пораховані раз на версію; сторінка = зріз перестановки, перетятої з вибіркою фільтра.
+Результат — позиції рядків (np.ndarray), а не копія DataFrame.
+Виклик: pos = filter_positions(df, brands, price_range, screen_range, ai_cpu, facets={'cpu_tier': ['Ultra 7']},
+                               query="zenbook oled")
+        filtered = df.take(pos)
+"""
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.data_cache import dataset_version
+from src.data_processing import range_bounds
+from src.profiling import span, timed
+from src.search import query_terms, search_positions
+
+RANGE_COLUMNS = ('price_usd', 'screen_size_in')
+FACET_COLUMNS = ('cpu_tier', 'panel_type')
+# колонка -> підпис для сортування каталогу; рівні значення — за позицією рядка
+SORT_KEYS = {
+    'price_usd': 'Ціна',
+    'battery_wh': 'Автономність',
+    'screen_size_in': 'Діагональ',
+    'release_year': 'Рік',
+}
+DEFAULT_SORT = ('price_usd', False)
+MAX_INDEXES = 4
+
+_indexes: Dict[str, "CatalogIndex"] = {}
+
+
+def filter_key(brands=None, price_range=None, screen_range=None, ai_cpu="Усі", facets=None, query=None) -> Tuple:
+    """Канонічний (хешований) ключ стану фільтрів — для кешів результатів."""
+    brands_key = tuple(sorted(set(brands))) if brands else ()
+    price_key = (float(price_range[0]), float(price_range[1])) if price_range else None
+    screen_key = (float(screen_range[0]), float(screen_range[1])) if screen_range else None
+    facets_key = tuple(sorted(
+        (col, tuple(sorted(set(map(str, values))))) for col, values in (facets or {}).items() if values
+    ))
+    return (brands_key, price_key, screen_key, ai_cpu, facets_key, query_terms(query))
+
+
+class CatalogIndex:
+    """Незмінний індекс над одним DataFrame (позиції = iloc-позиції рядків)."""
+
+    def __init__(self, df: pd.DataFrame):
+        self.size = len(df)
+        # col -> (відсортовані значення, позиції у цьому порядку)
+        self.sorted_columns: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self.values: Dict[str, np.ndarray] = {}
+        # тип колонки в каталозі (typed — float32): межі фільтрів приводяться до нього
+        self.range_dtypes: Dict[str, np.dtype] = {}
+        for col in RANGE_COLUMNS:
+            self.range_dtypes[col] = df[col].to_numpy().dtype
+            values = df[col].to_numpy(dtype='float64')
+            order = np.argsort(values, kind='stable')
+            self.values[col] = values
+            self.sorted_columns[col] = (values[order], order)
+
+        codes, uniques = pd.factorize(df['brand'], use_na_sentinel=False)
+        self.brand_codes = codes
+        self.brand_lookup = {brand: i for i, brand in enumerate(uniques)}
+        # позиції рядків кожного бренду (відсортовані за зростанням)
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+        self.brand_positions = [order[bounds[i]:bounds[i + 1]] for i in range(len(uniques))]
+
+        self.is_ai_cpu = df['is_ai_cpu'].to_numpy(dtype=bool)
+
+        # перестановки сортування будуються ліниво, по одній на (колонку, напрям)
+        for col in SORT_KEYS:
+            if col in df.columns and col not in self.values:
+                self.values[col] = df[col].to_numpy(dtype='float64')
+        self._orders: Dict[Tuple[str, bool], Tuple[np.ndarray, np.ndarray]] = {}
+
+        # фасет -> (коди рядків, значення -> код); код -1 (порожньо) не проходить жоден вибір
+        self.facet_codes: Dict[str, Tuple[np.ndarray, Dict[str, int]]] = {}
+        for col in FACET_COLUMNS:
+            if col in df.columns:
+                codes, uniques = pd.factorize(df[col])
+                self.facet_codes[col] = (codes, {str(v): i for i, v in enumerate(uniques)})
+
+    def order(self, col: str, descending: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        """(перестановка, ранг кожного рядка) для сортування за col; стабільно за позицією."""
+        cached = self._orders.get((col, descending))
+        if cached is None:
+            if not descending and col in self.sorted_columns:
+                perm = self.sorted_columns[col][1]
+            else:
+                values = self.values[col]
+                perm = np.argsort(-values if descending else values, kind='stable')
+            rank = np.empty(self.size, dtype=np.intp)
+            rank[perm] = np.arange(self.size)
+            cached = self._orders[(col, descending)] = (perm, rank)
+        return cached
+
+    def sorted_positions(self, positions: np.ndarray, col: str = 'price_usd', descending: bool = False) -> np.ndarray:
+        """positions у порядку сортування — перетин з готовою перестановкою, без сортування значень."""
+        perm, rank = self.order(col, descending)
+        k = len(positions)
+        if k == self.size:
+            return perm
+        if k * max(1, int(np.log2(k + 1))) < self.size:
+            # мала вибірка: впорядковуємо її ранги (цілі), а не значення
+            return positions[np.argsort(rank[positions])]
+        selected = np.zeros(self.size, dtype=bool)
+        selected[positions] = True
+        return perm[selected[perm]]
+
+    def _range_slice(self, col: str, lo, hi) -> np.ndarray:
+        sorted_values, order = self.sorted_columns[col]
+        start = np.searchsorted(sorted_values, lo, side='left')
+        stop = np.searchsorted(sorted_values, hi, side='right')
+        return order[start:max(start, stop)]
+
+    def filter_positions(self, brands=None, price_range=None, screen_range=None, ai_cpu="Усі", facets=None,
+                         matches: Optional[np.ndarray] = None) -> np.ndarray:
+        """Позиції рядків, що проходять фільтри (семантика як у filter_data), за зростанням.
+           matches — позиції збігів текстового пошуку (за зростанням), None — без пошуку.
+        """
+        # кандидати: найвужча з доступних "стартових" множин
+        starts = []
+        brand_allowed: Optional[np.ndarray] = None
+        if brands:
+            selected = [self.brand_lookup[b] for b in set(brands) if b in self.brand_lookup]
+            brand_allowed = np.zeros(len(self.brand_positions), dtype=bool)
+            brand_allowed[selected] = True
+            sizes = sum(len(self.brand_positions[c]) for c in selected)
+            starts.append((sizes, 'brand'))
+        ranges = {}
+        if price_range:
+            ranges['price_usd'] = range_bounds(self.range_dtypes['price_usd'], *price_range)
+        if screen_range:
+            ranges['screen_size_in'] = range_bounds(self.range_dtypes['screen_size_in'], *screen_range)
+        slices = {col: self._range_slice(col, lo, hi) for col, (lo, hi) in ranges.items()}
+        starts.extend((len(s), col) for col, s in slices.items())
+        if matches is not None:
+            starts.append((len(matches), 'search'))
+
+        if not starts:
+            candidates = np.arange(self.size)
+            driver = None
+        else:
+            _, driver = min(starts, key=lambda item: item[0])
+            if driver == 'brand':
+                postings = [self.brand_positions[c] for c in np.flatnonzero(brand_allowed)]
+                candidates = np.concatenate(postings) if postings else np.empty(0, dtype=np.intp)
+            elif driver == 'search':
+                candidates = matches
+            else:
+                candidates = slices[driver]
+
+        # решта умов — перевірка лише на кандидатах
+        if matches is not None and driver != 'search':
+            matched = np.zeros(self.size, dtype=bool)
+            matched[matches] = True
+            candidates = candidates[matched[candidates]]
+        if brand_allowed is not None and driver != 'brand':
+            candidates = candidates[brand_allowed[self.brand_codes[candidates]]]
+        for col, (lo, hi) in ranges.items():
+            if col == driver:
+                continue
+            v = self.values[col][candidates]
+            candidates = candidates[(v >= lo) & (v <= hi)]
+        if ai_cpu == "Із AI":
+            candidates = candidates[self.is_ai_cpu[candidates]]
+        elif ai_cpu == "Без AI":
+            candidates = candidates[~self.is_ai_cpu[candidates]]
+        for col, values in (facets or {}).items():
+            if not values or col not in self.facet_codes:
+                continue
+            codes, lookup = self.facet_codes[col]
+            # останній елемент — для коду -1
+            allowed = np.zeros(len(lookup) + 1, dtype=bool)
+            allowed[[lookup[v] for v in map(str, values) if v in lookup]] = True
+            candidates = candidates[allowed[codes[candidates]]]
+
+        return np.sort(candidates) if driver is not None else candidates
+
+
+def get_catalog_index(df: pd.DataFrame) -> CatalogIndex:
+    """Індекс для df; кешується по dataset_version (без версії — будується щоразу)."""
+    version = dataset_version(df)
+    if not version:
+        return CatalogIndex(df)
+    index = _indexes.get(version)
+    if index is None:
+        with span("catalog_index_build", rows=len(df)):
+            index = CatalogIndex(df)
+        _indexes[version] = index
+        while len(_indexes) > MAX_INDEXES:
+            _indexes.pop(next(iter(_indexes)))
+    return index
+
+
+@timed("filter_positions")
+def filter_positions(df: pd.DataFrame, brands=None, price_range=None, screen_range=None, ai_cpu="Усі",
+                     facets=None, query=None) -> np.ndarray:
+    """Індексована заміна filter_data: ті самі аргументи, результат — позиції рядків."""
+    if df.empty:
+        return np.empty(0, dtype=np.intp)
+    matches = search_positions(df, query)[0] if query_terms(query) else None
+    return get_catalog_index(df).filter_positions(brands, price_range, screen_range, ai_cpu, facets, matches)
@@ -0,0 +1,171 @@
+"""
+Кешований шар завантаження датасету.
+Ключ кешу — відбиток файлу: шлях, mtime, розмір і sha1 вмісту.
+Нормалізований DataFrame тримаємо в пам'яті процесу, а також пишемо
+колонковий sidecar (.parquet) у <тека даних>/.cache, щоб холодний старт
+не проганяв нормалізацію заново.
+Виклик: df = load_data_cached("data/sample_laptops.csv")
+"""
+import hashlib
+import logging
+import os
+import re
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+import pandas as pd
+
+from src.data_processing import is_multi_source, load_data, load_data_typed
+from src.profiling import timed
+
+logger = logging.getLogger(__name__)
+
+# Змінюй при зміні нормалізації в load_data — старі sidecar-файли стануть невалідними
+NORMALIZE_VERSION = 2
+CACHE_DIRNAME = ".cache"
+MEMORY_SLOTS = 4
+MAX_CONTENT_HASHES = 256
+
+# (abs_path, mtime_ns, size) -> sha1 вмісту; щоб не хешувати файл на кожен rerun (LRU, бо
+# кожна зміна файлу — новий ключ)
+_content_hashes: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+# dataset_version -> DataFrame
+_frames: "OrderedDict[str, pd.DataFrame]" = OrderedDict()
+# id(df) -> (weakref на df, версія); лише самі закешовані об'єкти, не їхні зрізи/копії
+_versions: Dict[int, Tuple[weakref.ref, str]] = {}
+# кеші вище змінюються і з пулу потоків src.api (weakref-колбек _versions — без lock: він може
+# спрацювати всередині секції під lock у тому ж потоці, а dict.pop атомарний)
+_lock = threading.Lock()
+
+
+def _content_hash(path: str, stat_key: Tuple[str, int, int]) -> str:
+    with _lock:
+        digest = _content_hashes.get(stat_key)
+        if digest is not None:
+            _content_hashes.move_to_end(stat_key)
+            return digest
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    digest = h.hexdigest()
+    with _lock:
+        _content_hashes[stat_key] = digest
+        while len(_content_hashes) > MAX_CONTENT_HASHES:
+            _content_hashes.popitem(last=False)
+    return digest
+
+
+def file_fingerprint(path: str) -> str:
+    """Відбиток файлу (шлях, mtime, розмір, хеш вмісту) — коротка hex-стрічка."""
+    st = os.stat(path)
+    stat_key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+    digest = _content_hash(path, stat_key)
+    raw = f"{stat_key[0]}|{stat_key[1]}|{stat_key[2]}|{digest}|v{NORMALIZE_VERSION}"
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:16]
+
+
+def dataset_version(df: pd.DataFrame) -> str:
+    """Версія датасету, якщо df — саме той об'єкт, що лежить у кеші ('' для будь-якого іншого).
+       Не df.attrs: pandas копіює attrs у кожен зріз, take і copy, і підмножина отримала б
+       індекси повного каталогу.
+    """
+    entry = _versions.get(id(df))
+    return entry[1] if entry is not None and entry[0]() is df else ''
+
+
+def _sidecar_path(path: str, version: str) -> str:
+    """<тека>/.cache/<ім'я з розширенням>.<версія>.parquet — a.csv і a.parquet мають різні sidecar-и."""
+    folder = os.path.join(os.path.dirname(os.path.abspath(path)), CACHE_DIRNAME)
+    return os.path.join(folder, f"{os.path.basename(path)}.{version}.parquet")
+
+
+def _read_sidecar(sidecar: str) -> pd.DataFrame:
+    if not os.path.exists(sidecar):
+        return pd.DataFrame()
+    try:
+        df = pd.read_parquet(sidecar)
+    except Exception:
+        logger.exception("Error reading sidecar %s", sidecar)
+        return pd.DataFrame()
+    # parquet повертає списки як ndarray — повертаємо звичні list
+    if 'image_list' in df.columns:
+        df['image_list'] = df['image_list'].map(list)
+    return df
+
+
+def _write_sidecar(df: pd.DataFrame, sidecar: str, name: str, mode: str) -> None:
+    folder = os.path.dirname(sidecar)
+    try:
+        os.makedirs(folder, exist_ok=True)
+        tmp = sidecar + ".tmp"
+        df.to_parquet(tmp, index=False)
+        os.replace(tmp, sidecar)
+    except Exception:
+        # pyarrow не встановлено або немає прав на запис — працюємо без sidecar
+        logger.warning("Sidecar не записано: %s", sidecar, exc_info=True)
+        return
+    # прибираємо застарілі sidecar-и того ж файлу і того ж режиму (ім'я + відбиток, не префікс:
+    # "a.csv." — префікс і для sidecar-ів "a.csv.parquet")
+    stale = re.compile(re.escape(name) + r"\.[0-9a-f]+-" + re.escape(mode) + r"\.parquet")
+    for entry in os.listdir(folder):
+        if stale.fullmatch(entry) and os.path.join(folder, entry) != sidecar:
+            try:
+                os.remove(os.path.join(folder, entry))
+            except OSError:
+                pass
+
+
+def cached_frame(version: str):
+    """DataFrame з кешу пам'яті за версією (або None)."""
+    with _lock:
+        df = _frames.get(version)
+        if df is not None:
+            _frames.move_to_end(version)
+    return df
+
+
+def remember_frame(version: str, df: pd.DataFrame) -> pd.DataFrame:
+    """Кладе df у кеш пам'яті під version і реєструє його версію для dataset_version."""
+    key = id(df)
+    ref = weakref.ref(df, lambda _: _versions.pop(key, None))
+    with _lock:
+        _versions[key] = (ref, version)
+        _frames[version] = df
+        while len(_frames) > MEMORY_SLOTS:
+            _frames.popitem(last=False)
+    return df
+
+
+@timed("load_data_cached")
+def load_data_cached(path: str, typed: bool = False, keep: str = "cheapest") -> pd.DataFrame:
+    """Як load_data (або load_data_typed при typed=True), але з кешем у пам'яті та sidecar-файлом на диску.
+       path може бути текою/glob-ом — тоді див. src.sources.load_sources (keep — правило дедуплікації).
+       Повернений DataFrame спільний для всіх викликів — не змінюй його на місці.
+    """
+    if is_multi_source(path):
+        from src.sources import load_sources
+        return load_sources(path, typed=typed, keep=keep)
+    try:
+        fingerprint = file_fingerprint(path)
+    except OSError:
+        logger.exception("Error reading CSV")
+        return pd.DataFrame()
+
+    mode = "typed" if typed else "full"
+    version = f"{fingerprint}-{mode}"
+    df = cached_frame(version)
+    if df is not None:
+        return df
+
+    sidecar = _sidecar_path(path, version)
+    df = _read_sidecar(sidecar)
+    if df.empty:
+        df = load_data_typed(path) if typed else load_data(path)
+        if df.empty:
+            return df
+        _write_sidecar(df, sidecar, os.path.basename(path), mode)
+
+    return remember_frame(version, df)
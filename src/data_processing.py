@@ -1,8 +1,13 @@
 import pandas as pd
 import numpy as np
+import glob
 import logging
+import os
 import re
-from typing import List
+from typing import Iterator, List, Optional
+
+from src.profiling import timed
+from src.specs import add_spec_columns
 
 logger = logging.getLogger(__name__)
 
@@ -25,14 +30,48 @@ def _to_raw_github_url(url: str) -> str:
         return url
     return ""
 
+def is_multi_source(path: str) -> bool:
+    """True, якщо path — тека або glob-шаблон кількох файлів каталогу."""
+    return os.path.isdir(path) or glob.has_magic(path)
+
+def _is_parquet(path: str) -> bool:
+    return path.lower().endswith(('.parquet', '.pq'))
+
+def _read_raw(path: str) -> pd.DataFrame:
+    return pd.read_parquet(path) if _is_parquet(path) else pd.read_csv(path)
+
+def _iter_raw_chunks(path: str, chunksize: int) -> Iterator[pd.DataFrame]:
+    if _is_parquet(path):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunksize)
+
+@timed("load_data")
 def load_data(path: str) -> pd.DataFrame:
-    """Завантаження CSV; повертаємо порожній DataFrame при помилці."""
+    """Завантаження CSV/Parquet (або теки/glob — див. src.sources); порожній DataFrame при помилці."""
+    if is_multi_source(path):
+        from src.sources import load_sources
+        return load_sources(path)
     try:
-        df = pd.read_csv(path)
+        df = _read_raw(path)
     except Exception:
         logger.exception("Error reading CSV")
         return pd.DataFrame()
 
+    df = normalize_frame(df)
+    if df['price_usd'].isna().all():
+        return pd.DataFrame()
+    df['price_usd'] = df['price_usd'].fillna(df['price_usd'].median())
+    df['battery_wh'] = df['battery_wh'].fillna(df['battery_wh'].median())
+    return df
+
+def normalize_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Нормалізація сирого каталогу (на місці) без заповнення медіанами ціни/батареї —
+       медіани рахуються по всьому каталогу, тож їх заповнює викликач (load_data, src.sql_backend).
+    """
     # Нормалізація brand
     try:
         df['brand'] = df.get('brand', pd.Series(dtype='object')).astype(str).str.strip().str.title()
@@ -41,16 +80,13 @@ def load_data(path: str) -> pd.DataFrame:
 
     # price
     df['price_usd'] = pd.to_numeric(df.get('price_usd', pd.Series(np.nan)), errors='coerce')
-    if df['price_usd'].isna().all():
-        return pd.DataFrame()
-    df['price_usd'] = df['price_usd'].fillna(df['price_usd'].median())
 
     # screen size
     df['screen_size_in'] = pd.to_numeric(df.get('screen_size_in', pd.Series(np.nan)), errors='coerce').fillna(13.3)
 
     # battery
     if 'battery_wh' in df.columns:
-        df['battery_wh'] = pd.to_numeric(df['battery_wh'], errors='coerce').fillna(df['battery_wh'].median())
+        df['battery_wh'] = pd.to_numeric(df['battery_wh'], errors='coerce')
     else:
         df['battery_wh'] = 50.0
 
@@ -65,46 +101,200 @@ def load_data(path: str) -> pd.DataFrame:
     # flags
     df['cpu'] = df.get('cpu', pd.Series(dtype='object')).astype(str)
     df['display_type'] = df.get('display_type', pd.Series(dtype='object')).astype(str)
-    df['is_ai_cpu'] = df['cpu'].str.contains('Ultra|AI|Ryzen AI', case=False, na=False)
-    df['is_oled'] = df['display_type'].str.contains('OLED', case=False, na=False)
+    # is_ai_cpu / is_oled і фасети CPU/екрана — один розбір на унікальне значення
+    add_spec_columns(df)
+
+    return df
+
+# Явна схема для typed-режиму: категорії замість object, компактні числові типи, без list-колонок
+TYPED_CATEGORIES = ['brand', 'cpu', 'display_type']
+TYPED_NUMERIC = {
+    'price_usd': 'float32',
+    'screen_size_in': 'float32',
+    'battery_wh': 'float32',
+    'refresh_rate': 'Int16',
+    'ram_gb': 'Int16',
+    'storage_gb': 'Int16',
+    'release_year': 'int16',
+}
+CHUNK_ROWS = 100_000
+
+def range_bounds(dtype, lo, hi):
+    """Межі діапазону в точності колонки: float32(15.6) > 15.6, тож без приведення межі
+       до float32 рядки рівно на межі (15.6") випадали б із typed-каталогу."""
+    dtype = np.dtype(dtype)
+    if dtype.kind == 'f' and dtype.itemsize < 8:
+        return float(dtype.type(lo)), float(dtype.type(hi))
+    return lo, hi
+
+def _typed_chunk(chunk: pd.DataFrame) -> pd.DataFrame:
+    """Нормалізація одного шматка CSV у компактну схему (медіани заповнюються вже після склейки)."""
+    out = pd.DataFrame(index=chunk.index)
+    for col in chunk.columns:
+        if col not in TYPED_NUMERIC and col not in TYPED_CATEGORIES and col not in ('image_url', 'image_urls'):
+            out[col] = chunk[col]
+
+    out['brand'] = chunk.get('brand', pd.Series('', index=chunk.index)).astype(str).str.strip().str.title()
+    out['cpu'] = chunk.get('cpu', pd.Series('', index=chunk.index)).astype(str)
+    out['display_type'] = chunk.get('display_type', pd.Series('', index=chunk.index)).astype(str)
+
+    for col in ('price_usd', 'screen_size_in', 'battery_wh', 'refresh_rate', 'ram_gb', 'storage_gb', 'release_year'):
+        out[col] = pd.to_numeric(chunk.get(col, pd.Series(np.nan, index=chunk.index)), errors='coerce')
+    out['screen_size_in'] = out['screen_size_in'].fillna(13.3)
+    out['release_year'] = out['release_year'].fillna(2025)
+    for col in ('screen_size_in', 'refresh_rate', 'ram_gb', 'storage_gb', 'release_year'):
+        out[col] = out[col].astype(TYPED_NUMERIC[col])
+    if 'battery_wh' not in chunk.columns:
+        out['battery_wh'] = 50.0
 
+    # тільки перше зображення, без image_list/image_urls_raw
+    raw = chunk.get('image_url', chunk.get('image_urls', pd.Series('', index=chunk.index))).fillna('').astype(str)
+    out['thumbnail'] = raw.str.lstrip('; \t').str.split(';', n=1).str[0].str.strip().astype('string')
+
+    add_spec_columns(out)
+    for col in TYPED_CATEGORIES:
+        out[col] = out[col].astype('category')
+    return out
+
+def concat_frames(parts: List[pd.DataFrame]) -> pd.DataFrame:
+    """pd.concat зі спільними категоріями category-колонок (інакше concat повертає object).
+       Вхідні фрейми не змінюються.
+    """
+    if len(parts) == 1:
+        return parts[0].reset_index(drop=True)
+    aligned = [p.copy(deep=False) for p in parts]
+    for col in parts[0].columns:
+        if all(col in p.columns and isinstance(p[col].dtype, pd.CategoricalDtype) for p in parts):
+            # порожні категорії з parquet-sidecar читаються як object, а не str — union_categoricals
+            # їх не зливає; зводимо категорії всіх шардів до str
+            for p in aligned:
+                p[col] = p[col].cat.set_categories(p[col].cat.categories.astype(str))
+            categories = pd.api.types.union_categoricals([p[col] for p in aligned]).categories
+            for p in aligned:
+                p[col] = p[col].cat.set_categories(categories)
+    return pd.concat(aligned, ignore_index=True)
+
+@timed("load_data_typed")
+def load_data_typed(path: str, chunksize: int = CHUNK_ROWS) -> pd.DataFrame:
+    """Завантаження CSV/Parquet шматками у компактну схему (category/float32/int16, без list-колонок).
+       Пікова пам'ять обмежена одним сирим шматком; звіт по пам'яті — memory_report(df).
+    """
+    if is_multi_source(path):
+        from src.sources import load_sources
+        return load_sources(path, typed=True)
+    parts = []
+    before = pd.Series(dtype='int64')
+    try:
+        for chunk in _iter_raw_chunks(path, chunksize):
+            before = before.add(chunk.memory_usage(index=False, deep=True), fill_value=0)
+            parts.append(_typed_chunk(chunk))
+    except Exception:
+        logger.exception("Error reading CSV")
+        return pd.DataFrame()
+    if not parts:
+        return pd.DataFrame()
+
+    df = concat_frames(parts)
+    del parts
+
+    if df['price_usd'].isna().all():
+        return pd.DataFrame()
+    df['price_usd'] = df['price_usd'].fillna(df['price_usd'].median()).astype(TYPED_NUMERIC['price_usd'])
+    df['battery_wh'] = df['battery_wh'].fillna(df['battery_wh'].median()).astype(TYPED_NUMERIC['battery_wh'])
+
+    after = df.memory_usage(index=False, deep=True)
+    df.attrs['memory_report'] = {
+        col: (int(before.get(col, 0)), int(after.get(col, 0)))
+        for col in before.index.union(after.index)
+    }
+    logger.info("Typed load %s: %d rows, %.1f MB -> %.1f MB", path, len(df), before.sum() / 2**20, after.sum() / 2**20)
     return df
 
-def filter_data(df: pd.DataFrame, brands=None, price_range=None, screen_range=None, ai_cpu="Усі") -> pd.DataFrame:
+def memory_report(df: pd.DataFrame) -> pd.DataFrame:
+    """Пам'ять по колонках до (сирий read_csv) і після typed-нормалізації, у байтах."""
+    stats = df.attrs.get('memory_report', {})
+    report = pd.DataFrame(
+        [(col, before, after) for col, (before, after) in stats.items()],
+        columns=['column', 'before_bytes', 'after_bytes'],
+    )
+    if not report.empty:
+        report['saved_pct'] = (100 * (1 - report['after_bytes'] / report['before_bytes'].where(report['before_bytes'] > 0))).round(1)
+    return report
+
+@timed("filter_data")
+def filter_data(df: pd.DataFrame, brands=None, price_range=None, screen_range=None, ai_cpu="Усі",
+                facets=None, query=None) -> pd.DataFrame:
+    from src.search import query_terms, search_positions
+
     q = df.copy()
+    # текстовий пошук — через n-грамний індекс (src.search), а не str.contains по рядках;
+    # запит без слів (напр. "-") не фільтрує — так само, як у catalog_index.filter_positions
+    if query_terms(query):
+        q = q.take(search_positions(df, query)[0])
     if brands:
         q = q[q['brand'].isin(brands)]
-    if price_range:
-        q = q[(q['price_usd'] >= price_range[0]) & (q['price_usd'] <= price_range[1])]
-    if screen_range:
-        q = q[(q['screen_size_in'] >= screen_range[0]) & (q['screen_size_in'] <= screen_range[1])]
+    for col, bounds in (('price_usd', price_range), ('screen_size_in', screen_range)):
+        if bounds:
+            lo, hi = range_bounds(q[col].to_numpy().dtype, *bounds)
+            q = q[(q[col] >= lo) & (q[col] <= hi)]
     if ai_cpu == "Із AI":
         q = q[q['is_ai_cpu']]
     elif ai_cpu == "Без AI":
         q = q[~q['is_ai_cpu']]
+    # facets: {'cpu_tier': [...], 'panel_type': [...]} — порожній список означає "усі"
+    for col, values in (facets or {}).items():
+        if values and col in q.columns:
+            q = q[q[col].astype(str).isin([str(v) for v in values])]
     return q
 
+@timed("compute_brand_share")
 def compute_brand_share(df: pd.DataFrame) -> pd.DataFrame:
     if df.empty:
         return pd.DataFrame(columns=['brand','count'])
     s = df['brand'].value_counts().reset_index()
     s.columns = ['brand', 'count']
-    return s
+    # для category-колонки value_counts повертає і бренди з нульовою кількістю
+    return s[s['count'] > 0]
 
-def compute_trends(df: pd.DataFrame) -> pd.DataFrame:
-    if df.empty:
-        return pd.DataFrame(columns=['year','metric','value'])
-    price_trend = df.groupby('release_year')['price_usd'].mean().reset_index()
-    price_trend['metric'] = 'Середня ціна'
-    price_trend.rename(columns={'release_year': 'year', 'price_usd': 'value'}, inplace=True)
+# Реєстр метрик трендів: name -> (підпис, колонка, агрегація)
+# агрегація: 'mean' | 'median' | 'share' (частка True) | 'count' | float 0..1 (перцентиль)
+TREND_METRICS = {
+    'price_mean': ('Середня ціна', 'price_usd', 'mean'),
+    'battery_mean': ('Середня автономність', 'battery_wh', 'mean'),
+    'oled_share': ('Частка OLED', 'is_oled', 'share'),
+    'price_median': ('Медіанна ціна', 'price_usd', 'median'),
+    'price_p90': ('Ціна, 90-й перцентиль', 'price_usd', 0.9),
+    'ram_mean': ('Середня RAM', 'ram_gb', 'mean'),
+    'ai_share': ('Частка AI CPU', 'is_ai_cpu', 'share'),
+    'count': ('Кількість моделей', 'price_usd', 'count'),
+}
+DEFAULT_TRENDS = ['price_mean', 'battery_mean', 'oled_share']
+
+def register_trend_metric(name: str, label: str, column: str, agg) -> None:
+    """Додає метрику в реєстр; вона рахується в тому ж groupby-проході, що й решта."""
+    TREND_METRICS[name] = (label, column, agg)
 
-    battery_trend = df.groupby('release_year')['battery_wh'].mean().reset_index()
-    battery_trend['metric'] = 'Середня автономність'
-    battery_trend.rename(columns={'release_year': 'year', 'battery_wh': 'value'}, inplace=True)
+def _trend_agg(column: str, agg):
+    if agg == 'share':
+        return (column, 'mean')
+    if agg == 'count':
+        return (column, 'size')
+    if isinstance(agg, float):
+        return (column, lambda s, q=agg: s.quantile(q))
+    return (column, agg)
 
-    oled_trend = df.groupby('release_year')['is_oled'].mean().reset_index()
-    oled_trend['metric'] = 'Частка OLED'
-    oled_trend.rename(columns={'release_year': 'year', 'is_oled': 'value'}, inplace=True)
+@timed("compute_trends")
+def compute_trends(df: pd.DataFrame, metrics: Optional[List[str]] = None) -> pd.DataFrame:
+    """Тренди по release_year: усі метрики за один groupby-прохід, довгий формат year/value/metric."""
+    if df.empty:
+        return pd.DataFrame(columns=['year','metric','value'])
+    names = [m for m in (metrics or DEFAULT_TRENDS) if TREND_METRICS[m][1] in df.columns]
+    if not names:
+        return pd.DataFrame(columns=['year','metric','value'])
+    aggs = {name: _trend_agg(TREND_METRICS[name][1], TREND_METRICS[name][2]) for name in names}
+    wide = df.groupby('release_year').agg(**aggs).astype('float64')
 
-    long = pd.concat([price_trend, battery_trend, oled_trend], ignore_index=True)
-    return long
+    long = wide.reset_index().melt(id_vars='release_year', var_name='metric', value_name='value')
+    long['metric'] = long['metric'].map({name: TREND_METRICS[name][0] for name in names})
+    long.rename(columns={'release_year': 'year'}, inplace=True)
+    return long[['year', 'value', 'metric']]
@@ -0,0 +1,62 @@
+"""
+Розподіл двох числових колонок каталогу для вкладки аналітики.
+До SCATTER_MAX_POINTS рядків — самі точки (WebGL scattergl), більше — 2D-гістограма,
+порахована на сервері (np.histogram2d / GROUP BY у SQLite): у браузер іде сітка bins x bins
+лічильників, розмір якої не залежить від кількості рядків.
+Результат — dict-пейлоад: {'mode': 'points', 'n', 'x', 'y', 'text'} або
+{'mode': 'bins', 'n', 'x_edges', 'y_edges', 'counts'}; фігуру з нього будує src.ui.charts.
+Виклик: payload = distribution_payload(x_values, y_values, labels, bins=60)
+"""
+from typing import Optional
+
+import numpy as np
+
+# колонка -> підпис осі
+DISTRIBUTION_AXES = {
+    'price_usd': 'Ціна (USD)',
+    'battery_wh': 'Батарея (Wh)',
+    'screen_size_in': 'Діагональ (in)',
+    'ram_gb': 'RAM (GB)',
+    'storage_gb': 'SSD (GB)',
+    'refresh_rate': 'Частота (Hz)',
+    'release_year': 'Рік',
+}
+SCATTER_MAX_POINTS = 5000
+DEFAULT_BINS = 60
+
+
+def bin_edges(lo: float, hi: float, bins: int) -> np.ndarray:
+    """bins + 1 рівних меж від lo до hi (вироджений діапазон розширюється на ±0.5)."""
+    if not hi > lo:
+        lo, hi = lo - 0.5, hi + 0.5
+    return np.linspace(lo, hi, int(bins) + 1)
+
+
+def points_payload(x: np.ndarray, y: np.ndarray, labels: Optional[np.ndarray] = None) -> dict:
+    return {
+        'mode': 'points', 'n': len(x),
+        'x': np.asarray(x, dtype='float64'), 'y': np.asarray(y, dtype='float64'),
+        'text': np.asarray(labels, dtype=object) if labels is not None else None,
+    }
+
+
+def bins_payload(n: int, x_edges: np.ndarray, y_edges: np.ndarray, counts: np.ndarray) -> dict:
+    """counts[i, j] — рядки в i-му бін по x і j-му по y."""
+    return {'mode': 'bins', 'n': int(n), 'x_edges': x_edges, 'y_edges': y_edges, 'counts': counts}
+
+
+def distribution_payload(x, y, labels=None, bins: int = DEFAULT_BINS,
+                         max_points: int = SCATTER_MAX_POINTS) -> dict:
+    """Пейлоад для значень x/y (рядки з пропуском у будь-якій осі відкидаються)."""
+    x = np.asarray(x, dtype='float64')
+    y = np.asarray(y, dtype='float64')
+    valid = ~(np.isnan(x) | np.isnan(y))
+    if not valid.all():
+        x, y = x[valid], y[valid]
+        labels = np.asarray(labels, dtype=object)[valid] if labels is not None else None
+    if len(x) <= max_points:
+        return points_payload(x, y, labels)
+    x_edges = bin_edges(x.min(), x.max(), bins)
+    y_edges = bin_edges(y.min(), y.max(), bins)
+    counts, _, _ = np.histogram2d(x, y, bins=(x_edges, y_edges))
+    return bins_payload(len(x), x_edges, y_edges, counts.astype(np.int64))
@@ -0,0 +1,147 @@
+"""
+Експорт відфільтрованих рядків на вимогу.
+Серіалізація йде шматками (CSV / Parquet / JSON Lines, опційно gzip) одразу у файл
+в static/exports, тож пікова пам'ять обмежена одним шматком.
+Готовий файл кешується по (версія датасету, ключ фільтрів, формат, gzip) і віддається
+Streamlit static serving (app/static/exports/<файл>) потоком з диска, без читання в пам'ять процесу.
+Виклик: url = export_url(export_file(df, positions, key, 'csv'))
+"""
+import gzip
+import hashlib
+import logging
+import os
+import tempfile
+from typing import BinaryIO, Callable, Iterable, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.data_cache import dataset_version
+from src.profiling import timed
+
+logger = logging.getLogger(__name__)
+
+# формат -> (mime, розширення)
+EXPORT_FORMATS = {
+    'csv': ('text/csv', '.csv'),
+    'parquet': ('application/vnd.apache.parquet', '.parquet'),
+    'jsonl': ('application/x-ndjson', '.jsonl'),
+}
+CHUNK_ROWS = 50_000
+EXPORT_DIR = os.path.join("static", "exports")
+EXPORT_URL = "app/static/exports"
+MAX_EXPORTS = 32
+# static serving Streamlit не віддає файли, більші за 200 МБ (MAX_APP_STATIC_FILE_SIZE)
+MAX_EXPORT_BYTES = 200 * 1024 * 1024
+
+
+def export_filename(fmt: str, compress: bool = False, stem: str = "filtered_laptops") -> str:
+    ext = EXPORT_FORMATS[fmt][1]
+    return stem + ext + (".gz" if compress and fmt != 'parquet' else "")
+
+
+def iter_chunks(df: pd.DataFrame, positions: np.ndarray, chunk_rows: int = CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    for start in range(0, len(positions), chunk_rows):
+        yield df.take(positions[start:start + chunk_rows])
+
+
+def write_export(df: pd.DataFrame, positions: np.ndarray, fmt: str, out: BinaryIO,
+                 compress: bool = False, chunk_rows: int = CHUNK_ROWS) -> None:
+    """Пише рядки df[positions] у out шматками по chunk_rows."""
+    write_chunks(iter_chunks(df, positions, chunk_rows), df.iloc[:0], fmt, out, compress)
+
+
+def write_chunks(chunks: Iterable[pd.DataFrame], empty: pd.DataFrame, fmt: str, out: BinaryIO,
+                 compress: bool = False) -> None:
+    """Пише послідовність шматків у out; empty — порожній фрейм зі схемою (якщо шматків немає)."""
+    if fmt == 'parquet':
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        writer = None
+        schema = None
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+            if writer is None:
+                schema = table.schema
+                writer = pq.ParquetWriter(out, schema, compression='gzip' if compress else 'snappy')
+            writer.write_table(table)
+        if writer is None:
+            pq.write_table(pa.Table.from_pandas(empty, preserve_index=False), out)
+        else:
+            writer.close()
+        return
+
+    stream = gzip.GzipFile(fileobj=out, mode='wb') if compress else out
+    try:
+        if fmt == 'csv':
+            header = True
+            for chunk in chunks:
+                stream.write(chunk.to_csv(index=False, header=header).encode('utf-8'))
+                header = False
+            if header:
+                stream.write(empty.to_csv(index=False).encode('utf-8'))
+        elif fmt == 'jsonl':
+            for chunk in chunks:
+                text = chunk.to_json(orient='records', lines=True, force_ascii=False, date_format='iso')
+                stream.write((text if text.endswith('\n') else text + '\n').encode('utf-8'))
+        else:
+            raise ValueError(f"Unknown export format: {fmt}")
+    finally:
+        if compress:
+            stream.close()
+
+
+def _prune_exports(folder: str) -> None:
+    files = sorted(
+        (os.path.join(folder, name) for name in os.listdir(folder) if not name.endswith('.tmp')),
+        key=os.path.getmtime,
+    )
+    for path in files[:-MAX_EXPORTS]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def cached_export(version: str, key, fmt: str, compress: bool, write: Callable[[BinaryIO], None]) -> str:
+    """Шлях до артефакту (version, key, fmt, compress); write(f) викликається, лише якщо його ще немає.
+       Спільне для pandas- і SQL-бекенду (src.sql_backend).
+    """
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    if version:
+        digest = hashlib.sha1(repr((version, key, fmt, compress)).encode('utf-8')).hexdigest()[:20]
+        path = os.path.join(EXPORT_DIR, digest + export_filename(fmt, compress, stem=""))
+        if os.path.exists(path):
+            os.utime(path)
+            return path
+    else:
+        fd, path = tempfile.mkstemp(dir=EXPORT_DIR, suffix=export_filename(fmt, compress, stem=""))
+        os.close(fd)
+
+    tmp = path + ".tmp"
+    try:
+        with open(tmp, 'wb') as f:
+            write(f)
+        os.replace(tmp, path)
+    except Exception:
+        logger.exception("Error exporting %s", fmt)
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    _prune_exports(EXPORT_DIR)
+    return path
+
+
+@timed("export_file")
+def export_file(df: pd.DataFrame, positions: np.ndarray, key, fmt: str = 'csv', compress: bool = False) -> str:
+    """Шлях до файлу експорту; серіалізує лише якщо такого артефакту ще немає."""
+    return cached_export(dataset_version(df), key, fmt, compress,
+                         lambda f: write_export(df, positions, fmt, f, compress))
+
+
+def export_url(path: str) -> Optional[str]:
+    """URL файлу експорту для посилання з download; None, якщо файл завеликий для static serving."""
+    if os.path.getsize(path) > MAX_EXPORT_BYTES:
+        return None
+    return f"{EXPORT_URL}/{os.path.basename(path)}"
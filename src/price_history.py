@@ -0,0 +1,306 @@
+"""
+Історія цін: append-only сховище датованих знімків каталогу + інкрементальні зведення.
+Кожен прогін інжесту дописує знімок у snapshots/date=YYYY-MM-DD/part-0.parquet (parquet,
+партиціювання за датою); наявні знімки не переписуються. Разом зі знімком оновлюються
+зведення rollups/<brand|model>-<daily|weekly>/period=YYYY-MM-DD.parquet — адитивні суми (рядки,
+сума/кількість цін, min/max, OLED, AI CPU) по періоду: денне — новий файл, тижневе — злиття
+лише з файлом свого тижня, тож вартість append не росте з історією.
+Графіки читають лише зведення (кеш до наступного append) — їхній розмір залежить від кількості
+періодів і брендів/моделей, а не від рядків у знімках. manifest.json — знімки і ревізія.
+Виклик: PriceHistory("data/history").append(load_data_cached("data/sample_laptops.csv"), "2025-06-01")
+        series = PriceHistory("data/history").series('brand', 'weekly', 'price_mean', keys=['Dell'])
+Запуск: python -m src.price_history data/scraped_laptops.csv --date 2025-06-01
+"""
+import argparse
+import datetime as dt
+import hashlib
+import json
+import logging
+import os
+import shutil
+import sys
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.profiling import timed
+
+logger = logging.getLogger(__name__)
+
+HISTORY_DIR = os.environ.get("LAPTOP_HISTORY_DIR", os.path.join("data", "history"))
+# рівень зведення -> ключові колонки
+LEVELS = {'brand': ['brand'], 'model': ['brand', 'model']}
+FREQS = ('daily', 'weekly')
+SNAPSHOT_COLUMNS = [
+    'brand', 'model', 'cpu', 'display_type', 'price_usd', 'screen_size_in', 'ram_gb', 'storage_gb',
+    'battery_wh', 'release_year', 'is_oled', 'is_ai_cpu', 'url',
+]
+# метрика -> підпис; рахуються зі збережених сум у _finalize
+HISTORY_METRICS = {
+    'price_mean': 'Середня ціна',
+    'price_min': 'Мінімальна ціна',
+    'price_max': 'Максимальна ціна',
+    'models': 'Моделей',
+    'oled_share': 'Частка OLED',
+    'ai_share': 'Частка AI CPU',
+}
+_SUMS = ['snapshots', 'n', 'price_n', 'price_sum', 'oled_sum', 'ai_sum']
+MAX_CACHED = 16
+
+# (корінь, ім'я зведення, ревізія) -> DataFrame
+_rollups: "OrderedDict[Tuple[str, str, int], pd.DataFrame]" = OrderedDict()
+
+
+def _as_date(value) -> dt.date:
+    if value is None:
+        return dt.date.today()
+    if isinstance(value, dt.datetime):
+        return value.date()
+    if isinstance(value, dt.date):
+        return value
+    return dt.date.fromisoformat(str(value))
+
+
+def period_start(day: dt.date, freq: str) -> dt.date:
+    """Початок періоду: сам день або понеділок тижня."""
+    return day - dt.timedelta(days=day.weekday()) if freq == 'weekly' else day
+
+
+def _snapshot_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Колонки знімка (відсутні прапорці — False, решта відсутніх пропускається)."""
+    out = df[[c for c in SNAPSHOT_COLUMNS if c in df.columns]].reset_index(drop=True).copy()
+    out['price_usd'] = pd.to_numeric(out.get('price_usd'), errors='coerce') if 'price_usd' in out else np.nan
+    for col in ('is_oled', 'is_ai_cpu'):
+        out[col] = out[col].fillna(False).astype(bool) if col in out else False
+    for col in ('brand', 'model'):
+        out[col] = out[col].astype(str) if col in out else ''
+    return out
+
+
+def partial_rollup(snapshot: pd.DataFrame, keys: List[str], period: dt.date) -> pd.DataFrame:
+    """Адитивне зведення одного знімка по keys для періоду period."""
+    frame = pd.DataFrame({
+        **{k: snapshot[k] for k in keys},
+        'price': snapshot['price_usd'].astype('float64'),
+        'oled': snapshot['is_oled'].astype('int64'),
+        'ai': snapshot['is_ai_cpu'].astype('int64'),
+    })
+    out = frame.groupby(keys, sort=False).agg(
+        n=('price', 'size'), price_n=('price', 'count'), price_sum=('price', 'sum'),
+        price_min=('price', 'min'), price_max=('price', 'max'), oled_sum=('oled', 'sum'), ai_sum=('ai', 'sum'),
+    ).reset_index()
+    out.insert(0, 'period', pd.Timestamp(period))
+    out['snapshots'] = 1
+    return out
+
+
+def merge_rollup(existing: pd.DataFrame, partial: pd.DataFrame, keys: List[str]) -> pd.DataFrame:
+    """Зливає partial у existing; перераховуються лише періоди з partial."""
+    if existing.empty:
+        return partial.sort_values(['period'] + keys, ignore_index=True)
+    touched = existing['period'].isin(partial['period'].unique())
+    both = pd.concat([existing[touched], partial], ignore_index=True)
+    merged = both.groupby(['period'] + keys, sort=False).agg(
+        **{c: (c, 'sum') for c in _SUMS}, price_min=('price_min', 'min'), price_max=('price_max', 'max'),
+    ).reset_index()
+    out = pd.concat([existing[~touched], merged[existing.columns]], ignore_index=True)
+    return out.sort_values(['period'] + keys, ignore_index=True)
+
+
+def _finalize(rollup: pd.DataFrame) -> pd.DataFrame:
+    """Метрики HISTORY_METRICS з сум зведення; models — середня кількість рядків на знімок періоду."""
+    out = rollup.drop(columns=_SUMS)
+    out['price_mean'] = rollup['price_sum'] / rollup['price_n'].where(rollup['price_n'] > 0)
+    out['models'] = rollup['n'] / rollup['snapshots']
+    out['oled_share'] = rollup['oled_sum'] / rollup['n']
+    out['ai_share'] = rollup['ai_sum'] / rollup['n']
+    return out
+
+
+def _write_parquet(df: pd.DataFrame, path: str) -> None:
+    folder = os.path.dirname(path)
+    os.makedirs(folder, exist_ok=True)
+    # файли з крапкою на початку pyarrow пропускає при читанні теки
+    tmp = os.path.join(folder, "." + os.path.basename(path) + ".tmp")
+    df.to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+
+
+class PriceHistory:
+    """Сховище історії цін у теці root (див. докстрінг модуля)."""
+
+    def __init__(self, root: str = HISTORY_DIR):
+        self.root = os.path.abspath(root)
+
+    @property
+    def _manifest_path(self) -> str:
+        return os.path.join(self.root, "manifest.json")
+
+    def _partition(self, day: dt.date) -> str:
+        return os.path.join(self.root, "snapshots", f"date={day.isoformat()}")
+
+    def _rollup_dir(self, level: str, freq: str) -> str:
+        return os.path.join(self.root, "rollups", f"{level}-{freq}")
+
+    def _rollup_path(self, level: str, freq: str, period: dt.date) -> str:
+        return os.path.join(self._rollup_dir(level, freq), f"period={period.isoformat()}.parquet")
+
+    def manifest(self) -> dict:
+        try:
+            with open(self._manifest_path, encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {'revision': 0, 'snapshots': {}}
+
+    def _write_manifest(self, manifest: dict) -> None:
+        os.makedirs(self.root, exist_ok=True)
+        tmp = self._manifest_path + ".tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp, self._manifest_path)
+
+    def dates(self) -> List[str]:
+        return sorted(self.manifest()['snapshots'])
+
+    def snapshot(self, date) -> pd.DataFrame:
+        """Знімок за дату (порожній DataFrame, якщо його немає)."""
+        path = os.path.join(self._partition(_as_date(date)), "part-0.parquet")
+        return pd.read_parquet(path) if os.path.exists(path) else pd.DataFrame(columns=SNAPSHOT_COLUMNS)
+
+    def snapshots(self) -> Iterable[Tuple[dt.date, pd.DataFrame]]:
+        """Знімки по одному (за датою) — без читання всієї історії в пам'ять."""
+        for day in self.dates():
+            yield _as_date(day), self.snapshot(day)
+
+    def _read_rollup(self, level: str, freq: str, period: Optional[dt.date] = None) -> pd.DataFrame:
+        """Сирі суми одного періоду або (period=None) усіх."""
+        path = self._rollup_dir(level, freq) if period is None else self._rollup_path(level, freq, period)
+        if not os.path.exists(path) or (period is None and not os.listdir(path)):
+            return pd.DataFrame()
+        return pd.read_parquet(path)
+
+    def _update_rollups(self, snapshot: pd.DataFrame, day: dt.date) -> None:
+        for level, keys in LEVELS.items():
+            for freq in FREQS:
+                period = period_start(day, freq)
+                partial = partial_rollup(snapshot, keys, period)
+                _write_parquet(merge_rollup(self._read_rollup(level, freq, period), partial, keys),
+                               self._rollup_path(level, freq, period))
+
+    @timed("history_append")
+    def append(self, df: pd.DataFrame, date=None) -> bool:
+        """Дописує знімок df (нормалізований каталог) за дату date (за замовчуванням сьогодні).
+           Знімок за цю дату вже є — нічого не змінює і повертає False.
+        """
+        day = _as_date(date)
+        manifest = self.manifest()
+        if day.isoformat() in manifest['snapshots']:
+            logger.info("Знімок за %s уже є — пропускаю", day)
+            return False
+        snapshot = _snapshot_frame(df)
+        # будь-яка тека без запису в manifest (не лише за цю дату) — обірваний append;
+        # її дані могли потрапити в зведення, тож тека видаляється, а зведення перебудовуються
+        interrupted = self._drop_orphans(manifest)
+        _write_parquet(snapshot, os.path.join(self._partition(day), "part-0.parquet"))
+
+        manifest['snapshots'][day.isoformat()] = {
+            'rows': len(snapshot),
+            'sha1': hashlib.sha1(pd.util.hash_pandas_object(snapshot, index=False).values.tobytes()).hexdigest(),
+        }
+        if interrupted:
+            logger.warning("Незавершені знімки за %s — перебудовую зведення", ", ".join(interrupted))
+            self._rebuild(sorted(manifest['snapshots']))
+        else:
+            self._update_rollups(snapshot, day)
+        manifest['revision'] = manifest.get('revision', 0) + 1
+        self._write_manifest(manifest)
+        return True
+
+    def _drop_orphans(self, manifest: dict) -> List[str]:
+        """Видаляє теки знімків, яких немає в manifest; повертає їхні дати."""
+        folder = os.path.join(self.root, "snapshots")
+        names = os.listdir(folder) if os.path.isdir(folder) else []
+        orphans = sorted(n.split('=', 1)[1] for n in names
+                         if n.startswith('date=') and n.split('=', 1)[1] not in manifest['snapshots'])
+        for day in orphans:
+            shutil.rmtree(os.path.join(folder, f"date={day}"))
+        return orphans
+
+    def _rebuild(self, days: List[str]) -> None:
+        shutil.rmtree(os.path.join(self.root, "rollups"), ignore_errors=True)
+        for day in days:
+            self._update_rollups(self.snapshot(day), _as_date(day))
+
+    def rebuild_rollups(self) -> None:
+        """Перераховує зведення з усіх знімків (відновлення / зміна формату зведень)."""
+        manifest = self.manifest()
+        self._drop_orphans(manifest)
+        self._rebuild(sorted(manifest['snapshots']))
+        manifest['revision'] = manifest.get('revision', 0) + 1
+        self._write_manifest(manifest)
+
+    def rollup(self, level: str = 'brand', freq: str = 'weekly') -> pd.DataFrame:
+        """Зведення з метриками HISTORY_METRICS (кешується до наступного append)."""
+        if level not in LEVELS or freq not in FREQS:
+            raise ValueError(f"unknown rollup: {level}/{freq}")
+        cache_key = (self.root, f"{level}-{freq}", self.manifest().get('revision', 0))
+        result = _rollups.get(cache_key)
+        if result is None:
+            raw = self._read_rollup(level, freq)
+            keys = LEVELS[level]
+            if raw.empty:
+                result = pd.DataFrame(columns=['period'] + keys + list(HISTORY_METRICS))
+            else:
+                result = _finalize(raw.sort_values(['period'] + keys, ignore_index=True))
+            _rollups[cache_key] = result
+            while len(_rollups) > MAX_CACHED:
+                _rollups.popitem(last=False)
+        else:
+            _rollups.move_to_end(cache_key)
+        return result
+
+    @timed("history_series")
+    def series(self, level: str = 'brand', freq: str = 'weekly', metric: str = 'price_mean',
+               keys: Optional[List[str]] = None) -> pd.DataFrame:
+        """Довгий формат period/series/value для графіка; keys — бренди (або "brand model" для моделей),
+           None — усі, [] — жодного.
+        """
+        if metric not in HISTORY_METRICS:
+            raise ValueError(f"unknown metric: {metric}")
+        rollup = self.rollup(level, freq)
+        label = rollup['brand'] if level == 'brand' else rollup['brand'] + " " + rollup['model']
+        mask = label.isin(keys) if keys is not None else np.ones(len(rollup), dtype=bool)
+        return pd.DataFrame({
+            'period': rollup['period'][mask], 'series': label[mask], 'value': rollup[metric][mask].astype('float64'),
+        }).reset_index(drop=True)
+
+
+def main(argv=None) -> int:
+    from src.data_cache import load_data_cached
+
+    parser = argparse.ArgumentParser(description="Дописати знімок каталогу в історію цін")
+    parser.add_argument('catalog', nargs='?', help="CSV/parquet каталогу (або тека/glob джерел)")
+    parser.add_argument('--date', help="дата знімка YYYY-MM-DD (за замовчуванням сьогодні)")
+    parser.add_argument('--root', default=HISTORY_DIR, help="тека історії")
+    parser.add_argument('--rebuild', action='store_true', help="перерахувати зведення з усіх знімків")
+    args = parser.parse_args(argv)
+
+    history = PriceHistory(args.root)
+    if args.rebuild:
+        history.rebuild_rollups()
+    if not args.catalog:
+        return 0 if args.rebuild else parser.error("потрібен catalog або --rebuild")
+    df = load_data_cached(args.catalog)
+    if df.empty:
+        print(f"порожній каталог: {args.catalog}")
+        return 1
+    added = history.append(df, args.date)
+    print(f"{_as_date(args.date)}: {'додано' if added else 'вже є'} ({len(df)} рядків, знімків {len(history.dates())})")
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
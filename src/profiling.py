@@ -0,0 +1,185 @@
+"""
+Легкі таймери стадій одного rerun-у.
+begin_trace() на початку скрипта, span("назва") навколо стадій, finish_trace() у finally тіла скрипта
+(st.stop() і перерваний rerun теж мають закрити трасу — інакше tracemalloc лишиться ввімкненим).
+tracemalloc один на процес: траси з track_memory рахуються, його вмикає перша і вимикає остання,
+а байти span-у пишуться лише коли за весь span пам'ять міряла одна траса (інакше bytes=None).
+@timed("load_data") — те саме для функцій data_processing. Поза трасою span нічого не робить.
+Кожна стадія пишеться JSON-рядком у логер 'laptop_trends.timing' — для p50/p95 по сесіях.
+"""
+import contextvars
+import functools
+import json
+import logging
+import threading
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+from typing import List, Optional
+
+timing_logger = logging.getLogger("laptop_trends.timing")
+
+_current: "contextvars.ContextVar[Optional[Trace]]" = contextvars.ContextVar("laptop_trends_trace", default=None)
+
+# лічильник трас із track_memory; epoch росте з кожною новою — span бачить, що хтось приєднався
+_memory_lock = threading.Lock()
+_memory_traces = 0
+_memory_epoch = 0
+_memory_started = False  # tracemalloc увімкнули ми, а не застосунок — тоді й вимикаємо
+
+
+def _acquire_memory() -> None:
+    global _memory_traces, _memory_epoch, _memory_started
+    with _memory_lock:
+        if _memory_traces == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _memory_started = True
+        _memory_traces += 1
+        _memory_epoch += 1
+
+
+def _release_memory() -> None:
+    global _memory_traces, _memory_started
+    with _memory_lock:
+        _memory_traces -= 1
+        if _memory_traces == 0 and _memory_started:
+            tracemalloc.stop()
+            _memory_started = False
+
+
+def _exclusive_memory() -> Optional[int]:
+    """epoch, якщо зараз пам'ять міряє лише одна траса; інакше None."""
+    with _memory_lock:
+        return _memory_epoch if _memory_traces == 1 and tracemalloc.is_tracing() else None
+
+
+class Trace:
+    """Спани одного rerun-у: name, start_ms, ms, rows, bytes, depth."""
+
+    def __init__(self, session_id: str = "", track_memory: bool = False):
+        self.session_id = session_id
+        self.run_id = uuid.uuid4().hex[:12]
+        self.track_memory = track_memory
+        self.started = time.perf_counter()
+        self.spans: List[dict] = []
+        self.depth = 0
+        self.holds_memory = False
+
+
+def configure_timing_log(level: int = logging.INFO) -> None:
+    """Рівень для JSON-рядків таймінгів; записи йдуть до handler-ів, налаштованих застосунком.
+       Якщо кореневий логер ще без handler-ів — logging.basicConfig, щоб рядки не губились.
+    """
+    timing_logger.setLevel(level)
+    if not logging.getLogger().handlers:
+        logging.basicConfig(format="%(asctime)s %(name)s %(message)s")
+
+
+def begin_trace(session_id: str = "", track_memory: bool = False) -> Trace:
+    trace = Trace(session_id, track_memory)
+    if track_memory:
+        _acquire_memory()
+        trace.holds_memory = True
+    _current.set(trace)
+    return trace
+
+
+def finish_trace() -> Optional[Trace]:
+    trace = _current.get()
+    if trace is None:
+        return None
+    _current.set(None)
+    if trace.holds_memory:
+        trace.holds_memory = False
+        _release_memory()
+    total_ms = (time.perf_counter() - trace.started) * 1000
+    timing_logger.info(json.dumps({
+        'event': 'rerun', 'session': trace.session_id, 'run': trace.run_id,
+        'ms': round(total_ms, 3), 'stages': len(trace.spans),
+    }))
+    return trace
+
+
+def current_trace() -> Optional[Trace]:
+    return _current.get()
+
+
+@contextmanager
+def span(name: str, rows: Optional[int] = None):
+    """Заміряє блок; у yield-нутий dict можна дописати rows після обчислення."""
+    trace = _current.get()
+    info = {'name': name, 'rows': rows}
+    if trace is None:
+        yield info
+        return
+    epoch = _exclusive_memory() if trace.holds_memory else None
+    mem_before = tracemalloc.get_traced_memory()[0] if epoch is not None else 0
+    depth = trace.depth
+    trace.depth += 1
+    t0 = time.perf_counter()
+    try:
+        yield info
+    finally:
+        t1 = time.perf_counter()
+        trace.depth = depth
+        record = {
+            'name': name,
+            'start_ms': round((t0 - trace.started) * 1000, 3),
+            'ms': round((t1 - t0) * 1000, 3),
+            'rows': info['rows'],
+            'bytes': _memory_delta(epoch, mem_before),
+            'depth': depth,
+        }
+        trace.spans.append(record)
+        timing_logger.info(json.dumps({'event': 'span', 'session': trace.session_id, 'run': trace.run_id, **record}))
+
+
+def _memory_delta(epoch: Optional[int], mem_before: int) -> Optional[int]:
+    # за час span-у інша траса могла приєднатись (і навіть піти) — тоді різниця вже не наша
+    if epoch is None:
+        return None
+    with _memory_lock:
+        if _memory_epoch != epoch or _memory_traces != 1:
+            return None
+        return tracemalloc.get_traced_memory()[0] - mem_before
+
+
+def timed(name: str):
+    """Декоратор: span навколо функції; rows = кількість рядків результату (DataFrame/масив)."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _current.get() is None:
+                return fn(*args, **kwargs)
+            with span(name) as info:
+                result = fn(*args, **kwargs)
+                shape = getattr(result, 'shape', None)
+                if shape:
+                    info['rows'] = shape[0]
+                return result
+        return wrapper
+    return decorator
+
+
+def waterfall_html(trace: Trace) -> str:
+    """HTML-водоспад спанів rerun-у (без зовнішніх бібліотек)."""
+    if not trace.spans:
+        return '<div class="empty-state">Немає замірів</div>'
+    total = max(s['start_ms'] + s['ms'] for s in trace.spans) or 1.0
+    rows = []
+    for s in sorted(trace.spans, key=lambda s: s['start_ms']):
+        left = 100 * s['start_ms'] / total
+        width = max(0.5, 100 * s['ms'] / total)
+        extra = []
+        if s['rows'] is not None:
+            extra.append(f"{s['rows']} рядк.")
+        if s['bytes'] is not None:
+            extra.append(f"{s['bytes'] / 2**20:+.1f} MB")
+        label = f"{'&nbsp;' * 3 * s['depth']}{s['name']}"
+        rows.append(
+            f'<div class="wf-row"><div class="wf-label">{label}</div>'
+            f'<div class="wf-track"><div class="wf-bar" style="margin-left:{left:.2f}%;width:{width:.2f}%"></div></div>'
+            f'<div class="wf-ms">{s["ms"]:.1f} ms {" · ".join(extra)}</div></div>'
+        )
+    return '<div class="waterfall">' + ''.join(rows) + '</div>'
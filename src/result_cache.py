@@ -0,0 +1,97 @@
+"""
+Спільний для всіх сесій LRU-кеш результатів (позиції фільтра, порядок сторінки, частки брендів).
+Ключ — (версія датасету, вид результату, канонічний ключ фільтрів); бюджет — у байтах.
+Кілька версій (різні датасети/бекенди в різних сесіях) живуть поруч; записи старої версії
+(CSV змінився) просто перестають читатися і витісняються LRU за бюджетом.
+Виклик: RESULT_CACHE.get_or_compute(version, 'brand_share', key, lambda: compute_brand_share(...))
+Повернені об'єкти спільні між сесіями — не змінюй їх на місці.
+"""
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_MAX_BYTES = int(os.environ.get("LAPTOP_RESULT_CACHE_MB", "256")) * 2**20
+
+
+def estimate_size(value) -> int:
+    """Приблизний розмір значення в байтах."""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        usage = value.memory_usage(deep=True, index=True)
+        return int(usage.sum() if isinstance(usage, pd.Series) else usage)
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value.values())
+    return sys.getsizeof(value)
+
+
+class ResultCache:
+    """Потокобезпечний LRU з обмеженням за пам'яттю та лічильниками hit/miss."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _drop(self, key) -> None:
+        _, size = self._entries.pop(key)
+        self.bytes -= size
+
+    def invalidate(self, version: str = None) -> None:
+        """Видаляє записи всіх версій, крім version (None — видаляє все)."""
+        with self._lock:
+            for key in [k for k in self._entries if k[0] != version or version is None]:
+                self._drop(key)
+
+    def get_or_compute(self, version: str, kind: str, key: Hashable, compute: Callable):
+        if not version:
+            return compute()
+        full_key = (version, kind, key)
+        with self._lock:
+            entry = self._entries.get(full_key)
+            if entry is not None:
+                self._entries.move_to_end(full_key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        value = compute()
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return value
+        with self._lock:
+            if full_key in self._entries:
+                self._drop(full_key)
+            self._entries[full_key] = (value, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+        return value
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self.bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / total if total else 0.0,
+            }
+
+
+RESULT_CACHE = ResultCache()
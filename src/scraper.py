@@ -0,0 +1,335 @@
+"""
+Оновлення цін і характеристик каталогу зі сторінок товарів (колонка url).
+Сторінки качаються паралельно (обмежений пул потоків) з лімітом запитів на хост
+і пулом з'єднань у requests.Session кожного потоку. Відповіді кешуються на диску
+разом з ETag/Last-Modified: повторний запит умовний, а 304 (або той самий вміст)
+повертає вже розібраний результат без парсингу.
+Запуск: python -m src.scraper data/sample_laptops.csv data/scraped_laptops.csv
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+from urllib.parse import urlparse
+
+import pandas as pd
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from src.data_cache import CACHE_DIRNAME
+
+logger = logging.getLogger(__name__)
+
+HTTP_CACHE_DIR = os.path.join("data", CACHE_DIRNAME, "http")
+MAX_WORKERS = 8
+PER_HOST_INTERVAL = 1.0  # секунд між запитами до одного хоста
+TIMEOUT = 15
+USER_AGENT = "laptop-trends-2025 scraper (+https://github.com/lxllLOKIlxl/laptop-trends-2025)"
+
+# назва характеристики на сторінці (нормалізована: нижній регістр, без дужок і розділових знаків)
+# -> колонка каталогу; збіг лише з усією назвою ("Frame rate" не є "ram", "Battery life" не є "battery")
+SPEC_FIELDS = {
+    'ram': 'ram_gb',
+    'memory': 'ram_gb',
+    'system memory': 'ram_gb',
+    'installed ram': 'ram_gb',
+    'storage': 'storage_gb',
+    'storage capacity': 'storage_gb',
+    'ssd': 'storage_gb',
+    'ssd capacity': 'storage_gb',
+    'hard drive': 'storage_gb',
+    'screen size': 'screen_size_in',
+    'display size': 'screen_size_in',
+    'screen diagonal': 'screen_size_in',
+    'battery': 'battery_wh',
+    'battery capacity': 'battery_wh',
+    'refresh rate': 'refresh_rate',
+    'screen refresh rate': 'refresh_rate',
+    'processor': 'cpu',
+    'processor model': 'cpu',
+    'cpu': 'cpu',
+    'display type': 'display_type',
+    'panel': 'display_type',
+    'panel type': 'display_type',
+}
+# одиниці числових характеристик -> множник до одиниці колонки; значення без такої одиниці
+# відкидаємо ("10 hours" — не Wh, "4000 mAh" без напруги в Wh не переведеш)
+SPEC_UNITS = {
+    'ram_gb': {'gb': 1, 'tb': 1024},
+    'storage_gb': {'gb': 1, 'tb': 1024},
+    'screen_size_in': {'"': 1, '″': 1, 'in': 1, 'inch': 1, 'inches': 1, 'cm': 1 / 2.54},
+    'battery_wh': {'wh': 1, 'whr': 1},
+    'refresh_rate': {'hz': 1},
+}
+_MEASURE = re.compile(r'(\d[\d.,]*)\s*-?\s*([a-z]+|["″])')
+
+
+class HostRateLimiter:
+    """Не частіше одного запиту на min_interval секунд до кожного хоста."""
+
+    def __init__(self, min_interval: float = PER_HOST_INTERVAL):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next: Dict[str, float] = {}
+
+    def wait(self, host: str) -> None:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next.get(host, 0.0))
+            self._next[host] = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class ResponseCache:
+    """Дисковий кеш: <sha1(url)>.json з валідаторами, sha1 тіла і вже розібраним результатом."""
+
+    def __init__(self, folder: str = HTTP_CACHE_DIR):
+        self.folder = folder
+        os.makedirs(folder, exist_ok=True)
+
+    def _path(self, url: str) -> str:
+        return os.path.join(self.folder, hashlib.sha1(url.encode('utf-8')).hexdigest() + ".json")
+
+    def get(self, url: str) -> Optional[dict]:
+        try:
+            with open(self._path(url), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, url: str, entry: dict) -> None:
+        path = self._path(url)
+        tmp = path + ".tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+
+def make_session(pool_size: int = MAX_WORKERS) -> requests.Session:
+    session = requests.Session()
+    retry = Retry(total=2, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504), allowed_methods=("GET",))
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["User-Agent"] = USER_AGENT
+    return session
+
+
+def _number(value) -> Optional[float]:
+    match = re.search(r'\d[\d.,]*', str(value).replace('\u00a0', '').replace(' ', ''))
+    if not match:
+        return None
+    text = match.group(0).rstrip('.,')
+    # "1,649.00" / "1.649,00" / "1,649" — роздільник тисяч відкидаємо, десятковий -> крапка
+    if ',' in text and '.' in text:
+        text = text.replace(',', '') if text.rfind('.') > text.rfind(',') else text.replace('.', '').replace(',', '.')
+    elif ',' in text:
+        text = text.replace(',', '') if re.fullmatch(r'\d{1,3}(,\d{3})+', text) else text.replace(',', '.')
+    elif text.count('.') > 1:
+        text = text.replace('.', '')
+    return float(text)
+
+
+def _spec_label(name: str) -> str:
+    """"Memory (RAM):" -> "memory"."""
+    name = re.sub(r'\(.*?\)', ' ', str(name).lower())
+    return ' '.join(re.sub(r'[^a-z0-9]+', ' ', name).split())
+
+
+def _measure(value, units: Dict[str, float]) -> Optional[float]:
+    """Перше число з очікуваною одиницею, переведене в одиницю колонки; None, якщо такого нема."""
+    for number, unit in _MEASURE.findall(str(value).lower().replace('\u00a0', ' ')):
+        if unit in units:
+            amount = _number(number)
+            return None if amount is None else round(amount * units[unit], 2)
+    return None
+
+
+def _walk_jsonld(node):
+    if isinstance(node, list):
+        for item in node:
+            yield from _walk_jsonld(item)
+    elif isinstance(node, dict):
+        yield node
+        for key in ('@graph', 'offers', 'itemListElement'):
+            if key in node:
+                yield from _walk_jsonld(node[key])
+
+
+def parse_product_page(html: str) -> dict:
+    """Ціна (USD) і характеристики зі сторінки: JSON-LD Product, мікророзмітка, meta product:price."""
+    soup = BeautifulSoup(html, "html.parser")
+    result: dict = {}
+    specs: dict = {}
+
+    for script in soup.find_all("script", type="application/ld+json"):
+        try:
+            data = json.loads(script.string or "")
+        except ValueError:
+            continue
+        for node in _walk_jsonld(data):
+            kind = node.get('@type')
+            if kind == 'Product':
+                if node.get('name'):
+                    result.setdefault('title', str(node['name']))
+                for prop in node.get('additionalProperty') or []:
+                    if isinstance(prop, dict) and prop.get('name'):
+                        # PropertyValue може давати одиницю окремо: {"value": 1, "unitText": "TB"}
+                        unit = prop.get('unitText')
+                        value = prop.get('value')
+                        specs[str(prop['name']).lower()] = f"{value} {unit}" if unit and value is not None else value
+            if kind in ('Offer', 'AggregateOffer') and 'price_usd' not in result:
+                currency = str(node.get('priceCurrency') or 'USD').upper()
+                price = _number(node.get('price', node.get('lowPrice')))
+                if currency == 'USD' and price is not None:
+                    result['price_usd'] = price
+
+    if 'price_usd' not in result:
+        amount = soup.find("meta", attrs={"property": "product:price:amount"})
+        currency = soup.find("meta", attrs={"property": "product:price:currency"})
+        tag = amount or soup.find(attrs={"itemprop": "price"})
+        cur = (currency.get("content") if currency else None) or 'USD'
+        if tag is not None and cur.upper() == 'USD':
+            price = _number(tag.get("content") or tag.get_text())
+            if price is not None:
+                result['price_usd'] = price
+
+    # таблиці характеристик: <tr><th>RAM</th><td>16 GB</td></tr> або <dt>/<dd>
+    for row in soup.select("tr"):
+        cells = row.find_all(["th", "td"])
+        if len(cells) >= 2:
+            specs.setdefault(cells[0].get_text(" ", strip=True).lower(), cells[1].get_text(" ", strip=True))
+    for dt in soup.find_all("dt"):
+        dd = dt.find_next_sibling("dd")
+        if dd is not None:
+            specs.setdefault(dt.get_text(" ", strip=True).lower(), dd.get_text(" ", strip=True))
+
+    for name, value in specs.items():
+        column = SPEC_FIELDS.get(_spec_label(name))
+        if column is None or column in result or value in (None, ''):
+            continue
+        if column in SPEC_UNITS:
+            result[column] = _measure(value, SPEC_UNITS[column])
+            if result[column] is None:
+                logger.debug("Spec %r: no expected unit in %r", name, value)
+                del result[column]
+        else:
+            result[column] = str(value).strip()
+    return {k: v for k, v in result.items() if v is not None}
+
+
+class Scraper:
+    """Паралельний збір сторінок з лімітом на хост, умовними GET і дисковим кешем."""
+
+    def __init__(self, max_workers: int = MAX_WORKERS, per_host_interval: float = PER_HOST_INTERVAL,
+                 cache_dir: str = HTTP_CACHE_DIR, timeout: float = TIMEOUT,
+                 session_factory: Callable[[], requests.Session] = None):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.limiter = HostRateLimiter(per_host_interval)
+        self.cache = ResponseCache(cache_dir)
+        self.session_factory = session_factory or (lambda: make_session(max_workers))
+        self._local = threading.local()
+        self.stats = {'fetched': 0, 'not_modified': 0, 'unchanged': 0, 'errors': 0}
+        self._stats_lock = threading.Lock()
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = self.session_factory()
+        return session
+
+    def _count(self, key: str) -> None:
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def fetch(self, url: str) -> dict:
+        """Розібраний результат сторінки (з кешу, якщо сервер відповів 304 або вміст не змінився)."""
+        cached = self.cache.get(url)
+        headers = {}
+        if cached:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+
+        self.limiter.wait(urlparse(url).netloc)
+        try:
+            response = self._session().get(url, headers=headers, timeout=self.timeout)
+        except requests.RequestException as exc:
+            logger.warning("Fetch failed %s: %s", url, exc)
+            self._count('errors')
+            return cached['parsed'] if cached else {}
+
+        if response.status_code == 304 and cached:
+            self._count('not_modified')
+            return cached['parsed']
+        if response.status_code != 200:
+            logger.warning("Fetch %s: HTTP %s", url, response.status_code)
+            self._count('errors')
+            return cached['parsed'] if cached else {}
+
+        body_sha1 = hashlib.sha1(response.content).hexdigest()
+        if cached and cached.get('body_sha1') == body_sha1:
+            self._count('unchanged')
+            parsed = cached['parsed']
+        else:
+            self._count('fetched')
+            parsed = parse_product_page(response.text)
+        self.cache.put(url, {
+            'url': url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'body_sha1': body_sha1,
+            'fetched_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'parsed': parsed,
+        })
+        return parsed
+
+    def fetch_all(self, urls) -> Dict[str, dict]:
+        unique = [u for u in dict.fromkeys(urls) if isinstance(u, str) and u.startswith(('http://', 'https://'))]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            return dict(zip(unique, pool.map(self.fetch, unique)))
+
+
+def scrape_catalog(df: pd.DataFrame, scraper: Optional[Scraper] = None) -> pd.DataFrame:
+    """Копія сирого каталогу (схема sample_laptops.csv) з оновленими зі сторінок полями."""
+    scraper = scraper or Scraper()
+    out = df.copy()
+    if 'url' not in out.columns:
+        return out
+    results = scraper.fetch_all(out['url'])
+    updates = pd.DataFrame.from_dict(results, orient='index')
+    if updates.empty:
+        return out
+    for col in updates.columns:
+        if col == 'title':
+            continue
+        values = out['url'].map(updates[col])
+        if col in out.columns:
+            out[col] = values.where(values.notna(), out[col])
+        else:
+            out[col] = values
+    logger.info("Scraped %d pages: %s", len(results), scraper.stats)
+    return out
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    if len(sys.argv) < 2:
+        print("usage: python -m src.scraper <catalog.csv> [output.csv]")
+        sys.exit(2)
+    source = sys.argv[1]
+    target = sys.argv[2] if len(sys.argv) > 2 else source
+    catalog = pd.read_csv(source)
+    scrape_catalog(catalog).to_csv(target, index=False)
+    print(target)
@@ -0,0 +1,244 @@
+"""
+Повнотекстовий пошук по brand / model / cpu / display_type.
+Будується один раз на версію датасету: кожне поле факторизується, унікальні значення
+розбиваються на слова (словник), над словником — інвертований індекс триграм.
+Слово запиту розширюється до слів словника (точно, за префіксом або з 1–2 помилками),
+далі слово -> значення полів -> позиції рядків (без str.contains по всіх рядках).
+Усі слова запиту мають знайтися (AND); релевантність — сума найкращих збігів слів.
+Виклик: positions, scores = search_positions(df, "zenbok ultra 7")
+        ranked = rank_positions(filtered_positions, positions, scores)
+"""
+import bisect
+import re
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.data_cache import dataset_version
+from src.profiling import span, timed
+
+# поле -> вага збігу
+SEARCH_FIELDS = {'model': 1.0, 'brand': 0.9, 'cpu': 0.8, 'display_type': 0.5}
+RELEVANCE = 'relevance'
+NGRAM = 3
+EXACT_SCORE = 1.0
+PREFIX_SCORE = 0.8
+FUZZY_SCORE = 0.6
+MAX_EXPANSIONS = 256
+MAX_INDEXES = 4
+
+_TOKEN = re.compile(r'[^\W_]+')
+_indexes: Dict[str, "SearchIndex"] = {}
+
+
+def tokenize(text) -> List[str]:
+    """Слова тексту в нижньому регістрі ("i7-1355U" -> ["i7", "1355u"])."""
+    return _TOKEN.findall(str(text).lower())
+
+
+def query_terms(query) -> Tuple[str, ...]:
+    """Канонічні слова запиту (без повторів, відсортовані) — порядок на результат не впливає."""
+    return tuple(sorted(set(tokenize(query)))) if query else ()
+
+
+def _ngrams(token: str) -> List[str]:
+    padded = f"${token}$"
+    return [padded[i:i + NGRAM] for i in range(max(1, len(padded) - NGRAM + 1))]
+
+
+def _max_edits(term: str) -> int:
+    return 0 if len(term) < 4 else 1 if len(term) < 8 else 2
+
+
+def _edit_distance(a: str, b: str, limit: int) -> int:
+    """Відстань Дамерау–Левенштейна (з перестановкою сусідніх); > limit -> limit + 1."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev2, prev = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if prev2 is not None and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+        if min(cur) > limit:
+            return limit + 1
+        prev2, prev = prev, cur
+    return prev[-1]
+
+
+def field_codes(chunks: Iterable[pd.DataFrame], fields=tuple(SEARCH_FIELDS)) -> Dict[str, Tuple[np.ndarray, List[str]]]:
+    """поле -> (код значення для кожного рядка, унікальні значення); шматки — у порядку рядків."""
+    lookups: Dict[str, Dict[str, int]] = {}
+    parts: Dict[str, List[np.ndarray]] = {}
+    for chunk in chunks:
+        for col in fields:
+            if col not in chunk.columns:
+                continue
+            lookup = lookups.setdefault(col, {})
+            values = chunk[col]
+            codes, uniques = pd.factorize(values.astype(str).where(values.notna(), ''))
+            mapping = np.array([lookup.setdefault(v, len(lookup)) for v in uniques], dtype=np.int64)
+            parts.setdefault(col, []).append(mapping[codes] if len(mapping) else codes.astype(np.int64))
+    return {col: (np.concatenate(parts[col]), list(lookups[col])) for col in parts}
+
+
+class _Field:
+    """Одне поле: коди рядків, рядки кожного значення, значення кожного слова."""
+
+    def __init__(self, codes: np.ndarray, value_tokens: List[List[int]], vocab_size: int, weight: float):
+        self.codes = codes
+        self.weight = weight
+        self.n_values = len(value_tokens)
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(self.n_values + 1))
+        self.row_order, self.row_bounds = order, bounds
+        self.counts = np.diff(bounds)
+        # слово -> значення (CSR)
+        pairs = [(t, v) for v, tokens in enumerate(value_tokens) for t in set(tokens)]
+        tokens = np.array([p[0] for p in pairs], dtype=np.int64)
+        values = np.array([p[1] for p in pairs], dtype=np.int64)
+        by_token = np.argsort(tokens, kind='stable')
+        self.token_values = values[by_token]
+        self.token_bounds = np.searchsorted(tokens[by_token], np.arange(vocab_size + 1))
+
+    def value_scores(self, expansions: Dict[int, float]) -> np.ndarray:
+        scores = np.zeros(self.n_values, dtype='float32')
+        for token, score in expansions.items():
+            values = self.token_values[self.token_bounds[token]:self.token_bounds[token + 1]]
+            np.maximum.at(scores, values, score * self.weight)
+        return scores
+
+    def rows(self, value_scores: np.ndarray) -> np.ndarray:
+        matched = np.flatnonzero(value_scores)
+        if not len(matched):
+            return np.empty(0, dtype=np.intp)
+        return np.concatenate([self.row_order[self.row_bounds[v]:self.row_bounds[v + 1]] for v in matched])
+
+
+class SearchIndex:
+    """Незмінний індекс пошуку; позиції = iloc-позиції рядків (= row_id у SQLite)."""
+
+    def __init__(self, fields: Dict[str, Tuple[np.ndarray, List[str]]]):
+        self.size = len(next(iter(fields.values()))[0]) if fields else 0
+        vocab: Dict[str, int] = {}
+        tokenized = {
+            col: [[vocab.setdefault(t, len(vocab)) for t in tokenize(v)] for v in uniques]
+            for col, (_, uniques) in fields.items()
+        }
+        self.vocab = list(vocab)
+        self.fields = {
+            col: _Field(codes, tokenized[col], len(self.vocab), SEARCH_FIELDS.get(col, 1.0))
+            for col, (codes, _) in fields.items()
+        }
+        # префікси — бінарним пошуком по відсортованому словнику
+        self._sorted = sorted(range(len(self.vocab)), key=self.vocab.__getitem__)
+        self._sorted_words = [self.vocab[t] for t in self._sorted]
+        # триграма -> слова словника (для пошуку з помилками)
+        grams: Dict[str, List[int]] = {}
+        for token, word in enumerate(self.vocab):
+            for gram in set(_ngrams(word)):
+                grams.setdefault(gram, []).append(token)
+        self._grams = {g: np.array(t, dtype=np.int64) for g, t in grams.items()}
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "SearchIndex":
+        return cls(field_codes([df]))
+
+    def expand(self, term: str) -> Dict[int, float]:
+        """Слова словника, що відповідають слову запиту: id -> оцінка збігу.
+           Точний збіг і всі префіксні — завжди; нечітких — до MAX_EXPANSIONS найближчих.
+        """
+        found: Dict[int, float] = {}
+        start = bisect.bisect_left(self._sorted_words, term)
+        stop = bisect.bisect_left(self._sorted_words, term + '\U0010ffff', lo=start)
+        for i in range(start, stop):
+            found[self._sorted[i]] = EXACT_SCORE if self._sorted_words[i] == term else PREFIX_SCORE
+        limit = _max_edits(term)
+        if limit:
+            grams = set(_ngrams(term))
+            postings = [self._grams[g] for g in grams if g in self._grams]
+            if postings:
+                tokens, shared = np.unique(np.concatenate(postings), return_counts=True)
+                fuzzy = []
+                # кожна правка псує щонайбільше NGRAM триграм
+                for token in tokens[shared >= max(1, len(grams) - NGRAM * limit)]:
+                    token = int(token)
+                    if token in found:
+                        continue
+                    d = _edit_distance(term, self.vocab[token], limit)
+                    if d <= limit:
+                        fuzzy.append((d, self.vocab[token], token))
+                # обрізаємо лише нечіткі: спершу менша відстань, далі — за словом (стабільно між запусками)
+                for d, _, token in sorted(fuzzy)[:MAX_EXPANSIONS]:
+                    found[token] = FUZZY_SCORE - 0.2 * (d - 1)
+        return found
+
+    def match(self, query) -> Tuple[np.ndarray, np.ndarray]:
+        """(позиції за зростанням, релевантність) рядків, де знайдено всі слова запиту."""
+        terms = query_terms(query)
+        empty = (np.empty(0, dtype=np.intp), np.empty(0, dtype='float32'))
+        if not terms or not self.fields:
+            return empty
+        per_term = []
+        for term in terms:
+            expansions = self.expand(term)
+            if not expansions:
+                return empty
+            # лише поля, де слово щось знайшло
+            scores = {col: field.value_scores(expansions) for col, field in self.fields.items()}
+            scores = {col: value_scores for col, value_scores in scores.items() if value_scores.any()}
+            cost = sum(int(self.fields[col].counts[value_scores > 0].sum()) for col, value_scores in scores.items())
+            per_term.append((cost, scores))
+        per_term.sort(key=lambda item: item[0])
+
+        # найвибірковіше слово дає кандидатів, решта — перевірка лише на них
+        cost, scores = per_term[0]
+        if cost * 8 < self.size:
+            rows = np.unique(np.concatenate([self.fields[col].rows(v) for col, v in scores.items()]))
+        else:
+            hit = np.zeros(self.size, dtype=bool)
+            for col, value_scores in scores.items():
+                hit |= value_scores[self.fields[col].codes] > 0
+            rows = np.flatnonzero(hit)
+        total = np.zeros(len(rows), dtype='float32')
+        for _, scores in per_term:
+            best = np.zeros(len(rows), dtype='float32')
+            for col, value_scores in scores.items():
+                np.maximum(best, value_scores[self.fields[col].codes[rows]], out=best)
+            keep = best > 0
+            rows, total = rows[keep], total[keep] + best[keep]
+        return rows, total
+
+
+def rank_positions(positions: np.ndarray, matches: np.ndarray, scores: np.ndarray) -> np.ndarray:
+    """positions (підмножина matches, за зростанням) за спаданням релевантності, рівні — за позицією."""
+    relevance = scores[np.searchsorted(matches, positions)]
+    return positions[np.argsort(-relevance, kind='stable')]
+
+
+def cached_search_index(version: str, build: Callable[[], SearchIndex]) -> SearchIndex:
+    """Індекс для версії датасету (без версії — будується щоразу)."""
+    if not version:
+        return build()
+    index = _indexes.get(version)
+    if index is None:
+        index = _indexes[version] = build()
+        while len(_indexes) > MAX_INDEXES:
+            _indexes.pop(next(iter(_indexes)))
+    return index
+
+
+def get_search_index(df: pd.DataFrame) -> SearchIndex:
+    def build():
+        with span("search_index_build", rows=len(df)):
+            return SearchIndex.from_frame(df)
+    return cached_search_index(dataset_version(df), build)
+
+
+@timed("search")
+def search_positions(df: pd.DataFrame, query: Optional[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """(позиції за зростанням, релевантність) рядків df, що відповідають запиту."""
+    return get_search_index(df).match(query)
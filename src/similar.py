@@ -0,0 +1,102 @@
+"""
+Схожі моделі за характеристиками (найближчі сусіди).
+Вектор характеристик — SPEC_FEATURES (ціна/RAM/SSD у log-шкалі), пропуски -> медіана,
+кожна колонка стандартизована; над векторами — KD-дерево (scikit-learn), яке будується
+один раз на версію датасету. Запит — лише пошук у дереві для потрібних рядків, без
+попарних відстаней; query(positions) і all_neighbors() векторизовані на весь набір рядків.
+Виклик: neighbors, distances = get_similar_index(df).query(page_positions, k=4)
+"""
+from typing import Callable, Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.data_cache import dataset_version
+from src.profiling import span
+
+SPEC_FEATURES = (
+    'price_usd', 'screen_size_in', 'ram_gb', 'storage_gb', 'battery_wh', 'refresh_rate', 'is_oled', 'is_ai_cpu',
+)
+# кратні кроки (8 -> 16 GB і 16 -> 32 GB) важать однаково
+LOG_FEATURES = ('price_usd', 'ram_gb', 'storage_gb')
+DEFAULT_K = 4
+MAX_INDEXES = 4
+
+_indexes: Dict[str, "SimilarIndex"] = {}
+
+
+def spec_matrix(df: pd.DataFrame) -> np.ndarray:
+    """Стандартизовані вектори характеристик (рядки = рядки df); відсутня колонка — нулі."""
+    columns = []
+    for col in SPEC_FEATURES:
+        if col not in df.columns:
+            columns.append(np.zeros(len(df)))
+            continue
+        values = pd.to_numeric(df[col], errors='coerce').to_numpy(dtype='float64', na_value=np.nan, copy=True)
+        if col in LOG_FEATURES:
+            values = np.log1p(np.clip(values, 0, None))
+        missing = np.isnan(values)
+        if missing.all():
+            columns.append(np.zeros(len(df)))
+            continue
+        values[missing] = np.median(values[~missing])
+        std = values.std()
+        columns.append((values - values.mean()) / std if std > 0 else np.zeros(len(df)))
+    return np.column_stack(columns)
+
+
+class SimilarIndex:
+    """KD-дерево над векторами характеристик; позиції = iloc-позиції рядків (= row_id у SQLite)."""
+
+    def __init__(self, features: pd.DataFrame):
+        from sklearn.neighbors import KDTree
+
+        self.size = len(features)
+        self.vectors = spec_matrix(features)
+        self.tree = KDTree(self.vectors)
+
+    def query(self, positions, k: int = DEFAULT_K) -> Tuple[np.ndarray, np.ndarray]:
+        """(позиції сусідів [n, k], відстані [n, k]) для рядків positions, без самого рядка.
+           Рядків менше за k + 1 — сусідів відповідно менше.
+        """
+        positions = np.asarray(positions, dtype=np.intp)
+        k = max(0, min(int(k), self.size - 1))
+        if not len(positions) or not k:
+            return np.empty((len(positions), k), dtype=np.intp), np.empty((len(positions), k))
+        distances, neighbors = self.tree.query(self.vectors[positions], k=k + 1)
+        # сам рядок зазвичай перший, але за рівних відстаней (дублікати) — будь-де або поза k + 1
+        other = neighbors != positions[:, None]
+        keep = np.argsort(~other, axis=1, kind='stable')[:, :k]
+        return np.take_along_axis(neighbors, keep, axis=1), np.take_along_axis(distances, keep, axis=1)
+
+    def all_neighbors(self, k: int = DEFAULT_K) -> Tuple[np.ndarray, np.ndarray]:
+        """Top-k сусідів для кожного рядка одним викликом."""
+        return self.query(np.arange(self.size), k)
+
+
+def cached_similar_index(version: str, build: Callable[[], SimilarIndex]) -> SimilarIndex:
+    """Індекс для версії датасету (без версії — будується щоразу)."""
+    if not version:
+        return build()
+    index = _indexes.get(version)
+    if index is None:
+        with span("similar_index_build"):
+            index = _indexes[version] = build()
+        while len(_indexes) > MAX_INDEXES:
+            _indexes.pop(next(iter(_indexes)))
+    return index
+
+
+def get_similar_index(df: pd.DataFrame) -> SimilarIndex:
+    return cached_similar_index(dataset_version(df), lambda: SimilarIndex(df))
+
+
+def neighbor_frame(positions, neighbors: np.ndarray, distances: np.ndarray) -> pd.DataFrame:
+    """Довга таблиця (source, rank, neighbor, distance) з результату SimilarIndex.query."""
+    k = neighbors.shape[1] if neighbors.ndim == 2 else 0
+    return pd.DataFrame({
+        'source': np.repeat(np.asarray(positions, dtype=np.intp), k),
+        'rank': np.tile(np.arange(k), len(neighbors)),
+        'neighbor': neighbors.ravel(),
+        'distance': distances.ravel(),
+    })
@@ -0,0 +1,122 @@
+"""
+Каталог з кількох джерел: тека або glob із CSV/Parquet (окремі фіди магазинів і брендів).
+Файли нормалізуються паралельно (пул процесів, spawn); кожен шард кешується за власним відбитком
+(sidecar з src.data_cache), тож після зміни одного фіду перепарсюється лише він.
+Далі — злиття та дедуплікація за нормалізованими (brand, model, cpu, ram_gb, storage_gb).
+Виклик: load_sources("data/feeds/", keep="cheapest")   # або "data/feeds/*.csv", keep="newest"
+"""
+import glob
+import hashlib
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.data_cache import cached_frame, file_fingerprint, load_data_cached, remember_frame
+from src.data_processing import concat_frames
+from src.profiling import timed
+
+logger = logging.getLogger(__name__)
+
+SOURCE_EXTS = ('.csv', '.parquet', '.pq')
+DEDUP_KEY = ['brand', 'model', 'cpu', 'ram_gb', 'storage_gb']
+# правило -> сортування (колонки, за зростанням); перший рядок групи дублікатів лишається
+KEEP_RULES = {
+    'cheapest': (['price_usd', 'release_year'], [True, False]),
+    'newest': (['release_year', 'price_usd'], [False, True]),
+}
+
+
+def list_sources(path: str) -> List[str]:
+    """Файли каталогу в теці (не рекурсивно) або за glob-шаблоном, відсортовані."""
+    pattern = os.path.join(path, '*') if os.path.isdir(path) else path
+    return sorted(
+        f for f in glob.glob(pattern)
+        if os.path.isfile(f) and f.lower().endswith(SOURCE_EXTS)
+    )
+
+
+def _load_shard(job) -> pd.DataFrame:
+    """Виконується в дочірньому процесі: sidecar шарду або парсинг + запис sidecar."""
+    path, typed = job
+    return load_data_cached(path, typed=typed)
+
+
+def _normalized_key(df: pd.DataFrame) -> pd.DataFrame:
+    key = pd.DataFrame(index=df.index)
+    for col in DEDUP_KEY:
+        if col not in df.columns:
+            continue
+        if col in ('ram_gb', 'storage_gb'):
+            key[col] = pd.to_numeric(df[col], errors='coerce')
+        else:
+            key[col] = df[col].astype(str).str.strip().str.lower().str.replace(r'\s+', ' ', regex=True)
+    return key
+
+
+def deduplicate(df: pd.DataFrame, keep: str = "cheapest") -> pd.DataFrame:
+    """Лишає по одному рядку на нормалізований DEDUP_KEY за правилом keep; порядок рядків зберігається."""
+    if df.empty:
+        return df
+    columns, ascending = KEEP_RULES[keep]
+    columns = [c for c, _ in zip(columns, ascending) if c in df.columns]
+    ascending = [a for c, a in zip(*KEEP_RULES[keep]) if c in df.columns]
+    order = np.arange(len(df))
+    if columns:
+        order = df.reset_index(drop=True).sort_values(columns, ascending=ascending, kind='stable').index.to_numpy()
+    key = _normalized_key(df)
+    duplicated = key.iloc[order].duplicated(keep='first').to_numpy()
+    mask = np.ones(len(df), dtype=bool)
+    mask[order[duplicated]] = False
+    return df[mask].reset_index(drop=True)
+
+
+@timed("load_sources")
+def load_sources(path: str, typed: bool = False, keep: str = "cheapest", workers: Optional[int] = None) -> pd.DataFrame:
+    """Нормалізований і дедуплікований каталог з усіх файлів path (тека або glob)."""
+    if keep not in KEEP_RULES:
+        raise ValueError(f"Unknown keep rule: {keep}")
+    files = list_sources(path)
+    if not files:
+        logger.error("No catalog files found: %s", path)
+        return pd.DataFrame()
+
+    try:
+        fingerprints = [file_fingerprint(f) for f in files]
+    except OSError:
+        logger.exception("Error reading catalog sources")
+        return pd.DataFrame()
+    mode = "typed" if typed else "full"
+    raw = "|".join(f"{os.path.abspath(f)}:{fp}" for f, fp in zip(files, fingerprints)) + f"|{mode}|{keep}"
+    version = "multi-" + hashlib.sha1(raw.encode('utf-8')).hexdigest()[:16]
+    df = cached_frame(version)
+    if df is not None:
+        return df
+
+    jobs = [(f, typed) for f in files]
+    if len(jobs) > 1 and workers != 1:
+        # spawn, не fork: батьківський процес (Streamlit, src.api) багатопотоковий, і fork-нутий
+        # дочірній може успадкувати чужий захоплений lock (логування, кеші) і зависнути
+        with ProcessPoolExecutor(max_workers=min(len(jobs), workers or os.cpu_count() or 1),
+                                 mp_context=multiprocessing.get_context('spawn')) as pool:
+            shards = list(pool.map(_load_shard, jobs))
+    else:
+        shards = [_load_shard(job) for job in jobs]
+
+    loaded = []
+    for f, shard in zip(files, shards):
+        if shard.empty:
+            logger.warning("Skipping empty source %s", f)
+        else:
+            loaded.append(shard)
+    shards = loaded
+    if not shards:
+        return pd.DataFrame()
+    merged = concat_frames(shards)
+    df = deduplicate(merged, keep)
+    logger.info("Loaded %d sources: %d rows, %d after dedup (%s)", len(shards), len(merged), len(df), keep)
+    return remember_frame(version, df)
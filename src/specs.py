@@ -0,0 +1,146 @@
+"""
+Розбір вільного тексту cpu / display_type на фасети.
+Колонка факторизується, кожне унікальне значення розбирається один раз (кеш парсера
+спільний між шматками typed-завантаження), результат розноситься назад по кодах
+компактними category-колонками. is_ai_cpu / is_oled рахуються тут же, тими самими regex.
+Виклик: df = add_spec_columns(df)
+"""
+import functools
+import re
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+# Ті самі правила, що раніше були у str.contains по всій колонці
+AI_CPU_PATTERN = re.compile(r'Ultra|AI|Ryzen AI', re.IGNORECASE)
+OLED_PATTERN = re.compile(r'OLED', re.IGNORECASE)
+
+CPU_CATEGORY_COLUMNS = ['cpu_vendor', 'cpu_family', 'cpu_tier', 'cpu_suffix']
+DISPLAY_CATEGORY_COLUMNS = ['panel_type']
+SPEC_COLUMNS = CPU_CATEGORY_COLUMNS + ['cpu_gen', 'cpu_npu'] + DISPLAY_CATEGORY_COLUMNS
+
+_VENDORS = [
+    ('Intel', re.compile(r'\bintel\b|\bcore\b|celeron|pentium|xeon', re.IGNORECASE)),
+    ('AMD', re.compile(r'\bamd\b|ryzen|athlon', re.IGNORECASE)),
+    ('Apple', re.compile(r'\bapple\b|^\s*m[1-9]\b', re.IGNORECASE)),
+    ('Qualcomm', re.compile(r'snapdragon|qualcomm', re.IGNORECASE)),
+    ('MediaTek', re.compile(r'mediatek|kompanio|dimensity', re.IGNORECASE)),
+]
+_INTEL_ULTRA = re.compile(r'\bultra\s*([3579])\b(?:\s*-?\s*(\d)(\d{2})([a-z]{0,2}))?', re.IGNORECASE)
+_INTEL_CORE = re.compile(r'\bi([3579])\b(?:\s*-?\s*(\d{4,5})([a-z]{0,2}\d?))?', re.IGNORECASE)
+_RYZEN_AI = re.compile(r'ryzen\s+ai\s*(?:max\+?\s*)?([3579])?\b\s*(?:(hx|pro)\s*)?(?:(\d)(\d{2}))?', re.IGNORECASE)
+_RYZEN = re.compile(r'ryzen\s+([3579])\b(?:\s*(?:pro\s*)?(\d)(\d{3})([a-z]{0,2}))?', re.IGNORECASE)
+_APPLE_M = re.compile(r'\bm([1-9])\b(?:\s*(pro|max|ultra))?', re.IGNORECASE)
+_SNAPDRAGON = re.compile(r'snapdragon\s+x\s*(elite|plus)?', re.IGNORECASE)
+
+_PANELS = [
+    ('Mini-LED', re.compile(r'mini\s*-?\s*led', re.IGNORECASE)),
+    ('OLED', OLED_PATTERN),
+    ('IPS', re.compile(r'\bips\b', re.IGNORECASE)),
+    ('VA', re.compile(r'\bva\b', re.IGNORECASE)),
+    ('TN', re.compile(r'\btn\b', re.IGNORECASE)),
+    ('LCD', re.compile(r'lcd|led', re.IGNORECASE)),
+]
+
+
+def _blank(text: str) -> bool:
+    return text.strip().lower() in ('', 'nan', 'none', '<na>')
+
+
+@functools.lru_cache(maxsize=8192)
+def parse_cpu(text: str) -> Dict[str, object]:
+    """Атрибути одного рядка cpu: vendor, family, tier, gen, suffix, npu, is_ai_cpu."""
+    text = str(text)
+    result = {'cpu_vendor': None, 'cpu_family': None, 'cpu_tier': None, 'cpu_gen': None,
+              'cpu_suffix': None, 'cpu_npu': False, 'is_ai_cpu': bool(AI_CPU_PATTERN.search(text))}
+    if _blank(text):
+        return result
+    result['cpu_vendor'] = next((name for name, rx in _VENDORS if rx.search(text)), 'Other')
+
+    if m := _INTEL_ULTRA.search(text):
+        result.update(cpu_vendor='Intel', cpu_family='Core Ultra', cpu_tier=f'Ultra {m.group(1)}', cpu_npu=True)
+        if m.group(2):
+            result['cpu_gen'] = int(m.group(2))
+            result['cpu_suffix'] = m.group(4).upper() or None
+    elif m := _INTEL_CORE.search(text):
+        result.update(cpu_vendor='Intel', cpu_family='Core i', cpu_tier=f'i{m.group(1)}')
+        if m.group(2):
+            number = m.group(2)
+            result['cpu_gen'] = int(number[:2] if len(number) == 5 or number.startswith('1') else number[0])
+            result['cpu_suffix'] = m.group(3).upper() or None
+    elif m := _RYZEN_AI.search(text):
+        result.update(cpu_vendor='AMD', cpu_family='Ryzen AI', cpu_npu=True)
+        result['cpu_tier'] = f'Ryzen AI {m.group(1)}' if m.group(1) else 'Ryzen AI'
+        if m.group(2) and m.group(2).lower() == 'hx':
+            result['cpu_suffix'] = 'HX'
+        if m.group(4):
+            result['cpu_gen'] = int(m.group(3))
+    elif m := _RYZEN.search(text):
+        result.update(cpu_vendor='AMD', cpu_family='Ryzen', cpu_tier=f'Ryzen {m.group(1)}')
+        if m.group(2):
+            result['cpu_gen'] = int(m.group(2))
+            result['cpu_suffix'] = m.group(4).upper() or None
+    elif result['cpu_vendor'] == 'Apple' and (m := _APPLE_M.search(text)):
+        variant = f' {m.group(2).title()}' if m.group(2) else ''
+        result.update(cpu_family='Apple M', cpu_tier=f'M{m.group(1)}{variant}', cpu_gen=int(m.group(1)), cpu_npu=True)
+    elif m := _SNAPDRAGON.search(text):
+        result.update(cpu_vendor='Qualcomm', cpu_family='Snapdragon X', cpu_npu=True)
+        result['cpu_tier'] = f'X {m.group(1).title()}' if m.group(1) else 'X'
+    return result
+
+
+@functools.lru_cache(maxsize=1024)
+def parse_display(text: str) -> Dict[str, object]:
+    """Атрибути одного рядка display_type: panel_type, is_oled."""
+    text = str(text)
+    panel = None if _blank(text) else next((name for name, rx in _PANELS if rx.search(text)), 'Other')
+    return {'panel_type': panel, 'is_oled': bool(OLED_PATTERN.search(text))}
+
+
+def _broadcast(codes: np.ndarray, parsed: list, column: str, kind: str) -> pd.Series:
+    values = [p[column] for p in parsed]
+    if kind == 'category':
+        # явний dtype: інакше порожній фасет шматка дає object-категорії і union_categoricals падає
+        categories = pd.Index(sorted({v for v in values if v is not None}), dtype=str)
+        lookup = {v: i for i, v in enumerate(categories)}
+        unique_codes = np.array([lookup.get(v, -1) for v in values], dtype=np.int32)
+        return pd.Categorical.from_codes(unique_codes[codes], categories=categories)
+    if kind == 'bool':
+        return np.array(values, dtype=bool)[codes]
+    return pd.array(np.array([np.nan if v is None else v for v in values], dtype='float64')[codes]).astype('Int16')
+
+
+def parse_column(series: pd.Series, parser, columns: Dict[str, str]) -> Dict[str, object]:
+    """Факторизує series, розбирає кожне унікальне значення parser-ом і розносить по рядках."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # typed-режим: коди вже є, NaN (-1) -> додаткове значення 'nan' в кінці
+        uniques = list(series.cat.categories.astype(str)) + ['nan']
+        codes = np.where(series.cat.codes.to_numpy() < 0, len(uniques) - 1, series.cat.codes.to_numpy())
+    else:
+        codes, uniques = pd.factorize(series.astype(str), use_na_sentinel=False)
+    parsed = [parser(u) for u in uniques]
+    return {col: _broadcast(codes, parsed, col, kind) for col, kind in columns.items()}
+
+
+def add_spec_columns(df: pd.DataFrame, copy: bool = False) -> pd.DataFrame:
+    """Додає фасети CPU/екрана (SPEC_COLUMNS) та is_ai_cpu / is_oled; cpu і display_type вже рядки."""
+    out = df.copy() if copy else df
+    cpu_kinds = {col: 'category' for col in CPU_CATEGORY_COLUMNS}
+    cpu_kinds.update(cpu_gen='int', cpu_npu='bool', is_ai_cpu='bool')
+    for col, values in parse_column(out['cpu'], parse_cpu, cpu_kinds).items():
+        out[col] = values
+    for col, values in parse_column(out['display_type'], parse_display, {'panel_type': 'category', 'is_oled': 'bool'}).items():
+        out[col] = values
+    return out
+
+
+def facet_values(df: pd.DataFrame, column: str) -> list:
+    """Значення фасета, що реально є в df (для мультиселекту)."""
+    if column not in df.columns:
+        return []
+    series = df[column]
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        present = series.cat.remove_unused_categories().cat.categories
+        return list(present)
+    return sorted(series.dropna().unique().tolist())
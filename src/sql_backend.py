@@ -0,0 +1,498 @@
+"""
+SQLite-бекенд каталогу для даних, що не влазять у пам'ять.
+Нормалізований каталог (та сама normalize_frame, що й у load_data) пишеться шматками
+в <тека даних>/.cache/<ім'я файлу>.<відбиток>.sqlite з індексами по brand, price_usd,
+screen_size_in, is_ai_cpu, release_year. Фільтри, частки брендів, тренди і сторінка
+каталогу (ORDER BY price_usd LIMIT/OFFSET) рахуються в SQL — у Python потрапляє лише
+видима сторінка та агрегати. row_id = позиція рядка в pandas-шляху.
+Гортання сторінок вперед — keyset (WHERE (col, row_id) > курсор), без OFFSET-сканування.
+Текстовий запит шукається в пам'яті (src.search, індекс з текстових колонок бази) і
+потрапляє в SQL як row_id IN (json_each(?)).
+Виклик: catalog = open_sqlite_catalog("data/sample_laptops.csv"); catalog.page(filters, 0, 12)
+"""
+import json
+import logging
+import math
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.catalog_index import DEFAULT_SORT, FACET_COLUMNS, SORT_KEYS, filter_key
+from src.data_cache import CACHE_DIRNAME, dataset_version, file_fingerprint, load_data_cached
+from src.data_processing import (
+    CHUNK_ROWS, DEFAULT_TRENDS, TREND_METRICS, _iter_raw_chunks, is_multi_source, normalize_frame,
+)
+from src.distribution import DEFAULT_BINS, DISTRIBUTION_AXES, SCATTER_MAX_POINTS, bin_edges, bins_payload, points_payload
+from src.export import cached_export, write_chunks
+from src.profiling import timed
+from src.result_cache import RESULT_CACHE
+from src.search import (
+    RELEVANCE, SEARCH_FIELDS, SearchIndex, cached_search_index, field_codes, query_terms, rank_positions,
+)
+from src.similar import DEFAULT_K, SPEC_FEATURES, SimilarIndex, cached_similar_index, neighbor_frame
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 2
+TABLE = "catalog"
+INDEXED_COLUMNS = ('brand', 'price_usd', 'screen_size_in', 'is_ai_cpu', 'release_year', 'battery_wh')
+BOOL_COLUMNS = ('is_ai_cpu', 'is_oled', 'cpu_npu')
+MAX_CURSORS = 4096
+# list-колонки SQLite не зберігає; thumbnail і image_urls_raw лишаються
+SKIP_COLUMNS = ('image_list',)
+
+_build_lock = threading.Lock()
+
+
+def _db_stem(path: str) -> str:
+    return "multi" if is_multi_source(path) else os.path.basename(path)
+
+
+def _db_path(path: str, version: str) -> str:
+    folder = path if os.path.isdir(path) else os.path.dirname(os.path.abspath(path))
+    return os.path.join(folder, CACHE_DIRNAME, f"{_db_stem(path)}.{version}.s{SCHEMA_VERSION}.sqlite")
+
+
+def _to_sql_frame(df: pd.DataFrame, offset: int) -> pd.DataFrame:
+    out = df.drop(columns=[c for c in SKIP_COLUMNS if c in df.columns])
+    for col in out.columns:
+        dtype = out[col].dtype
+        if isinstance(dtype, pd.CategoricalDtype) or pd.api.types.is_extension_array_dtype(dtype):
+            out[col] = out[col].astype(object).where(out[col].notna(), None)
+        elif pd.api.types.is_bool_dtype(dtype):
+            out[col] = out[col].astype('int8')
+    out.insert(0, 'row_id', np.arange(offset, offset + len(out), dtype='int64'))
+    return out
+
+
+def _median_sql(col: str) -> str:
+    # медіана як у pandas: середнє двох центральних значень для парної кількості
+    count = f"(SELECT COUNT({col}) FROM {TABLE})"
+    return (f"SELECT AVG({col}) FROM (SELECT {col} FROM {TABLE} WHERE {col} IS NOT NULL "
+            f"ORDER BY {col} LIMIT 2 - {count} % 2 OFFSET ({count} - 1) / 2)")
+
+
+def _write_database(chunks: Iterator[pd.DataFrame], db: str, stem: str, fill_medians: bool) -> int:
+    """Пише нормалізовані шматки в нову базу db (через тимчасовий файл); повертає кількість рядків."""
+    folder = os.path.dirname(db)
+    os.makedirs(folder, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=folder, suffix=".sqlite.tmp")
+    os.close(fd)
+    conn = sqlite3.connect(tmp)
+    try:
+        conn.execute("PRAGMA journal_mode=OFF")
+        conn.execute("PRAGMA synchronous=OFF")
+        rows = 0
+        for chunk in chunks:
+            frame = _to_sql_frame(chunk, rows)
+            if rows == 0:
+                conn.execute(pd.io.sql.get_schema(frame, TABLE, keys='row_id', con=conn))
+            frame.to_sql(TABLE, conn, if_exists='append', index=False, chunksize=10_000)
+            rows += len(frame)
+        if rows == 0:
+            raise ValueError("empty catalog")
+        if fill_medians:
+            # як у load_data: пропущені ціна/батарея -> медіана всього каталогу
+            for col in ('price_usd', 'battery_wh'):
+                conn.execute(f"UPDATE {TABLE} SET {col} = ({_median_sql(col)}) WHERE {col} IS NULL")
+        if conn.execute(f"SELECT COUNT(price_usd) FROM {TABLE}").fetchone()[0] == 0:
+            raise ValueError("no prices")
+        for col in INDEXED_COLUMNS:
+            conn.execute(f'CREATE INDEX idx_{col} ON {TABLE} ("{col}")')
+        conn.execute("ANALYZE")
+        conn.commit()
+    except Exception:
+        conn.close()
+        os.remove(tmp)
+        raise
+    conn.close()
+    os.replace(tmp, db)
+    # прибираємо бази попередніх версій того ж файлу (не інших: "a.csv." — префікс і для "a.csv.parquet")
+    stale = re.compile(re.escape(stem) + r"\.[\w-]+\.s\d+\.sqlite")
+    for name in os.listdir(folder):
+        if stale.fullmatch(name) and os.path.join(folder, name) != db:
+            try:
+                os.remove(os.path.join(folder, name))
+            except OSError:
+                pass
+    return rows
+
+
+def _normalized_chunks(path: str, chunksize: int) -> Iterator[pd.DataFrame]:
+    for chunk in _iter_raw_chunks(path, chunksize):
+        yield normalize_frame(chunk.reset_index(drop=True))
+
+
+def _frame_chunks(df: pd.DataFrame, chunksize: int) -> Iterator[pd.DataFrame]:
+    for start in range(0, len(df), chunksize):
+        yield df.iloc[start:start + chunksize]
+
+
+@timed("build_sqlite")
+def build_database(path: str, keep: str = "cheapest", chunksize: int = CHUNK_ROWS) -> Tuple[str, str]:
+    """(шлях до бази, версія) для каталогу path; будує базу лише якщо її ще немає.
+       Один файл читається шматками (пам'ять — один шматок); тека/glob зливається через
+       src.sources у пам'яті (дедуплікація потребує всіх рядків).
+    """
+    with _build_lock:
+        if is_multi_source(path):
+            df = load_data_cached(path, keep=keep)
+            if df.empty:
+                raise ValueError(f"empty catalog: {path}")
+            version = dataset_version(df) + "-sql"
+            db = _db_path(path, version)
+            if not os.path.exists(db):
+                _write_database(_frame_chunks(df, chunksize), db, _db_stem(path), fill_medians=False)
+            return db, version
+
+        version = file_fingerprint(path) + "-sql"
+        db = _db_path(path, version)
+        if not os.path.exists(db):
+            rows = _write_database(_normalized_chunks(path, chunksize), db, _db_stem(path), fill_medians=True)
+            logger.info("SQLite catalog %s: %d rows -> %s", path, rows, db)
+        return db, version
+
+
+class SQLiteCatalog:
+    """Запити до каталогу в SQLite; filters — dict аргументів filter_positions."""
+
+    def __init__(self, db: str, version: str):
+        self.db = db
+        self.version = version
+        self._local = threading.local()
+        # (ключ фільтрів, sort, offset) -> (значення, row_id) останнього рядка попередньої сторінки
+        self._cursors: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._cursor_lock = threading.Lock()
+        self.columns = [row[1] for row in self._conn().execute(f"PRAGMA table_info({TABLE})")]
+        self.rows = self._conn().execute(f"SELECT MAX(row_id) + 1 FROM {TABLE}").fetchone()[0] or 0
+
+    def _conn(self) -> sqlite3.Connection:
+        # з'єднання на потік (Streamlit виконує сесії в різних потоках), лише читання
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(f"file:{self.db}?mode=ro", uri=True)
+        return conn
+
+    def _search_index(self) -> SearchIndex:
+        def build():
+            fields = [f'"{col}"' for col in SEARCH_FIELDS if col in self.columns]
+            chunks = pd.read_sql_query(f"SELECT {', '.join(fields)} FROM {TABLE} ORDER BY row_id", self._conn(),
+                                       chunksize=CHUNK_ROWS)
+            return SearchIndex(field_codes(chunks))
+        return cached_search_index(self.version, build)
+
+    @timed("sql_search")
+    def search(self, query) -> Tuple[np.ndarray, np.ndarray, str]:
+        """(row_id збігів за зростанням, релевантність, ті ж row_id як JSON-масив для SQL)."""
+        def compute():
+            ids, scores = self._search_index().match(query)
+            return ids, scores, json.dumps(ids.tolist())
+        return RESULT_CACHE.get_or_compute(self.version, 'search', query_terms(query), compute)
+
+    def _where(self, filters: Optional[dict]) -> Tuple[str, list]:
+        filters = filters or {}
+        clauses, params = [], []
+        if query_terms(filters.get('query')):
+            ids, _, ids_json = self.search(filters['query'])
+            clauses.append("row_id IN (SELECT value FROM json_each(?))" if len(ids) else "0")
+            if len(ids):
+                params.append(ids_json)
+        brands = filters.get('brands')
+        if brands:
+            brands = sorted(set(brands))
+            clauses.append(f"brand IN ({','.join('?' * len(brands))})")
+            params.extend(brands)
+        for col, name in (('price_usd', 'price_range'), ('screen_size_in', 'screen_range')):
+            bounds = filters.get(name)
+            if bounds:
+                clauses.append(f"{col} >= ? AND {col} <= ?")
+                params.extend([float(bounds[0]), float(bounds[1])])
+        ai_cpu = filters.get('ai_cpu', "Усі")
+        if ai_cpu == "Із AI":
+            clauses.append("is_ai_cpu = 1")
+        elif ai_cpu == "Без AI":
+            clauses.append("is_ai_cpu = 0")
+        for col, values in (filters.get('facets') or {}).items():
+            if values and col in FACET_COLUMNS and col in self.columns:
+                values = sorted({str(v) for v in values})
+                clauses.append(f'"{col}" IN ({",".join("?" * len(values))})')
+                params.extend(values)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def _query(self, sql: str, params=()) -> pd.DataFrame:
+        return pd.read_sql_query(sql, self._conn(), params=params)
+
+    def _restore(self, df: pd.DataFrame) -> pd.DataFrame:
+        for col in BOOL_COLUMNS:
+            if col in df.columns:
+                df[col] = df[col].astype(bool)
+        if 'cpu_gen' in df.columns:
+            df['cpu_gen'] = df['cpu_gen'].astype('Int16')
+        return df
+
+    def _cached(self, kind: str, filters: Optional[dict], compute, extra=()):
+        key = (filter_key(**filters) if filters else None, extra)
+        return RESULT_CACHE.get_or_compute(self.version, kind, key, compute)
+
+    def options(self) -> dict:
+        """Значення для віджетів сайдбару: бренди, межі ціни/діагоналі, фасети."""
+        def compute():
+            conn = self._conn()
+            price = conn.execute(f"SELECT MIN(price_usd), MAX(price_usd) FROM {TABLE}").fetchone()
+            screen = conn.execute(f"SELECT MIN(screen_size_in), MAX(screen_size_in) FROM {TABLE}").fetchone()
+            facets = {
+                col: [r[0] for r in conn.execute(f'SELECT DISTINCT "{col}" FROM {TABLE} WHERE "{col}" IS NOT NULL ORDER BY 1')]
+                for col in FACET_COLUMNS if col in self.columns
+            }
+            brands = [r[0] for r in conn.execute(f"SELECT DISTINCT brand FROM {TABLE} ORDER BY 1")]
+            return {'brands': brands, 'price': price, 'screen': screen, 'facets': facets}
+        return self._cached('sql_options', None, compute)
+
+    @timed("sql_summary")
+    def summary(self, filters: dict) -> Tuple[int, Optional[float], Optional[float]]:
+        """(кількість, середня ціна, середня батарея) для фільтрів."""
+        def compute():
+            where, params = self._where(filters)
+            n, price, battery = self._conn().execute(
+                f"SELECT COUNT(*), AVG(price_usd), AVG(battery_wh) FROM {TABLE}{where}", params,
+            ).fetchone()
+            return (n, price, battery) if n else (0, None, None)
+        return self._cached('summary', filters, compute)
+
+    def _remember_cursor(self, key: tuple, value, row_id: int) -> None:
+        with self._cursor_lock:
+            self._cursors[key] = (value, row_id)
+            self._cursors.move_to_end(key)
+            while len(self._cursors) > MAX_CURSORS:
+                self._cursors.popitem(last=False)
+
+    def _sort_index_hint(self, filters: dict, col: str, skip: int, limit: int) -> str:
+        """INDEXED BY індекс сортування, якщо пройти його до кінця сторінки дешевше,
+           ніж вибрати всі рядки фільтра і відсортувати (планувальник обирає індекс фільтра).
+        """
+        n = self.summary(filters)[0]
+        if not n:
+            return ""
+        scan = (skip + limit) * self.rows / n
+        return f" INDEXED BY idx_{col}" if scan < n * max(1.0, math.log2(n)) else ""
+
+    @timed("sql_page")
+    def page(self, filters: dict, offset: int, limit: int, sort: Tuple[str, bool] = DEFAULT_SORT) -> pd.DataFrame:
+        """Рядки сторінки в порядку sort (рівні значення — за row_id); індекс = row_id.
+           Якщо відомий курсор кінця попередньої сторінки — keyset-запит замість OFFSET.
+        """
+        col, descending = sort
+        if col == RELEVANCE:
+            if query_terms(filters.get('query')):
+                return self._relevance_page(filters, int(offset), int(limit))
+            col, descending = DEFAULT_SORT
+        if col not in SORT_KEYS or col not in self.columns:
+            raise ValueError(f"Unknown sort key: {col}")
+        offset, limit = int(offset), int(limit)
+        base_key = (filter_key(**filters), (col, bool(descending)))
+
+        def compute():
+            where, params = self._where(filters)
+            direction = "DESC" if descending else "ASC"
+            with self._cursor_lock:
+                cursor = self._cursors.get(base_key + (offset,)) if offset else None
+            hint = self._sort_index_hint(filters, col, 0 if cursor else offset, limit)
+            if cursor is not None:
+                # (col, row_id) після курсору; col >= / <= дає індексу діапазон для пошуку
+                op = "<" if descending else ">"
+                keyset = f'"{col}" {op}= ? AND ("{col}" {op} ? OR row_id > ?)'
+                where = f"{where} AND {keyset}" if where else f" WHERE {keyset}"
+                df = self._query(
+                    f'SELECT * FROM {TABLE}{hint}{where} ORDER BY "{col}" {direction}, row_id LIMIT ?',
+                    params + [cursor[0], cursor[0], cursor[1], limit],
+                )
+            else:
+                df = self._query(
+                    f'SELECT * FROM {TABLE}{hint}{where} ORDER BY "{col}" {direction}, row_id LIMIT ? OFFSET ?',
+                    params + [limit, offset],
+                )
+            if len(df):
+                value = df[col].iat[-1]
+                value = value.item() if hasattr(value, 'item') else value
+                self._remember_cursor(base_key + (offset + len(df),), value, int(df['row_id'].iat[-1]))
+            return self._restore(df.set_index('row_id').rename_axis(None))
+        return self._cached('page', filters, compute, extra=((col, bool(descending)), offset, limit))
+
+    def _relevance_page(self, filters: dict, offset: int, limit: int) -> pd.DataFrame:
+        """Сторінка збігів пошуку за релевантністю: порядок row_id рахується раз на стан фільтрів."""
+        def order():
+            where, params = self._where(filters)
+            ids = np.array([r[0] for r in self._conn().execute(
+                f"SELECT row_id FROM {TABLE}{where} ORDER BY row_id", params)], dtype=np.int64)
+            matches, scores, _ = self.search(filters['query'])
+            return rank_positions(ids, matches, scores)
+
+        def compute():
+            ids = self._cached('order', filters, order, extra=(RELEVANCE,))[offset:offset + limit]
+            if not len(ids):
+                return self._restore(self._query(f"SELECT * FROM {TABLE} LIMIT 0").set_index('row_id').rename_axis(None))
+            df = self._query(f"SELECT * FROM {TABLE} WHERE row_id IN ({','.join('?' * len(ids))})", ids.tolist())
+            return self._restore(df.set_index('row_id').rename_axis(None).reindex(ids))
+        return self._cached('page', filters, compute, extra=((RELEVANCE, False), offset, limit))
+
+    @timed("sql_brand_share")
+    def brand_share(self, filters: dict) -> pd.DataFrame:
+        def compute():
+            where, params = self._where(filters)
+            return self._query(
+                f"SELECT brand, COUNT(*) AS count FROM {TABLE}{where} GROUP BY brand ORDER BY count DESC, MIN(row_id)",
+                params,
+            )
+        return self._cached('brand_share', filters, compute)
+
+    def _quantiles(self, column: str, q: float, where: str, params: list) -> pd.Series:
+        """Перцентиль/медіана по роках з тією ж інтерполяцією, що й pandas (numpy linear)."""
+        sql = (
+            f"WITH r AS (SELECT release_year AS y, {column} AS v, "
+            f"ROW_NUMBER() OVER (PARTITION BY release_year ORDER BY {column}) - 1 AS i, "
+            f"COUNT(*) OVER (PARTITION BY release_year) AS n "
+            f"FROM {TABLE}{where}{' AND' if where else ' WHERE'} {column} IS NOT NULL) "
+            f"SELECT y, i, v, n FROM r WHERE i = CAST((n - 1) * ? AS INTEGER) OR i = CAST((n - 1) * ? AS INTEGER) + 1 "
+            f"ORDER BY y, i"
+        )
+        rows = self._conn().execute(sql, params + [q, q] if q != 'median' else params + [0.5, 0.5]).fetchall()
+        values: Dict[int, List[float]] = {}
+        counts: Dict[int, int] = {}
+        for y, _, v, n in rows:
+            values.setdefault(y, []).append(float(v))
+            counts[y] = n
+        out = {}
+        for y, pair in values.items():
+            a, b = pair[0], pair[-1]
+            if q == 'median':
+                out[y] = (a + b) / 2 if counts[y] % 2 == 0 else a
+                continue
+            pos = (counts[y] - 1) * q
+            t = pos - math.floor(pos)
+            diff = b - a
+            out[y] = b - diff * (1 - t) if t >= 0.5 else a + diff * t
+        return pd.Series(out, dtype='float64')
+
+    @timed("sql_trends")
+    def trends(self, filters: Optional[dict] = None, metrics: Optional[List[str]] = None) -> pd.DataFrame:
+        """Тренди по release_year у форматі compute_trends (year/value/metric)."""
+        names = tuple(m for m in (metrics or DEFAULT_TRENDS) if TREND_METRICS[m][1] in self.columns)
+
+        def compute():
+            if not names:
+                return pd.DataFrame(columns=['year', 'metric', 'value'])
+            where, params = self._where(filters)
+            simple = [n for n in names if TREND_METRICS[n][2] in ('mean', 'share', 'count')]
+            select = ", ".join(
+                ("COUNT(*)" if TREND_METRICS[n][2] == 'count' else f'AVG("{TREND_METRICS[n][1]}")') + f' AS "{n}"'
+                for n in simple
+            )
+            wide = self._query(
+                f"SELECT release_year{', ' + select if select else ''} FROM {TABLE}{where} "
+                f"GROUP BY release_year ORDER BY release_year",
+                params,
+            ).set_index('release_year')
+            if wide.empty:
+                return pd.DataFrame(columns=['year', 'metric', 'value'])
+            for name in names:
+                _, column, agg = TREND_METRICS[name]
+                if agg == 'median' or isinstance(agg, float):
+                    wide[name] = self._quantiles(column, agg, where, params).reindex(wide.index)
+            wide = wide[list(names)].astype('float64')
+            long = wide.reset_index().melt(id_vars='release_year', var_name='metric', value_name='value')
+            long['metric'] = long['metric'].map({name: TREND_METRICS[name][0] for name in names})
+            long.rename(columns={'release_year': 'year'}, inplace=True)
+            return long[['year', 'value', 'metric']]
+        return self._cached('trends', filters, compute, extra=names)
+
+    @timed("sql_distribution")
+    def distribution(self, filters: dict, x: str, y: str, bins: int = DEFAULT_BINS) -> dict:
+        """Точки або 2D-гістограма x/y (src.distribution); SQL групує унікальні пари, біни — np.histogram2d."""
+        for col in (x, y):
+            if col not in DISTRIBUTION_AXES or col not in self.columns:
+                raise ValueError(f"Unknown axis: {col}")
+        bins = int(bins)
+
+        def compute():
+            where, params = self._where(filters)
+            present = f'"{x}" IS NOT NULL AND "{y}" IS NOT NULL'
+            where = f"{where} AND {present}" if where else f" WHERE {present}"
+            n, x_lo, x_hi, y_lo, y_hi = self._conn().execute(
+                f'SELECT COUNT(*), MIN("{x}"), MAX("{x}"), MIN("{y}"), MAX("{y}") FROM {TABLE}{where}', params,
+            ).fetchone()
+            if n <= SCATTER_MAX_POINTS:
+                df = self._query(f'SELECT "{x}" AS x, "{y}" AS y, brand, model FROM {TABLE}{where} ORDER BY row_id', params)
+                labels = (df['brand'].astype(str) + ' ' + df['model'].astype(str)).to_numpy()
+                return points_payload(df['x'].to_numpy(dtype='float64'), df['y'].to_numpy(dtype='float64'), labels)
+            x_edges, y_edges = bin_edges(x_lo, x_hi, bins), bin_edges(y_lo, y_hi, bins)
+            # SQL лише зводить рядки до унікальних пар (x, y) з кількістю; біни — тим самим
+            # np.histogram2d, що й у pandas-бекенді (межі з плаваючою комою збігаються до біта)
+            pairs = np.array(self._conn().execute(
+                f'SELECT "{x}", "{y}", COUNT(*) FROM {TABLE}{where} GROUP BY "{x}", "{y}"', params,
+            ).fetchall(), dtype='float64').reshape(-1, 3)
+            counts, _, _ = np.histogram2d(pairs[:, 0], pairs[:, 1], bins=(x_edges, y_edges), weights=pairs[:, 2])
+            counts = counts.astype(np.int64)
+            return bins_payload(n, x_edges, y_edges, counts)
+        return self._cached('distribution', filters, compute, extra=(x, y, bins))
+
+    def iter_rows(self, filters: Optional[dict], chunk_rows: int = CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+        """Усі рядки, що проходять фільтри (порядок row_id), шматками."""
+        where, params = self._where(filters)
+        for chunk in pd.read_sql_query(f"SELECT * FROM {TABLE}{where} ORDER BY row_id", self._conn(),
+                                       params=params, chunksize=chunk_rows):
+            yield self._restore(chunk.drop(columns='row_id'))
+
+    def export_file(self, filters: dict, fmt: str = 'csv', compress: bool = False) -> str:
+        empty = self._restore(self._query(f"SELECT * FROM {TABLE} LIMIT 0").drop(columns='row_id'))
+        return cached_export(self.version, filter_key(**filters), fmt, compress,
+                             lambda f: write_chunks(self.iter_rows(filters), empty, fmt, f, compress))
+
+
+    def _similar_index(self) -> SimilarIndex:
+        def build():
+            fields = [f'"{col}"' for col in SPEC_FEATURES if col in self.columns]
+            features = pd.concat(pd.read_sql_query(
+                f"SELECT {', '.join(fields)} FROM {TABLE} ORDER BY row_id", self._conn(), chunksize=CHUNK_ROWS,
+            ), ignore_index=True)
+            return SimilarIndex(features)
+        return cached_similar_index(self.version, build)
+
+    @timed("sql_similar")
+    def similar(self, row_ids, k: int = DEFAULT_K) -> pd.DataFrame:
+        """Схожі моделі для row_ids: source, rank, distance + brand/model/price_usd сусіда; індекс = row_id сусіда."""
+        row_ids = tuple(int(r) for r in row_ids)
+
+        def compute():
+            ids = np.array([r for r in row_ids if 0 <= r < self.rows], dtype=np.intp)
+            pairs = neighbor_frame(ids, *self._similar_index().query(ids, k))
+            wanted = sorted(set(pairs['neighbor'].tolist()))
+            found = self._query(
+                f"SELECT row_id, brand, model, price_usd FROM {TABLE} WHERE row_id IN ({','.join('?' * len(wanted))})",
+                wanted,
+            ).set_index('row_id').rename_axis(None)
+            found = found.reindex(pairs['neighbor'].to_numpy())
+            return pd.concat([pairs.drop(columns='neighbor').set_index(found.index), found], axis=1)
+        return RESULT_CACHE.get_or_compute(self.version, 'similar', (row_ids, int(k)), compute)
+
+
+_catalogs: Dict[str, SQLiteCatalog] = {}
+
+
+def open_sqlite_catalog(path: str, keep: str = "cheapest") -> Optional[SQLiteCatalog]:
+    """SQLiteCatalog для path (база будується при першому виклику); None при помилці."""
+    try:
+        db, version = build_database(path, keep)
+    except Exception:
+        logger.exception("Error building SQLite catalog for %s", path)
+        return None
+    catalog = _catalogs.get(db)
+    if catalog is None:
+        catalog = _catalogs[db] = SQLiteCatalog(db, version)
+    return catalog
@@ -0,0 +1,167 @@
+"""
+Збирання локальних мініатюр для карток каталогу.
+Джерела — зображення з колонок thumbnail/image_list (файл шукаємо в images/ за іменем),
+результат — WebP під розмір картки в static/thumbs/<хеш>.webp + manifest.json.
+Варіанти генеруються паралельно (пул процесів) і лише для змінених джерел.
+Запуск: python -m src.thumbnails data/sample_laptops.csv
+Роздача: Streamlit static serving (.streamlit/config.toml), URL app/static/thumbs/<файл>.
+"""
+import hashlib
+import json
+import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Optional, Tuple
+from urllib.parse import unquote, urlparse
+
+import pandas as pd
+
+from src.data_processing import load_data
+
+logger = logging.getLogger(__name__)
+
+SOURCE_DIR = "images"
+OUTPUT_DIR = os.path.join("static", "thumbs")
+MANIFEST_NAME = "manifest.json"
+STATIC_URL = "app/static/thumbs"
+# картка 220px заввишки — беремо ~2x для HiDPI
+THUMB_SIZE = (480, 440)
+IMAGE_EXTS = ('.png', '.jpg', '.jpeg', '.webp')
+WEBP_QUALITY = 80
+
+_manifest_cache: Dict[str, Tuple[float, Dict[str, str]]] = {}
+
+
+def source_name(ref: str) -> str:
+    """Ім'я файлу з URL або шляху ('' якщо не визначити)."""
+    if not isinstance(ref, str) or not ref.strip():
+        return ""
+    path = urlparse(ref.strip().replace('[:]//', '://')).path
+    return unquote(os.path.basename(path))
+
+
+def _file_sha1(path: str) -> str:
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _render_variant(job: Tuple[str, str]) -> Tuple[int, int]:
+    """Виконується в дочірньому процесі: resize + WebP."""
+    from PIL import Image
+
+    src_path, out_path = job
+    with Image.open(src_path) as img:
+        img = img.convert('RGBA' if img.mode in ('RGBA', 'LA', 'P') else 'RGB')
+        img.thumbnail(THUMB_SIZE, Image.LANCZOS)
+        tmp = out_path + ".tmp"
+        img.save(tmp, format='WEBP', quality=WEBP_QUALITY, method=6)
+        os.replace(tmp, out_path)
+        return img.size
+
+
+def read_manifest(output_dir: str = OUTPUT_DIR) -> dict:
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"images": {}}
+
+
+def build_thumbnails(refs: Iterable[str], source_dir: str = SOURCE_DIR, output_dir: str = OUTPUT_DIR,
+                     workers: Optional[int] = None) -> dict:
+    """Генерує відсутні/застарілі варіанти для refs і оновлює manifest. Повертає manifest."""
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = read_manifest(output_dir)
+    images = manifest.setdefault("images", {})
+    params = f"{THUMB_SIZE[0]}x{THUMB_SIZE[1]}q{WEBP_QUALITY}"
+
+    jobs = []
+    for name in sorted({source_name(r) for r in refs} - {""}):
+        src_path = os.path.join(source_dir, name)
+        if not os.path.isfile(src_path):
+            logger.warning("Thumbnail source not found: %s", src_path)
+            continue
+        digest = _file_sha1(src_path)
+        entry = images.get(name)
+        if entry and entry.get("source_sha1") == digest and entry.get("params") == params \
+                and os.path.isfile(os.path.join(output_dir, entry["file"])):
+            continue
+        out_name = hashlib.sha1(f"{digest}|{params}".encode()).hexdigest()[:16] + ".webp"
+        jobs.append((name, digest, (src_path, os.path.join(output_dir, out_name))))
+
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            sizes = list(pool.map(_render_variant, [job for _, _, job in jobs]))
+        for (name, digest, (_, out_path)), (width, height) in zip(jobs, sizes):
+            old = images.get(name, {}).get("file")
+            images[name] = {
+                "source_sha1": digest,
+                "params": params,
+                "file": os.path.basename(out_path),
+                "width": width,
+                "height": height,
+            }
+            if old and old != images[name]["file"] and old not in {e["file"] for e in images.values()}:
+                try:
+                    os.remove(os.path.join(output_dir, old))
+                except OSError:
+                    pass
+        tmp = os.path.join(output_dir, MANIFEST_NAME + ".tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+        os.replace(tmp, os.path.join(output_dir, MANIFEST_NAME))
+    logger.info("Thumbnails: %d regenerated, %d in manifest", len(jobs), len(images))
+    return manifest
+
+
+def _thumbnail_lookup(output_dir: str = OUTPUT_DIR) -> Tuple[float, Dict[str, str]]:
+    """(mtime маніфесту, ім'я джерела -> URL мініатюри); перечитується лише при зміні файлу."""
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return 0.0, {}
+    cached = _manifest_cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached
+    images = read_manifest(output_dir).get("images", {})
+    lookup = {name: f"{STATIC_URL}/{entry['file']}" for name, entry in images.items()}
+    _manifest_cache[path] = (mtime, lookup)
+    return mtime, lookup
+
+
+def thumbnails_version(output_dir: str = OUTPUT_DIR) -> str:
+    """Токен версії маніфесту — для ключів кешу відрендерених карток."""
+    return str(_thumbnail_lookup(output_dir)[0])
+
+
+def local_thumbnails(thumbs: pd.Series, output_dir: str = OUTPUT_DIR) -> pd.Series:
+    """Замінює URL мініатюр на локальні варіанти з маніфесту; без варіанту — лишає оригінал."""
+    _, lookup = _thumbnail_lookup(output_dir)
+    if not lookup or thumbs.empty:
+        return thumbs
+    return thumbs.map(source_name).map(lookup).fillna(thumbs)
+
+
+def _catalog_refs(path: str) -> Iterable[str]:
+    df = load_data(path)
+    if df.empty:
+        return []
+    refs = set(df['thumbnail'])
+    if 'image_list' in df.columns:
+        for lst in df['image_list']:
+            refs.update(lst)
+    return refs
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    if len(sys.argv) > 1:
+        build_thumbnails(_catalog_refs(sys.argv[1]))
+    else:
+        build_thumbnails(n for n in os.listdir(SOURCE_DIR) if n.lower().endswith(IMAGE_EXTS))
@@ -0,0 +1,51 @@
+"""
+Тренди з мемоізацією по (версія датасету, ключ фільтрів, набір метрик).
+Рахує на всьому каталозі або на підмножині рядків (позиції з filter_positions);
+сама агрегація — compute_trends з data_processing, один groupby-прохід.
+Виклик: trends_for(df, positions, key=filter_key(...), metrics=['price_mean', 'ram_mean'])
+"""
+import threading
+from collections import OrderedDict
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.data_cache import dataset_version
+from src.data_processing import DEFAULT_TRENDS, TREND_METRICS, compute_trends
+from src.profiling import timed
+
+MAX_ENTRIES = 64
+
+_memo: "OrderedDict[tuple, pd.DataFrame]" = OrderedDict()
+# src.api викликає trends_for з пулу потоків
+_memo_lock = threading.Lock()
+
+
+@timed("trends_for")
+def trends_for(df: pd.DataFrame, positions: Optional[np.ndarray] = None, key=None,
+               metrics: Optional[List[str]] = None) -> pd.DataFrame:
+    """Тренди для df або його рядків positions.
+       key — ключ фільтрів, з яких отримано positions; без нього результат для підмножини не кешується.
+    """
+    names = tuple(metrics or DEFAULT_TRENDS)
+    version = dataset_version(df)
+    cacheable = bool(version) and (positions is None or key is not None)
+    memo_key = (version, key if positions is not None else None, names)
+    if cacheable:
+        with _memo_lock:
+            if memo_key in _memo:
+                _memo.move_to_end(memo_key)
+                return _memo[memo_key]
+
+    if positions is not None:
+        columns = ['release_year'] + sorted({TREND_METRICS[m][1] for m in names if TREND_METRICS[m][1] in df.columns})
+        df = df[columns].take(positions)
+    result = compute_trends(df, list(names))
+
+    if cacheable:
+        with _memo_lock:
+            _memo[memo_key] = result
+            while len(_memo) > MAX_ENTRIES:
+                _memo.popitem(last=False)
+    return result
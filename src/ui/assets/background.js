@@ -0,0 +1,97 @@
+// Фоновий шар сторінки. Живе на document.body поза деревом Streamlit, тож переживає
+// rerun-и: компонент монтується лише при зміні налаштувань, install() — ідемпотентний.
+// Після встановлення ~3 с міряє інтервали кадрів і повертає їх у Python (frame_stats).
+const BACKGROUND_CSS = __BACKGROUND_CSS__;
+const PROBE_MS = 3000;
+const LONG_FRAME_MS = 50;
+
+const WAVES_SVG = `
+<svg viewBox="0 0 1440 320" preserveAspectRatio="none">
+  <defs><linearGradient id="laptop-bg-wave" x1="0" x2="1">
+    <stop offset="0" stop-color="#00e6ff" stop-opacity="0.85"/>
+    <stop offset="1" stop-color="#7c5cff" stop-opacity="0.85"/>
+  </linearGradient></defs>
+  <path fill="url(#laptop-bg-wave)" d="M0,64L48,96C96,128,192,192,288,218.7C384,245,480,235,576,213.3C672,192,768,160,864,144C960,128,1056,128,1152,149.3C1248,171,1344,213,1392,234.7L1440,256L1440,320L0,320Z"></path>
+</svg>`;
+
+function reducedMotion() {
+  return window.matchMedia('(prefers-reduced-motion: reduce)').matches;
+}
+
+function teardown(state) {
+  if (state.particles) state.particles.stop();
+  if (state.onVisibility) document.removeEventListener('visibilitychange', state.onVisibility);
+  if (state.layer) state.layer.remove();
+}
+
+function install(kind, lowPower) {
+  const doc = document;
+  if (!doc.getElementById('laptop-bg-style')) {
+    const style = doc.createElement('style');
+    style.id = 'laptop-bg-style';
+    style.textContent = BACKGROUND_CSS;
+    doc.head.appendChild(style);
+  }
+  const current = window.__laptopBg;
+  if (current && current.kind === kind && current.lowPower === lowPower) return current;
+  if (current) teardown(current);
+  const state = { kind, lowPower };
+  window.__laptopBg = state;
+  if (kind === 'none') return state;
+
+  const layer = state.layer = doc.createElement('div');
+  layer.id = 'laptop-bg';
+  layer.setAttribute('aria-hidden', 'true');
+  if (kind === 'particles') {
+    const canvas = doc.createElement('canvas');
+    canvas.className = 'laptop-bg-particles';
+    layer.appendChild(canvas);
+    state.particles = createParticles(canvas, { fps: lowPower ? 30 : 60, still: reducedMotion() });
+  } else if (kind === 'waves') {
+    layer.innerHTML = `<div class="laptop-bg-waves">${WAVES_SVG}</div>`;
+  } else {
+    layer.innerHTML = '<div class="laptop-bg-gradient"></div>';
+  }
+  doc.body.prepend(layer);
+
+  if (lowPower) {
+    state.onVisibility = () => {
+      const hidden = doc.visibilityState === 'hidden';
+      layer.classList.toggle('laptop-bg-paused', hidden);
+      if (state.particles) hidden ? state.particles.pause() : state.particles.resume();
+    };
+    doc.addEventListener('visibilitychange', state.onVisibility);
+    state.onVisibility();
+  }
+  return state;
+}
+
+function probeFrames(kind, report) {
+  const deltas = [];
+  let start = 0, prev = 0, raf = 0;
+  function tick(now) {
+    if (!start) start = prev = now;
+    else { deltas.push(now - prev); prev = now; }
+    if (now - start < PROBE_MS) { raf = requestAnimationFrame(tick); return; }
+    const sorted = deltas.slice().sort((a, b) => a - b);
+    const mean = deltas.reduce((a, b) => a + b, 0) / Math.max(deltas.length, 1);
+    report({
+      kind,
+      frames: deltas.length,
+      mean_ms: Math.round(mean * 100) / 100,
+      p95_ms: Math.round((sorted[Math.floor(sorted.length * 0.95)] || 0) * 100) / 100,
+      long_frames: deltas.filter((d) => d > LONG_FRAME_MS).length,
+      reduced_motion: reducedMotion(),
+      hidden: document.visibilityState === 'hidden',
+    });
+  }
+  raf = requestAnimationFrame(tick);
+  return () => cancelAnimationFrame(raf);
+}
+
+export default function (component) {
+  const { data, setStateValue } = component;
+  install(data.kind, Boolean(data.low_power));
+  if (!data.probe) return undefined;
+  return probeFrames(data.kind, (stats) => setStateValue('frame_stats', stats));
+}
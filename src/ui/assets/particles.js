@@ -0,0 +1,66 @@
+// Легка система частинок на canvas 2D (замість tsParticles з CDN).
+// createParticles(canvas, {fps, still}) -> {pause, resume, stop}
+function createParticles(canvas, options) {
+  const COLORS = ['#00e6ff', '#7c5cff', '#00ff9c'];
+  const COUNT = 40, SPEED = 0.6, OPACITY = 0.32;
+  const ctx = canvas.getContext('2d');
+  const frameMs = 1000 / (options.fps || 60);
+  let width = 0, height = 0, raf = 0, last = 0, running = false;
+
+  function resize() {
+    const ratio = Math.min(window.devicePixelRatio || 1, 2);
+    width = window.innerWidth; height = window.innerHeight;
+    canvas.width = width * ratio; canvas.height = height * ratio;
+    ctx.setTransform(ratio, 0, 0, ratio, 0, 0);
+  }
+  resize();
+
+  const particles = Array.from({ length: COUNT }, (_, i) => {
+    const angle = Math.random() * Math.PI * 2;
+    return {
+      x: Math.random() * width, y: Math.random() * height, r: 2 + Math.random() * 4,
+      vx: Math.cos(angle) * SPEED, vy: Math.sin(angle) * SPEED, color: COLORS[i % COLORS.length],
+    };
+  });
+
+  function draw() {
+    ctx.clearRect(0, 0, width, height);
+    ctx.globalAlpha = OPACITY;
+    for (const p of particles) {
+      ctx.fillStyle = p.color;
+      ctx.beginPath();
+      ctx.arc(p.x, p.y, p.r, 0, Math.PI * 2);
+      ctx.fill();
+    }
+  }
+
+  function step(now) {
+    if (!running) return;
+    raf = requestAnimationFrame(step);
+    if (now - last < frameMs - 1) return;
+    // крок у "кадрах по 60 fps", щоб швидкість не залежала від ліміту
+    const dt = last ? Math.min((now - last) / 16.67, 4) : 1;
+    last = now;
+    for (const p of particles) {
+      p.x += p.vx * dt; p.y += p.vy * dt;
+      if (p.x < p.r || p.x > width - p.r) { p.vx = -p.vx; p.x = Math.min(Math.max(p.x, p.r), width - p.r); }
+      if (p.y < p.r || p.y > height - p.r) { p.vy = -p.vy; p.y = Math.min(Math.max(p.y, p.r), height - p.r); }
+    }
+    draw();
+  }
+
+  function onResize() { resize(); draw(); }
+  window.addEventListener('resize', onResize);
+
+  const api = {
+    pause() { running = false; cancelAnimationFrame(raf); },
+    resume() {
+      if (running || options.still) return;
+      running = true; last = 0; raf = requestAnimationFrame(step);
+    },
+    stop() { api.pause(); window.removeEventListener('resize', onResize); },
+  };
+  draw();
+  api.resume();
+  return api;
+}
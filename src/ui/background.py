@@ -1,139 +1,89 @@
 """
 Компонент для фонового анімаційного градієнта / хвиль / частинок.
-Виклик: render_background(kind='gradient', enabled=True)
+Фон — шар на document.body поза деревом Streamlit (src/ui/assets/background.js), тож він
+переживає rerun-и: компонент монтується лише коли змінились налаштування (або ще чекаємо
+заміру кадрів), а не на кожен rerun. Частинки — локальний canvas-скрипт (без CDN).
+prefers-reduced-motion вимикає анімацію; low_power — 30 fps для частинок і пауза всього
+фону, поки вкладка прихована. Після встановлення браузер ~3 с міряє інтервали кадрів
+і повертає їх (st.session_state.bg_frame_stats[kind], подія 'bg_frames' у laptop_trends.timing).
+Виклик: render_background(kind='gradient', enabled=True, low_power=False)
 kind: 'gradient' | 'waves' | 'particles'
 """
+import json
+import logging
+import os
+from functools import lru_cache
+from typing import Optional
+
 import streamlit as st
-import streamlit.components.v1 as components
 
-def _base_container_css():
-    # робимо головний контейнер вище за фон (щоб фон не накривав UI)
-    return """
-    <style>
-    /* Забезпечуємо, що основний Streamlit-контент завжди над фоном */
-    [data-testid="stAppViewContainer"] > .main {
-      position: relative !important;
-      z-index: 1 !important;
-      background: transparent !important;
-    }
-    </style>
-    """
+from src.profiling import timing_logger
 
-def _gradient_html():
-    return _base_container_css() + """
-    <style>
-    .bg-animated {
-      position: fixed;
-      inset: 0;
-      z-index: 0;              /* 0 — під основним контентом з z-index:1 */
-      pointer-events: none;
-      background: linear-gradient(120deg, #00e6ff, #7c5cff, #00ff9c);
-      background-size: 600% 600%;
-      filter: blur(36px) saturate(120%);
-      opacity: 0.22;
-      animation: bgGradient 20s ease infinite;
-    }
-    @keyframes bgGradient {
-      0% { background-position: 0% 50%; }
-      50% { background-position: 100% 50%; }
-      100% { background-position: 0% 50%; }
-    }
-    </style>
-    <div class="bg-animated" aria-hidden="true"></div>
-    """
+logger = logging.getLogger(__name__)
 
-def _waves_html():
-    return _base_container_css() + """
-    <style>
-    .bg-waves { position: fixed; left:0; right:0; bottom:0; height:28vh; z-index:0; opacity:0.34; pointer-events:none; }
-    .wave path { transform-origin: 50% 50%; animation: waveMove 8s linear infinite; }
-    @keyframes waveMove { 0%{transform:translateX(0)}50%{transform:translateX(-8%)}100%{transform:translateX(0)} }
-    </style>
-    <div class="bg-waves" aria-hidden="true">
-      <svg class="wave" viewBox="0 0 1440 320" preserveAspectRatio="none" width="100%" height="100%">
-        <defs>
-          <linearGradient id="g1" x1="0" x2="1">
-            <stop offset="0" stop-color="#00e6ff" stop-opacity="0.85"/>
-            <stop offset="1" stop-color="#7c5cff" stop-opacity="0.85"/>
-          </linearGradient>
-        </defs>
-        <path fill="url(#g1)" d="M0,64L48,96C96,128,192,192,288,218.7C384,245,480,235,576,213.3C672,192,768,160,864,144C960,128,1056,128,1152,149.3C1248,171,1344,213,1392,234.7L1440,256L1440,320L0,320Z"></path>
-      </svg>
-    </div>
-    """
+KINDS = ('gradient', 'waves', 'particles')
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets')
+COMPONENT_NAME = "laptop_background"
+
+_FALLBACK_CSS = """
+<style>
+[data-testid="stAppViewContainer"] > .main { position: relative !important; z-index: 1 !important; background: transparent !important; }
+</style>
+"""
+
+
+def _asset(name: str) -> str:
+    with open(os.path.join(ASSETS_DIR, name), encoding='utf-8') as f:
+        return f.read()
+
+
+@lru_cache(maxsize=1)
+def _component():
+    """Реєстрація компонента — один раз на процес; CSS вшитий у JS і вставляється в <head> один раз."""
+    js = _asset('particles.js') + "\n" + _asset('background.js').replace(
+        '__BACKGROUND_CSS__', json.dumps(_asset('background.css')))
+    return st.components.v2.component(COMPONENT_NAME, js=js)
+
+
+def _store_frame_stats(stats: dict) -> None:
+    kind = stats.get('kind', '')
+    st.session_state.setdefault('bg_frame_stats', {})[kind] = stats
+    timing_logger.info(json.dumps({'event': 'bg_frames', 'session': st.session_state.get('session_id', ''), **stats}))
 
-def _particles_html():
-    # uses tsParticles CDN; components.html вставляє JS. У випадку помилки CDN - фон не впливатиме.
-    # Оскільки components.html чіпляє JS в окремому контексті, також додаємо базовий CSS для z-index.
-    base = _base_container_css()
-    js = """
-    <div id="tsparticles" style="position:fixed; inset:0; z-index:0; pointer-events:none;" aria-hidden="true"></div>
-    <script>
-    // Охайна ініціалізація: якщо tsParticles недоступний, мовчазно пропускаємо
-    (function(){
-      function loadScript(url, cb){
-        var s = document.createElement('script'); s.src = url; s.onload = cb; s.onerror = cb;
-        document.head.appendChild(s);
-      }
-      if (window && window.tsParticles){
-        try { window.tsParticles.load('tsparticles', {
-          fpsLimit: 60,
-          background: { color: { value: "transparent" } },
-          particles: {
-            number: { value: 40 },
-            color: { value: ["#00e6ff", "#7c5cff", "#00ff9c"] },
-            shape: { type: "circle" },
-            opacity: { value: 0.32 },
-            size: { value: { min: 2, max: 6 } },
-            move: { enable: true, speed: 0.6, outModes: "bounce" }
-          },
-          interactivity: { detectsOn: "window", events: { onHover: { enable: false } } }
-        }); } catch(e){ console.warn('tsParticles init failed', e); }
-      } else {
-        // якщо бібліотеки немає, завантажуємо її і потім ініціалізуємо
-        loadScript('https://cdn.jsdelivr.net/npm/tsparticles@2/tsparticles.min.js', function(){
-          if (window && window.tsParticles){
-            try { window.tsParticles.load('tsparticles', {
-              fpsLimit: 60,
-              background: { color: { value: "transparent" } },
-              particles: {
-                number: { value: 40 },
-                color: { value: ["#00e6ff", "#7c5cff", "#00ff9c"] },
-                shape: { type: "circle" },
-                opacity: { value: 0.32 },
-                size: { value: { min: 2, max: 6 } },
-                move: { enable: true, speed: 0.6, outModes: "bounce" }
-              },
-              interactivity: { detectsOn: "window", events: { onHover: { enable: false } } }
-            }); } catch(e){ console.warn('tsParticles init failed', e); }
-          }
-        });
-      }
-    })();
-    </script>
-    """
-    return base + js
 
-def render_background(kind: str = "gradient", enabled: bool = True):
+def render_background(kind: str = "gradient", enabled: bool = True, low_power: bool = False,
+                      probe: bool = True) -> Optional[dict]:
     """
     Відображає фон. Викликай у app.py перед рендером основного контенту.
-    kind: 'gradient' | 'waves' | 'particles'
-    enabled: bool
+    kind: 'gradient' | 'waves' | 'particles' (невідомий -> gradient)
+    enabled: False прибирає вже встановлений шар
+    low_power: пауза анімації в прихованій вкладці, частинки — 30 fps
+    probe: заміряти кадри після встановлення (раз на kind + low_power за сесію)
+    Повертає останній замір кадрів для kind (або None, поки його немає).
     """
-    if not enabled:
-        # якщо вимкнуто — нічого не рендеримо, основний контейнер лишається звичайним
-        return
+    kind = kind if kind in KINDS else 'gradient'
+    config = (kind if enabled else 'none', bool(low_power))
+    stats = st.session_state.setdefault('bg_frame_stats', {})
+    probing = probe and enabled and config not in st.session_state.setdefault('bg_probed', set())
+    if st.session_state.get('bg_installed') == config and not probing:
+        return stats.get(kind)
 
-    if kind == "gradient":
-        st.markdown(_gradient_html(), unsafe_allow_html=True)
-    elif kind == "waves":
-        st.markdown(_waves_html(), unsafe_allow_html=True)
-    elif kind == "particles":
-        # для particles використовуємо components.html, але також вставляємо базовий CSS щоб уникнути блідої "білої" заливки
-        try:
-            components.html(_particles_html(), height=0)
-        except Exception:
-            # у випадку проблем із components — fallback на градієнт
-            st.markdown(_gradient_html(), unsafe_allow_html=True)
-    else:
-        st.markdown(_gradient_html(), unsafe_allow_html=True)
+    try:
+        result = _component()(
+            key=f"laptop_background_{config[0]}_{int(config[1])}",
+            data={'kind': config[0], 'low_power': config[1], 'probe': probing},
+            default={'frame_stats': None},
+            width='stretch', height=0,
+            on_frame_stats_change=lambda: None,
+        )
+    except Exception:
+        # без компонента — лише статичний фон (головний контейнер над ним)
+        logger.exception("background component failed")
+        st.markdown(_FALLBACK_CSS, unsafe_allow_html=True)
+        return None
+    st.session_state.bg_installed = config
+    frame_stats = result.get('frame_stats') if result is not None else None
+    if frame_stats:
+        _store_frame_stats({**frame_stats, 'low_power': config[1]})
+        st.session_state.bg_probed.add(config)
+    return stats.get(kind)
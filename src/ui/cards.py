@@ -0,0 +1,127 @@
+"""
+Пакетний рендер сітки карток каталогу.
+HTML сторінки будується з колонок одним векторизованим проходом (без iterrows)
+і віддається одним st.markdown; "Детальніше" — нативний <details>, без віджета на картку.
+Готові фрагменти карток кешуються по (версія датасету, id рядка, стан деталей, чи є схожі).
+Схожі моделі (catalog.similar) — список у "Детальніше", HTML з similar_html.
+Виклик: st.markdown(render_card_grid(page_df, version, expanded, similar_html(sim)), unsafe_allow_html=True)
+"""
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.profiling import timed
+
+PLACEHOLDER_IMG = "https://via.placeholder.com/600x600?text=No+image"
+MAX_FRAGMENTS = 5000
+
+_fragments: "OrderedDict[Tuple[str, object, bool, bool], str]" = OrderedDict()
+
+
+def _escape(series: pd.Series) -> pd.Series:
+    s = series.astype(str)
+    for ch, entity in (('&', '&amp;'), ('<', '&lt;'), ('>', '&gt;'), ('"', '&quot;')):
+        s = s.str.replace(ch, entity, regex=False)
+    return s
+
+
+def _text(df: pd.DataFrame, col: str, default: str = '—') -> pd.Series:
+    if col not in df.columns:
+        return pd.Series(default, index=df.index, dtype=object)
+    return _escape(df[col])
+
+
+def similar_html(similar: pd.DataFrame) -> pd.Series:
+    """Блок "Схожі моделі" для кожного source з таблиці catalog.similar (Series за source)."""
+    if similar.empty:
+        return pd.Series(dtype=object)
+    price = pd.Series(np.char.mod('%.0f', similar['price_usd'].to_numpy(dtype='float64')), index=similar.index)
+    items = '<li>' + _text(similar, 'brand', '') + ' ' + _text(similar, 'model', '') + ' — $' + price + '</li>'
+    lists = items.groupby(similar['source'].to_numpy(), sort=False).agg(''.join)
+    return '<b>🧭 Схожі моделі:</b><ul class="similar-list">' + lists + '</ul>'
+
+
+def build_card_fragments(df: pd.DataFrame, expanded: bool = False, similar: Optional[pd.Series] = None) -> pd.Series:
+    """HTML картки для кожного рядка df (Series з тим самим індексом).
+       similar — HTML схожих моделей за id рядка (similar_html), None — без блоку.
+    """
+    if df.empty:
+        return pd.Series(dtype=object)
+
+    thumb = df['thumbnail'].fillna('').astype(str).str.strip() if 'thumbnail' in df.columns else pd.Series('', index=df.index)
+    thumb = thumb.str.replace('[:]//', '://', regex=False)
+    thumb = _escape(thumb.where(thumb != '', PLACEHOLDER_IMG))
+
+    brand = _text(df, 'brand', '')
+    model = _text(df, 'model', '')
+    title = brand + ' ' + model
+    screen = _text(df, 'screen_size_in')
+    display_type = _text(df, 'display_type')
+    cpu = _text(df, 'cpu')
+    price = _text(df, 'price_usd')
+    code = pd.Series('', index=df.index, dtype=object)
+    for col in ('sku', 'code'):
+        if col in df.columns:
+            value = _escape(df[col].fillna(''))
+            code = value.where(value != '', code)
+
+    if 'price_usd' in df.columns:
+        price_rounded = pd.Series(np.char.mod('%.0f', df['price_usd'].to_numpy(dtype='float64')), index=df.index)
+    else:
+        price_rounded = price
+    if 'url' in df.columns:
+        url = df['url'].fillna('').astype(str).str.strip()
+        url_html = ('<b>🔗 <a href="' + _escape(url) + '" target="_blank" rel="noopener noreferrer">Сторінка товару</a></b>')
+        url_html = url_html.where(url != '', '<b>🔗 Немає посилання</b>')
+    else:
+        url_html = '<b>🔗 Немає посилання</b>'
+
+    details = (
+        '<details class="card-details"' + (' open' if expanded else '') + '><summary>🔍 Детальніше</summary>'
+        '<div class="details-box">'
+        '<b>💰 Ціна:</b> $' + price_rounded + '<br>'
+        '<b>📺 Екран:</b> ' + screen + '" ' + display_type + '<br>'
+        '<b>🧠 Процесор:</b> ' + cpu + '<br>'
+        '<b>🔋 Батарея:</b> ' + _text(df, 'battery_wh') + ' Wh<br>'
+        '<b>🧮 RAM:</b> ' + _text(df, 'ram_gb') + ' GB, SSD: ' + _text(df, 'storage_gb') + ' GB<br>'
+        '<b>📅 Рік:</b> ' + _text(df, 'release_year') + '<br>'
+        + url_html
+        + (similar.reindex(df.index).fillna('') if similar is not None else '')
+        + '</div></details>'
+    )
+    return (
+        '<div class="card" role="article">'
+        '<img src="' + thumb + '" class="thumb" alt="' + title + '" loading="lazy" '
+        "onerror=\"this.onerror=null;this.src='" + PLACEHOLDER_IMG + "';\" />"
+        '<div class="title">' + title + '</div>'
+        '<div class="meta">' + screen + '" • ' + display_type + ' • ' + cpu + '</div>'
+        '<div class="small-note">Код: ' + code + '</div>'
+        '<div class="price-row"><div class="price">$' + price + '</div></div>'
+        + details + '</div>'
+    )
+
+
+@timed("render_card_grid")
+def render_card_grid(page_df: pd.DataFrame, version: str = '', expanded: bool = False,
+                     similar: Optional[pd.Series] = None) -> str:
+    """HTML усієї сторінки карток одним блоком; id рядка — індекс page_df."""
+    if page_df.empty:
+        return '<div class="empty-state">Немає моделей за обраними фільтрами</div>'
+    if not version:
+        return '<div class="card-grid">' + ''.join(build_card_fragments(page_df, expanded, similar)) + '</div>'
+
+    keys = [(version, row_id, expanded, similar is not None) for row_id in page_df.index]
+    missing = [i for i, key in enumerate(keys) if key not in _fragments]
+    if missing:
+        built = build_card_fragments(page_df.iloc[missing], expanded, similar)
+        for i, html in zip(missing, built):
+            _fragments[keys[i]] = html
+    parts = []
+    for key in keys:
+        _fragments.move_to_end(key)
+        parts.append(_fragments[key])
+    while len(_fragments) > MAX_FRAGMENTS:
+        _fragments.popitem(last=False)
+    return '<div class="card-grid">' + ''.join(parts) + '</div>'
@@ -0,0 +1,35 @@
+"""
+Фігури Plotly для вкладки розподілів з пейлоадів src.distribution.
+Точки — go.Scattergl (WebGL), біни — go.Heatmap по центрах бінів (порожні — прозорі).
+Виклик: st.plotly_chart(distribution_figure(payload, 'price_usd', 'battery_wh'), use_container_width=True)
+"""
+import numpy as np
+import plotly.graph_objects as go
+
+from src.distribution import DISTRIBUTION_AXES
+
+
+def distribution_figure(payload: dict, x: str, y: str) -> go.Figure:
+    x_title, y_title = DISTRIBUTION_AXES.get(x, x), DISTRIBUTION_AXES.get(y, y)
+    if payload['mode'] == 'points':
+        trace = go.Scattergl(
+            x=payload['x'], y=payload['y'], mode='markers', text=payload['text'],
+            marker=dict(size=6, opacity=0.6, color='#7c5cff'),
+            hovertemplate=f"%{{text}}<br>{x_title}: %{{x}}<br>{y_title}: %{{y}}<extra></extra>",
+        )
+    else:
+        x_edges, y_edges = payload['x_edges'], payload['y_edges']
+        # heatmap: рядки — y, стовпці — x; нулі -> NaN, щоб порожні біни не зафарбовувались
+        counts = payload['counts'].T.astype('float64')
+        counts[counts == 0] = np.nan
+        trace = go.Heatmap(
+            x=(x_edges[:-1] + x_edges[1:]) / 2, y=(y_edges[:-1] + y_edges[1:]) / 2, z=counts,
+            colorscale='Viridis', colorbar=dict(title='Моделей'), hoverongaps=False,
+            hovertemplate=f"{x_title}: %{{x:.4g}}<br>{y_title}: %{{y:.4g}}<br>Моделей: %{{z}}<extra></extra>",
+        )
+    fig = go.Figure(trace)
+    fig.update_layout(
+        template='plotly_white', xaxis_title=x_title, yaxis_title=y_title,
+        margin=dict(l=20, r=20, t=40, b=20), font=dict(size=14),
+    )
+    return fig
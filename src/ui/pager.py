@@ -0,0 +1,40 @@
+"""
+Пагінатор каталогу: кнопки вперед/назад, номер сторінки і перехід на сторінку.
+Стан — у st.session_state[<key>_page]; при зміні reset_on (ключ фільтрів/сортування)
+сторінка скидається на першу, а номер завжди обмежений кількістю сторінок.
+Виклик: page, offset = pager(total, page_size, key="catalog", reset_on=(filter_key(...), sort))
+"""
+import math
+from typing import Hashable, Tuple
+
+import streamlit as st
+
+
+def pager(total: int, page_size: int, key: str = "catalog", reset_on: Hashable = None) -> Tuple[int, int]:
+    """(номер сторінки з 1, зсув першого рядка) для total рядків по page_size."""
+    page_key, jump_key, reset_key = f"{key}_page", f"{key}_jump", f"{key}_reset_on"
+    pages = max(1, math.ceil(total / page_size))
+    if st.session_state.get(reset_key) != reset_on:
+        st.session_state[reset_key] = reset_on
+        st.session_state[page_key] = 1
+    page = min(max(1, int(st.session_state.get(page_key, 1))), pages)
+    st.session_state[page_key] = page
+    # віджет ще не створений у цьому rerun-і — можна синхронізувати його значення
+    st.session_state[jump_key] = page
+
+    def _go(delta: int) -> None:
+        st.session_state[page_key] = min(max(1, st.session_state[page_key] + delta), pages)
+
+    def _jump() -> None:
+        st.session_state[page_key] = int(st.session_state[jump_key])
+
+    pc1, pc2, pc3, pc4 = st.columns([1, 3, 1, 3])
+    with pc1:
+        st.button("⬅️ Ліво", key=f"{key}_prev", on_click=_go, args=(-1,), disabled=page <= 1)
+    with pc2:
+        st.markdown(f"**Сторінка {page} / {pages}**")
+    with pc3:
+        st.button("Право ➡️", key=f"{key}_next", on_click=_go, args=(1,), disabled=page >= pages)
+    with pc4:
+        st.number_input("Перейти на стор.", min_value=1, max_value=pages, step=1, key=jump_key, on_change=_jump)
+    return page, (page - 1) * page_size
@@ -0,0 +1,58 @@
+"""
+Локальний HTTP-сервер-замінник для src.scraper: віддає сторінки з tests/fixtures/scraper
+з ETag і відповідає 304 на If-None-Match, тож скрейпер тестується без мережі.
+Запуск: python -m pytest tests
+"""
+import hashlib
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'scraper')
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        path = os.path.join(FIXTURES_DIR, os.path.basename(self.path.split('?')[0]))
+        if not os.path.isfile(path):
+            self._reply(404)
+            return
+        with open(path, 'rb') as f:
+            body = f.read()
+        etag = '"%s"' % hashlib.sha1(body).hexdigest()
+        if self.headers.get('If-None-Match') == etag:
+            self._reply(304, etag=etag)
+        else:
+            self._reply(200, body, etag)
+
+    def _reply(self, status: int, body: bytes = b'', etag: str = None):
+        self.server.statuses.append((self.path, status))
+        self.send_response(status)
+        if etag:
+            self.send_header('ETag', etag)
+        if status != 304:
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if status != 304:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def fixture_server():
+    """Сервер на вільному порту; .base — http://127.0.0.1:<port>, .statuses — [(шлях, статус)]."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FixtureHandler)
+    server.statuses = []
+    server.base = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,64 @@
+import http.client
+import json
+import os
+import threading
+
+import pytest
+
+import src.api as api
+
+SAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "sample_laptops.csv")
+
+
+@pytest.fixture
+def server(monkeypatch):
+    """PooledHTTPServer на вільному порту над прикладом каталогу."""
+    monkeypatch.setattr(api, 'DATA_PATH', SAMPLE)
+    monkeypatch.setattr(api, 'BACKEND', 'pandas')
+    httpd = api.PooledHTTPServer(('127.0.0.1', 0), api.ApiHandler, workers=4)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _get(server, path, headers=None):
+    conn = http.client.HTTPConnection(*server.server_address[:2], timeout=30)
+    try:
+        conn.request('GET', path, headers=headers or {})
+        response = conn.getresponse()
+        return response.status, dict(response.getheaders()), response.read()
+    finally:
+        conn.close()
+
+
+def test_catalog_200_with_etag_then_304(server):
+    path = "/api/catalog?brand=Asus&brand=Dell&price_max=2500&sort=price_usd"
+    status, headers, body = _get(server, path)
+    assert status == 200
+    assert headers['ETag'].startswith('"')
+    payload = json.loads(body)
+    assert payload['items'] and all(item['brand'] in ('Asus', 'Dell') for item in payload['items'])
+
+    status, revalidated, body = _get(server, path, {'If-None-Match': headers['ETag']})
+    assert status == 304
+    assert body == b''
+    assert revalidated['ETag'] == headers['ETag']
+
+    # інші фільтри — інший ETag, старий не підходить
+    status, other, _ = _get(server, "/api/catalog?brand=Asus", {'If-None-Match': headers['ETag']})
+    assert status == 200
+    assert other['ETag'] != headers['ETag']
+
+
+def test_bad_number_is_400(server):
+    status, _, body = _get(server, "/api/summary?price_min=abc")
+    assert status == 400
+    assert 'price_min' in json.loads(body)['error']
+
+
+def test_unknown_endpoint_is_404(server):
+    status, _, body = _get(server, "/api/nope")
+    assert status == 404
+    assert '/api/catalog' in json.loads(body)['endpoints']
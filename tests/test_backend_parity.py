@@ -0,0 +1,110 @@
+"""SQLite-бекенд має повертати те саме, що PandasCatalog, на тому самому каталозі."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic_catalog import generate_catalog
+from src.backend import open_catalog
+from src.catalog_index import SORT_KEYS
+from src.data_processing import TREND_METRICS
+from src.search import RELEVANCE
+
+FILTERS = [
+    {},
+    {'brands': ['Asus', 'Dell', 'Lenovo'], 'price_range': (600.0, 2400.0)},
+    {'screen_range': (14.0, 16.0), 'ai_cpu': "Із AI"},
+    {'facets': {'panel_type': ['OLED']}, 'ai_cpu': "Без AI"},
+    {'query': "zenbook", 'price_range': (0.0, 2000.0)},
+]
+PAGE = 12
+
+
+@pytest.fixture(scope="module")
+def catalogs(tmp_path_factory):
+    # більше за SCATTER_MAX_POINTS — розподіл іде гістограмою
+    path = str(tmp_path_factory.mktemp("parity") / "catalog.csv")
+    generate_catalog(12000, seed=7).to_csv(path, index=False)
+    return open_catalog(path, backend='pandas'), open_catalog(path, backend='sqlite')
+
+
+def _filters(extra: dict) -> dict:
+    return {'brands': None, 'price_range': None, 'screen_range': None, 'ai_cpu': "Усі", 'facets': None,
+            'query': None, **extra}
+
+
+@pytest.mark.parametrize("extra", FILTERS)
+def test_summary(catalogs, extra):
+    pandas_catalog, sqlite_catalog = catalogs
+    expected = pandas_catalog.summary(_filters(extra))
+    actual = sqlite_catalog.summary(_filters(extra))
+    assert actual[0] == expected[0] > 0
+    assert actual[1:] == pytest.approx(expected[1:], rel=1e-9)
+
+
+@pytest.mark.parametrize("extra", FILTERS)
+@pytest.mark.parametrize("sort", [(col, desc) for col in SORT_KEYS for desc in (False, True)])
+def test_pages_and_keyset_cursors(catalogs, extra, sort):
+    pandas_catalog, sqlite_catalog = catalogs
+    filters = _filters(extra)
+    # сторінки підряд — SQLite іде keyset-курсором від кінця попередньої
+    for offset in range(0, 5 * PAGE, PAGE):
+        expected = pandas_catalog.page(filters, offset, PAGE, sort)
+        actual = sqlite_catalog.page(filters, offset, PAGE, sort)
+        assert actual.index.tolist() == expected.index.tolist(), (sort, offset)
+        np.testing.assert_allclose(actual['price_usd'].to_numpy(dtype='float64'),
+                                   expected['price_usd'].to_numpy(dtype='float64'))
+    # стрибок на далеку сторінку — без курсору (OFFSET)
+    far = 40 * PAGE
+    assert (sqlite_catalog.page(filters, far, PAGE, sort).index.tolist()
+            == pandas_catalog.page(filters, far, PAGE, sort).index.tolist())
+
+
+@pytest.mark.parametrize("query", ["zenbook", "macbook air", "ryzen 7 oled", "thinkpd"])
+def test_relevance_pages(catalogs, query):
+    pandas_catalog, sqlite_catalog = catalogs
+    filters = _filters({'query': query})
+    for offset in (0, PAGE, 3 * PAGE):
+        expected = pandas_catalog.page(filters, offset, PAGE, (RELEVANCE, False))
+        actual = sqlite_catalog.page(filters, offset, PAGE, (RELEVANCE, False))
+        assert len(expected) or offset
+        assert actual.index.tolist() == expected.index.tolist(), (query, offset)
+
+
+@pytest.mark.parametrize("extra", FILTERS)
+def test_brand_share(catalogs, extra):
+    pandas_catalog, sqlite_catalog = catalogs
+    expected = pandas_catalog.brand_share(_filters(extra)).reset_index(drop=True)
+    actual = sqlite_catalog.brand_share(_filters(extra)).reset_index(drop=True)
+    assert actual['brand'].astype(str).tolist() == expected['brand'].astype(str).tolist()
+    assert actual['count'].tolist() == expected['count'].tolist()
+
+
+@pytest.mark.parametrize("extra", FILTERS)
+def test_trends(catalogs, extra):
+    pandas_catalog, sqlite_catalog = catalogs
+    metrics = list(TREND_METRICS)  # разом із медіаною і 90-м перцентилем
+    expected = pandas_catalog.trends(_filters(extra), metrics)
+    actual = sqlite_catalog.trends(_filters(extra), metrics)
+    key = ['metric', 'year']
+    expected = expected.astype({'year': 'int64'}).sort_values(key).reset_index(drop=True)
+    actual = actual.astype({'year': 'int64'}).sort_values(key).reset_index(drop=True)
+    pd.testing.assert_frame_equal(actual[key + ['value']], expected[key + ['value']], check_dtype=False, rtol=1e-9)
+
+
+@pytest.mark.parametrize("extra", FILTERS)
+@pytest.mark.parametrize("x, y", [('price_usd', 'battery_wh'), ('release_year', 'ram_gb'),
+                                  ('screen_size_in', 'ram_gb')])
+@pytest.mark.parametrize("bins", [10, 20, 40, 60, 80])
+def test_distribution(catalogs, extra, x, y, bins):
+    pandas_catalog, sqlite_catalog = catalogs
+    expected = pandas_catalog.distribution(_filters(extra), x, y, bins)
+    actual = sqlite_catalog.distribution(_filters(extra), x, y, bins)
+    assert actual['mode'] == expected['mode']
+    assert actual['n'] == expected['n']
+    if expected['mode'] == 'bins':
+        np.testing.assert_array_equal(actual['x_edges'], expected['x_edges'])
+        np.testing.assert_array_equal(actual['y_edges'], expected['y_edges'])
+        np.testing.assert_array_equal(actual['counts'], expected['counts'])
+    else:
+        np.testing.assert_array_equal(actual['x'], expected['x'])
+        np.testing.assert_array_equal(actual['y'], expected['y'])
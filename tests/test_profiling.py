@@ -0,0 +1,34 @@
+import threading
+import tracemalloc
+
+from src.profiling import begin_trace, finish_trace, span
+
+
+def test_tracemalloc_stops_only_after_last_trace():
+    assert not tracemalloc.is_tracing()
+    started, release = threading.Barrier(2), threading.Event()
+    result = {}
+
+    def other_session():
+        begin_trace("b", track_memory=True)
+        started.wait()
+        release.wait()
+        with span("b") as info:
+            info['payload'] = bytearray(2**20)
+        result['spans'] = finish_trace().spans
+
+    thread = threading.Thread(target=other_session)
+    thread.start()
+    begin_trace("a", track_memory=True)
+    started.wait()
+    with span("shared"):
+        data = bytearray(2**20)
+    trace = finish_trace()
+    assert tracemalloc.is_tracing()  # сесія b ще міряє
+    assert trace.spans[0]['bytes'] is None  # дві траси — байти не наші
+
+    release.set()
+    thread.join()
+    assert result['spans'][0]['bytes'] >= 2**20  # b лишилась сама
+    assert not tracemalloc.is_tracing()
+    del data
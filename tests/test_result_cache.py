@@ -0,0 +1,30 @@
+import numpy as np
+
+from src.result_cache import ResultCache
+
+
+def test_versions_do_not_evict_each_other():
+    cache = ResultCache(max_bytes=2**20)
+    for _ in range(3):
+        for version in ("a-sql", "b-typed"):
+            cache.get_or_compute(version, 'summary', None, lambda: (1, 2.0, 3.0))
+    stats = cache.stats()
+    assert stats['misses'] == 2
+    assert stats['hits'] == 4
+    assert stats['entries'] == 2
+
+
+def test_byte_budget_evicts_least_recently_used():
+    block = lambda: np.zeros(1000, dtype=np.int64)  # 8000 байт
+    cache = ResultCache(max_bytes=20_000)
+    cache.get_or_compute("v1", 'positions', 1, block)
+    cache.get_or_compute("v2", 'positions', 2, block)
+    cache.get_or_compute("v1", 'positions', 1, block)  # v1 — свіжіший за v2
+    cache.get_or_compute("v3", 'positions', 3, block)
+
+    assert cache.stats()['evictions'] == 1
+    misses = cache.stats()['misses']
+    cache.get_or_compute("v1", 'positions', 1, block)
+    assert cache.stats()['misses'] == misses
+    cache.get_or_compute("v2", 'positions', 2, block)
+    assert cache.stats()['misses'] == misses + 1
@@ -0,0 +1,58 @@
+import pandas as pd
+
+from src.scraper import Scraper, parse_product_page, scrape_catalog
+from tests.conftest import FIXTURES_DIR
+
+
+def _fixture(name: str) -> str:
+    with open(f"{FIXTURES_DIR}/{name}", encoding='utf-8') as f:
+        return f.read()
+
+
+def test_fetch_then_conditional_304(fixture_server, tmp_path):
+    scraper = Scraper(max_workers=2, per_host_interval=0, cache_dir=str(tmp_path))
+    url = fixture_server.base + "/product_jsonld.html"
+
+    first = scraper.fetch(url)
+    second = scraper.fetch(url)
+
+    assert [status for _, status in fixture_server.statuses] == [200, 304]
+    assert scraper.stats == {'fetched': 1, 'not_modified': 1, 'unchanged': 0, 'errors': 0}
+    assert second == first
+    assert first['price_usd'] == 1099.0
+    assert first['storage_gb'] == 1024.0  # value 1 + unitText TB
+    assert first['ram_gb'] == 16.0
+    assert first['screen_size_in'] == 14.0
+    assert first['battery_wh'] == 75.0
+    assert first['cpu'] == "Intel Core Ultra 7 155H"
+
+
+def test_missing_page_counts_error(fixture_server, tmp_path):
+    scraper = Scraper(max_workers=1, per_host_interval=0, cache_dir=str(tmp_path))
+    assert scraper.fetch(fixture_server.base + "/missing.html") == {}
+    assert scraper.stats['errors'] == 1
+
+
+def test_labels_are_anchored_and_units_checked():
+    parsed = parse_product_page(_fixture("product_table.html"))
+
+    assert parsed['price_usd'] == 1249.99
+    assert parsed['storage_gb'] == 1024.0     # "1 TB SSD" -> GB, не 1.0
+    assert parsed['ram_gb'] == 32.0           # "Frame rate 144 Hz" не підхоплюється як ram
+    assert parsed['refresh_rate'] == 165.0
+    assert 'battery_wh' not in parsed         # "10 hours" і "4000 mAh" — не Wh
+    assert parsed['screen_size_in'] == 15.6
+    assert parsed['display_type'] == "IPS"
+
+
+def test_scrape_catalog_updates_rows(fixture_server, tmp_path):
+    catalog = pd.DataFrame({
+        'model': ["Zenbook 14", "Katana 15"],
+        'price_usd': [999.0, 1199.0],
+        'battery_wh': [70.0, 53.5],
+        'url': [fixture_server.base + "/product_jsonld.html", fixture_server.base + "/product_table.html"],
+    })
+    out = scrape_catalog(catalog, Scraper(max_workers=2, per_host_interval=0, cache_dir=str(tmp_path)))
+
+    assert out['price_usd'].tolist() == [1099.0, 1249.99]
+    assert out['battery_wh'].tolist() == [75.0, 53.5]  # без Wh на сторінці лишається каталожне
@@ -0,0 +1,29 @@
+import pandas as pd
+import pytest
+
+import src.search as search
+from src.search import EXACT_SCORE, FUZZY_SCORE, PREFIX_SCORE, SearchIndex
+
+
+@pytest.fixture(scope="module")
+def index():
+    """300 моделей з префіксом "ultra" — більше за MAX_EXPANSIONS."""
+    models = [f"Series ultra{i:03d}" for i in range(300)] + ["Series ultra"]
+    return SearchIndex.from_frame(pd.DataFrame({'model': models, 'brand': "Asus"}))
+
+
+def test_prefix_expansions_are_not_truncated(index):
+    expanded = index.expand("ultra")
+    assert len(expanded) == 301 > search.MAX_EXPANSIONS
+    assert sorted(set(expanded.values())) == [PREFIX_SCORE, EXACT_SCORE]
+    rows, scores = index.match("ultra")
+    assert len(rows) == 301
+    assert scores.max() == scores[300]  # точний збіг — найкращий
+
+
+def test_only_fuzzy_expansions_are_capped(index, monkeypatch):
+    monkeypatch.setattr(search, 'MAX_EXPANSIONS', 5)
+    expanded = index.expand("ultrx123")
+    assert len(expanded) == 5
+    best = index.vocab.index("ultra123")
+    assert expanded[best] == FUZZY_SCORE  # одна правка — не відрізається на користь двох
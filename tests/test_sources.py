@@ -0,0 +1,35 @@
+import os
+
+import pandas as pd
+import pytest
+
+import src.data_cache as data_cache
+from src.sources import load_sources
+
+SAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "sample_laptops.csv")
+
+
+@pytest.fixture
+def feeds(tmp_path):
+    """a.csv — лише Apple (порожні фасети cpu_suffix), b.parquet і c.csv — решта прикладу."""
+    df = pd.read_csv(SAMPLE)
+    apple = df.iloc[:3].copy()
+    apple['brand'] = 'Apple'
+    apple['model'] = ['MacBook Air 13', 'MacBook Air 15', 'MacBook Pro 14']
+    apple['cpu'] = 'Apple M3'
+    apple.to_csv(tmp_path / "a.csv", index=False)
+    df.iloc[3:6].to_parquet(tmp_path / "b.parquet")
+    df.iloc[6:].to_csv(tmp_path / "c.csv", index=False)
+    return str(tmp_path)
+
+
+@pytest.mark.parametrize("typed", [False, True])
+def test_mixed_feeds_load_twice_from_sidecars(feeds, typed):
+    first = load_sources(feeds, typed=typed, workers=1)
+    data_cache._frames.clear()  # другий прогін — теплий старт із parquet-sidecar-ів
+    second = load_sources(feeds, typed=typed, workers=1)
+
+    assert len(first) == len(second) == 9
+    for col in ('cpu_suffix', 'cpu_vendor', 'panel_type'):
+        assert isinstance(second[col].dtype, pd.CategoricalDtype)
+        assert second[col].astype(str).tolist() == first[col].astype(str).tolist()
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from benchmarks.synthetic_catalog import generate_catalog
+from src.catalog_index import filter_positions
+from src.data_cache import load_data_cached
+from src.data_processing import filter_data
+
+
+@pytest.fixture(scope="module")
+def catalogs(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("typed") / "catalog.csv")
+    generate_catalog(5000, seed=3).to_csv(path, index=False)
+    return load_data_cached(path), load_data_cached(path, typed=True)
+
+
+def _random_filters(full, rng):
+    """Межі — значення з каталогу, тож частина рядків лежить рівно на межі."""
+    screens = np.sort(full['screen_size_in'].unique())
+    prices = full['price_usd'].to_numpy()
+    lo, hi = sorted(rng.choice(screens, 2))
+    p_lo, p_hi = sorted(rng.choice(prices, 2))
+    return {
+        'brands': list(rng.choice(full['brand'].unique(), rng.integers(0, 4), replace=False)),
+        'price_range': (float(p_lo), float(p_hi)) if rng.random() < 0.7 else None,
+        'screen_range': (float(lo), float(hi)) if rng.random() < 0.7 else None,
+        'ai_cpu': rng.choice(["Усі", "Із AI", "Без AI"]),
+    }
+
+
+def test_typed_and_full_filters_match(catalogs):
+    full, typed = catalogs
+    rng = np.random.default_rng(0)
+    for _ in range(100):
+        filters = _random_filters(full, rng)
+        expected = filter_positions(full, **filters)
+        np.testing.assert_array_equal(filter_positions(typed, **filters), expected, err_msg=str(filters))
+        assert len(filter_data(typed, **filters)) == len(expected), filters
+
+
+def test_screen_bound_keeps_rows_on_the_edge(catalogs):
+    full, typed = catalogs
+    on_edge = int((full['screen_size_in'] == 15.6).sum())
+    assert on_edge > 0
+    assert len(filter_positions(typed, screen_range=(15.6, 15.6))) == on_edge